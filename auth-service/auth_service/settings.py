@@ -34,6 +34,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'users.tracing.TracingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -65,14 +66,29 @@ TEMPLATES = [
 WSGI_APPLICATION = 'auth_service.wsgi.application'
 
 # Database
+# Pool de conexiones por proceso (users.db): cada request o tarea de Celery
+# toma una conexión ya abierta y la devuelve al terminar. Con DB_POOL_ENABLED=0
+# se usa el backend estándar con conexiones persistentes (DB_CONN_MAX_AGE)
+DB_POOL_ENABLED = os.environ.get('DB_POOL_ENABLED', '1') == '1'
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'users.db' if DB_POOL_ENABLED else 'django.db.backends.postgresql',
         'NAME': os.environ.get('DB_NAME', 'main_db'),
         'USER': os.environ.get('DB_USER', 'devuser'),
         'PASSWORD': os.environ.get('DB_PASS', 'devpass'),
         'HOST': os.environ.get('DB_HOST', 'postgres'),
         'PORT': os.environ.get('DB_PORT', '5432'),
+        'CONN_MAX_AGE': 0 if DB_POOL_ENABLED else int(os.environ.get('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'pool': {
+                'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '5')),
+                'timeout': float(os.environ.get('DB_POOL_TIMEOUT', '10')),
+                'max_idle': float(os.environ.get('DB_POOL_MAX_IDLE', '300')),
+                'check_delay': float(os.environ.get('DB_POOL_CHECK_DELAY', '30')),
+            },
+        } if DB_POOL_ENABLED else {},
     }
 }
 
@@ -84,6 +100,26 @@ CACHES = {
     }
 }
 
+# Caché de perfiles de usuario (ver users/cache.py): L1 en memoria + Redis
+USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', '300'))
+USER_CACHE_L1_TTL = int(os.environ.get('USER_CACHE_L1_TTL', '5'))
+USER_CACHE_L1_SIZE = int(os.environ.get('USER_CACHE_L1_SIZE', '10000'))
+
+# Health checks (/readyz): timeout por dependencia y segundos que se
+# reutiliza el último resultado
+HEALTH_CHECK_TIMEOUT = float(os.environ.get('HEALTH_CHECK_TIMEOUT', '2'))
+HEALTH_CHECK_CACHE_TTL = float(os.environ.get('HEALTH_CHECK_CACHE_TTL', '5'))
+
+# Trazas distribuidas (ver users/tracing.py). Los spans se exportan a
+# TRACING_FILE (JSON lines) o a TRACING_OTLP_ENDPOINT (OTLP/HTTP JSON, tiene
+# prioridad); sin ninguno solo se propaga el traceparent
+TRACING_SERVICE_NAME = os.environ.get('TRACING_SERVICE_NAME', 'auth-service')
+TRACING_SAMPLE_RATE = float(os.environ.get('TRACING_SAMPLE_RATE', '1.0'))
+TRACING_FILE = os.environ.get('TRACING_FILE', '')
+TRACING_OTLP_ENDPOINT = os.environ.get('TRACING_OTLP_ENDPOINT', '')
+TRACING_QUEUE_SIZE = int(os.environ.get('TRACING_QUEUE_SIZE', '10000'))
+TRACING_MAX_STATEMENT_LENGTH = 500
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -119,7 +155,7 @@ AUTH_USER_MODEL = 'users.User'
 # REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -135,7 +171,9 @@ SIMPLE_JWT = {
     'UPDATE_LAST_LOGIN': False,
 
     'ALGORITHM': 'HS256',
-    'SIGNING_KEY': SECRET_KEY,
+    # Clave propia para poder rotarla sin cambiar SECRET_KEY; blog y email
+    # la verifican localmente con AUTH_JWT_KEYS
+    'SIGNING_KEY': os.environ.get('JWT_SIGNING_KEY', SECRET_KEY),
     'VERIFYING_KEY': None,
     'AUDIENCE': None,
     'ISSUER': None,
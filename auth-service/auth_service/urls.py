@@ -3,10 +3,12 @@ URL Configuration for auth_service project.
 """
 from django.contrib import admin
 from django.urls import path, include
-from users.healthcheck import healthcheck
+from users.health import livez, readyz
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('users.urls')),
-    path('healthz', healthcheck, name='healthcheck'),
+    path('livez', livez, name='livez'),
+    path('readyz', readyz, name='readyz'),
+    path('healthz', readyz, name='healthcheck'),
 ]
@@ -0,0 +1,140 @@
+"""
+Caché de perfiles de usuario en dos niveles.
+
+- L1: dict en memoria del proceso, TTL corto (``USER_CACHE_L1_TTL``).
+- L2: Redis (``CACHES['default']``), TTL ``USER_CACHE_TTL``.
+
+Se guardan solo los campos del perfil (nunca el hash de la contraseña) y se
+reconstruye una instancia de ``User`` sin consultar la base de datos. Al
+guardar o borrar un usuario (incluido el cambio de contraseña, que termina
+en ``save()``), una vez confirmada la transacción, se incrementa la
+generación del usuario en Redis y se borra el perfil de Redis y del L1 del
+proceso; el L1 de otros procesos puede servir el perfil anterior como mucho
+``USER_CACHE_L1_TTL`` segundos.
+
+Cada entrada de Redis guarda la generación con la que se leyó de la base y
+solo vale mientras coincida con la actual: un fallo que leyó la fila vieja
+justo antes de la invalidación no puede dejarla cacheada ``USER_CACHE_TTL``.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from .tracing import child_span
+
+User = get_user_model()
+
+PROFILE_FIELDS = ('id', 'email', 'first_name', 'last_name', 'is_active', 'is_staff', 'is_superuser', 'date_joined')
+
+_l1 = {}
+_l1_lock = threading.Lock()
+
+stats = {'l1_hits': 0, 'l2_hits': 0, 'misses': 0}
+
+
+def profile_key(user_id):
+    return f'users:profile:{user_id}'
+
+
+def generation_key(user_id):
+    return f'users:profile:{user_id}:generation'
+
+
+def _l1_get(user_id):
+    with _l1_lock:
+        entry = _l1.get(user_id)
+        if entry is None:
+            return None
+        expires_at, profile = entry
+        if expires_at < time.monotonic():
+            del _l1[user_id]
+            return None
+        return profile
+
+
+def _l1_set(user_id, profile):
+    with _l1_lock:
+        if len(_l1) >= settings.USER_CACHE_L1_SIZE:
+            # Descartar primero las entradas vencidas; si no alcanza, vaciar
+            now = time.monotonic()
+            for key in [key for key, (expires_at, _) in _l1.items() if expires_at < now]:
+                del _l1[key]
+            if len(_l1) >= settings.USER_CACHE_L1_SIZE:
+                _l1.clear()
+        _l1[user_id] = (time.monotonic() + settings.USER_CACHE_L1_TTL, profile)
+
+
+def _to_user(profile):
+    user = User(**profile)
+    # Los campos que no están en el perfil (password, last_login) quedan
+    # diferidos: si algo los lee se cargan de la base de datos y un save()
+    # solo escribe los campos cargados, nunca una contraseña vacía
+    for field in User._meta.concrete_fields:
+        if field.attname not in profile:
+            user.__dict__.pop(field.attname, None)
+    user._state.adding = False
+    user._state.db = 'default'
+    return user
+
+
+def get_user(user_id):
+    """
+    Devuelve el usuario desde L1, Redis o la base de datos (en ese orden).
+
+    Returns:
+        User o None si no existe
+    """
+    user_id = int(user_id)
+
+    profile = _l1_get(user_id)
+    if profile is not None:
+        stats['l1_hits'] += 1
+        return _to_user(profile)
+
+    key = profile_key(user_id)
+    with child_span('cache.get', 'client', {'cache.key': key}):
+        values = cache.get_many([key, generation_key(user_id)])
+    # La generación se lee antes que la base: si cambia en el medio, la
+    # entrada que se guarde ya nace vencida
+    generation = values.get(generation_key(user_id), 0)
+    entry = values.get(key)
+    # Las entradas sin generación (formato anterior) cuentan como fallo
+    if isinstance(entry, tuple) and entry[0] == generation:
+        stats['l2_hits'] += 1
+        profile = entry[1]
+    else:
+        stats['misses'] += 1
+        profile = User.objects.filter(pk=user_id).values(*PROFILE_FIELDS).first()
+        if profile is None:
+            return None
+        with child_span('cache.set', 'client', {'cache.key': key}):
+            cache.set(key, (generation, profile), settings.USER_CACHE_TTL)
+
+    _l1_set(user_id, profile)
+    return _to_user(profile)
+
+
+def invalidate_user(user_id):
+    """Invalida el perfil en Redis (nueva generación) y en el L1 de este proceso."""
+    try:
+        cache.incr(generation_key(user_id))
+    except ValueError:
+        # Basada en el reloj: si Redis la desalojó no se reutiliza una vieja
+        cache.add(generation_key(user_id), time.time_ns() // 1_000_000, timeout=None)
+    cache.delete(profile_key(user_id))
+    with _l1_lock:
+        _l1.pop(int(user_id), None)
+
+
+def hit_ratio():
+    """Proporción de lecturas servidas sin consultar la base de datos."""
+    total = stats['l1_hits'] + stats['l2_hits'] + stats['misses']
+    return (stats['l1_hits'] + stats['l2_hits']) / total if total else 0.0
+
+
+def reset_stats():
+    for name in stats:
+        stats[name] = 0
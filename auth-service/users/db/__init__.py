@@ -0,0 +1,6 @@
+"""
+Backend de PostgreSQL con pool de conexiones por proceso.
+
+Se activa con ``'ENGINE': 'users.db'`` en ``DATABASES``; las opciones del pool
+van en ``OPTIONS['pool']`` (ver ``pool.ConnectionPool``).
+"""
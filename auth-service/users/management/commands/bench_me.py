@@ -0,0 +1,76 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users import cache as profile_cache
+from users.authentication import CachedJWTAuthentication
+from users.views import MeView
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark GET /api/me/ with database-backed vs cached JWT authentication'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100, help='Distinct users sending requests')
+        parser.add_argument('--requests', type=int, default=5000, help='Requests per scenario')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the request mix')
+
+    def handle(self, *args, **options):
+        users = self.get_users(options['users'])
+        tokens = [str(AccessToken.for_user(user)) for user in users]
+        factory = APIRequestFactory()
+
+        scenarios = [
+            ('database', JWTAuthentication),
+            ('cached (L1 + Redis)', CachedJWTAuthentication),
+        ]
+
+        header = f"{'scenario':<22}{'p50 ms':>10}{'p99 ms':>10}{'queries':>10}{'hit ratio':>11}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        for name, authentication in scenarios:
+            view = MeView.as_view(authentication_classes=[authentication])
+            rng = random.Random(options['seed'])
+            for user in users:
+                profile_cache.invalidate_user(user.pk)
+            profile_cache.reset_stats()
+
+            durations = []
+            with CaptureQueriesContext(connection) as queries:
+                for _ in range(options['requests']):
+                    request = factory.get('/api/me/', HTTP_AUTHORIZATION=f'Bearer {rng.choice(tokens)}')
+                    start = time.perf_counter()
+                    response = view(request)
+                    durations.append((time.perf_counter() - start) * 1000)
+                    if response.status_code != 200:
+                        raise RuntimeError(f'{name}: HTTP {response.status_code}')
+
+            p99 = statistics.quantiles(durations, n=100)[98]
+            hit_ratio = f'{profile_cache.hit_ratio():.1%}' if authentication is CachedJWTAuthentication else '-'
+            self.stdout.write(
+                f'{name:<22}{statistics.median(durations):>10.3f}{p99:>10.3f}{len(queries):>10}{hit_ratio:>11}'
+            )
+
+    def get_users(self, count):
+        users = list(User.objects.filter(email__startswith='bench-user-').order_by('pk')[:count])
+        missing = count - len(users)
+        if missing > 0:
+            offset = len(users)
+            User.objects.bulk_create([
+                User(email=f'bench-user-{offset + i}@example.com', password='!')
+                for i in range(missing)
+            ])
+            users = list(User.objects.filter(email__startswith='bench-user-').order_by('pk')[:count])
+            self.stdout.write(f'Created {missing} benchmark users')
+        return users
@@ -0,0 +1,60 @@
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from users.datagen import TextGenerator, bulk_load
+from users.models import User
+
+SEED_DOMAIN = 'seed.example.com'
+
+
+class Command(BaseCommand):
+    help = 'Replace the generated users (@seed.example.com) with a large deterministic set for benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100_000, help='Users to generate')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed; the same seed gives the same rows')
+        parser.add_argument('--password', default='password123', help='Password shared by every generated user')
+        parser.add_argument('--batch-size', type=int, default=10_000, help='Rows per COPY / bulk_create batch')
+        parser.add_argument(
+            '--method', choices=['copy', 'bulk'],
+            help='copy (PostgreSQL COPY, default on PostgreSQL) or bulk (bulk_create)',
+        )
+
+    def handle(self, *args, **options):
+        method = options['method'] or ('copy' if connection.vendor == 'postgresql' else 'bulk')
+        if method == 'copy' and connection.vendor != 'postgresql':
+            raise CommandError('--method copy needs PostgreSQL')
+        gen = TextGenerator(options['seed'])
+        batch_size = options['batch_size']
+
+        # Solo se borran los usuarios generados; un DELETE directo evita cargar
+        # cada usuario para las señales de invalidación de caché
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {connection.ops.quote_name(User._meta.db_table)} WHERE email LIKE %s',
+                [f'%@{SEED_DOMAIN}'],
+            )
+            self.stdout.write(f'Deleted {cursor.rowcount:,} previously generated users')
+
+        # Un solo hash para todos: el hasher tarda a propósito cientos de ms por llamada
+        password = make_password(options['password'])
+
+        def users():
+            for i in range(options['users']):
+                first, last = gen.name()
+                email = f'{first}.{last}.{i}@{SEED_DOMAIN}'.lower()
+                joined = gen.past(1095)
+                yield email, password, first, last, gen.chance(0.97), False, False, joined
+
+        def progress(count, seconds):
+            if count % (batch_size * 10) == 0:
+                self.stdout.write(f'  users: {count:,} rows ({count / seconds:,.0f} rows/s)')
+
+        fields = ['email', 'password', 'first_name', 'last_name', 'is_active', 'is_staff', 'is_superuser', 'date_joined']
+        count, seconds = bulk_load(User, fields, users(), batch_size, method, progress=progress)
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {connection.ops.quote_name(User._meta.db_table)}')
+        rate = count / seconds if seconds else 0
+        self.stdout.write(f'users: {count:,} rows in {seconds:.1f}s ({rate:,.0f} rows/s, {method})')
+        self.stdout.write(self.style.SUCCESS('Seed completed successfully!'))
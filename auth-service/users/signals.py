@@ -0,0 +1,20 @@
+"""
+Invalidación de la caché de perfiles al modificar o borrar usuarios.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_user
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_profile(sender, instance, **kwargs):
+    # Cubre también el cambio de contraseña (set_password + save). Después del
+    # commit: antes, un fallo de caché concurrente todavía lee la fila vieja
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_user(user_id))
@@ -0,0 +1,53 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from . import cache as profile_cache
+
+User = get_user_model()
+
+
+class ProfileCacheTests(TestCase):
+    """Caché de perfiles: invalidación después del commit y entradas viejas."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='ada@example.com', password='secret-123')
+        profile_cache.invalidate_user(self.user.pk)
+        self.addCleanup(cache.delete_many, [
+            profile_cache.profile_key(self.user.pk), profile_cache.generation_key(self.user.pk),
+        ])
+        self.addCleanup(profile_cache._l1.clear)
+
+    def get_from_l2(self):
+        profile_cache._l1.clear()
+        return profile_cache.get_user(self.user.pk)
+
+    def test_profile_never_includes_the_password(self):
+        self.get_from_l2()
+        _, profile = cache.get(profile_cache.profile_key(self.user.pk))
+        self.assertNotIn('password', profile)
+        self.assertTrue(self.get_from_l2().check_password('secret-123'))
+
+    def test_invalidation_runs_after_commit(self):
+        self.assertTrue(self.get_from_l2().is_active)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.user.is_active = False
+            self.user.save()
+            # Todavía dentro de la transacción: la entrada sigue
+            self.assertIsNotNone(cache.get(profile_cache.profile_key(self.user.pk)))
+        self.assertEqual(len(callbacks), 1)
+        self.assertFalse(self.get_from_l2().is_active)
+
+    def test_stale_repopulation_is_ignored(self):
+        # Un fallo leyó la generación y la fila vieja antes de la invalidación...
+        self.get_from_l2()
+        stale = cache.get(profile_cache.profile_key(self.user.pk))
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(pk=self.user.pk).update(is_active=False)
+            profile_cache.invalidate_user(self.user.pk)
+        # ...y la escribe después: no se sirve
+        cache.set(profile_cache.profile_key(self.user.pk), stale, 300)
+        self.assertFalse(self.get_from_l2().is_active)
+
+    def test_missing_user(self):
+        self.assertIsNone(profile_cache.get_user(self.user.pk + 1000))
@@ -0,0 +1,66 @@
+"""
+Compara blog-service en gunicorn sync (WSGI) contra gunicorn + uvicorn (ASGI)
+con latencia de backend inyectada.
+
+Levantar las dos instancias (perfil "bench" de docker-compose, mismos
+workers, INJECTED_BACKEND_LATENCY_MS=50 por defecto):
+
+    BENCH_LATENCY_MS=50 docker-compose --profile bench up -d blog_bench_wsgi blog_bench_asgi
+    python benchmarks/asgi_vs_wsgi.py --concurrency 64 --duration 20
+
+Por defecto se piden los detalles de los posts publicados (lectura de la
+caché de detalle, donde se inyecta la latencia), en round-robin.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from loadgen import run  # noqa: E402
+
+
+def detail_paths(base_url):
+    with urllib.request.urlopen(f'{base_url}/api/posts/') as response:
+        posts = json.load(response)['results']
+    if not posts:
+        raise SystemExit(f'{base_url}: no published posts, run seed_blog first')
+    return [f"/api/posts/{post['slug']}/" for post in posts]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--wsgi-url', default='http://localhost:8101')
+    parser.add_argument('--asgi-url', default='http://localhost:8102')
+    parser.add_argument('--paths', nargs='+', help='Paths to request (default: published post details)')
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--warmup', type=float, default=3)
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    targets = [('wsgi (gunicorn sync)', args.wsgi_url), ('asgi (gunicorn + uvicorn)', args.asgi_url)]
+    results = {}
+    for name, url in targets:
+        paths = args.paths or detail_paths(url)
+        asyncio.run(run(url, paths, args.concurrency, args.warmup))
+        results[name] = asyncio.run(run(url, paths, args.concurrency, args.duration))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    header = f"{'server':<28}{'rps':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}"
+    print(f'concurrency={args.concurrency} duration={args.duration}s')
+    print(header)
+    print('-' * len(header))
+    for name, result in results.items():
+        errors = sum(result['errors'].values())
+        print(f"{name:<28}{result['rps']:>10.1f}{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}{errors:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+"""
+Generador de carga HTTP mínimo (solo librería estándar).
+
+Abre ``concurrency`` conexiones en paralelo (lazo cerrado: cada conexión
+envía la siguiente request al recibir la respuesta anterior) durante
+``duration`` segundos y reporta RPS y percentiles de latencia. Reutiliza la
+conexión si el servidor lo permite (keep-alive) y reconecta si la cierra.
+
+Cada request es un path (GET) o un ``Request`` con método, headers y cuerpo
+JSON; se serializan una sola vez antes de empezar.
+
+Uso:
+    python benchmarks/loadgen.py http://localhost:8001/api/posts/ --concurrency 64 --duration 20
+"""
+import argparse
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+
+
+class _Closed(Exception):
+    pass
+
+
+class Request:
+    """Request HTTP a repetir; ``body`` se envía como JSON."""
+
+    def __init__(self, path, method='GET', headers=None, body=None):
+        self.path = path
+        self.method = method
+        self.headers = headers or {}
+        self.body = body
+
+    def encode(self, host, port):
+        headers = {'Host': f'{host}:{port}', 'Connection': 'keep-alive', **self.headers}
+        payload = b''
+        if self.body is not None:
+            payload = json.dumps(self.body).encode()
+            headers['Content-Type'] = 'application/json'
+            headers['Content-Length'] = str(len(payload))
+        lines = [f'{self.method} {self.path} HTTP/1.1'] + [f'{k}: {v}' for k, v in headers.items()]
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode() + payload
+
+
+async def _read_response(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise _Closed()
+    status = int(status_line.split()[1])
+
+    length = None
+    chunked = False
+    keep_alive = True
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        name, value = name.strip().lower(), value.strip().lower()
+        if name == 'content-length':
+            length = int(value)
+        elif name == 'transfer-encoding' and 'chunked' in value:
+            chunked = True
+        elif name == 'connection' and value == 'close':
+            keep_alive = False
+
+    # Sin cuerpo por definición, aunque no traigan Content-Length
+    if status in (204, 304) or status < 200:
+        return status, keep_alive
+    if chunked:
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    elif length is not None:
+        await reader.readexactly(length)
+    else:
+        await reader.read()
+        keep_alive = False
+    return status, keep_alive
+
+
+async def _worker(host, port, requests, offset, deadline, latencies, errors, timeout):
+    loop = asyncio.get_running_loop()
+    reader = writer = None
+    i = offset
+    while loop.time() < deadline:
+        request = requests[i % len(requests)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            writer.write(request)
+            await writer.drain()
+            status, keep_alive = await asyncio.wait_for(_read_response(reader), timeout)
+        except (_Closed, ConnectionError, asyncio.IncompleteReadError) as e:
+            # El servidor cerró una conexión reutilizada: reintentar en una nueva
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+            if isinstance(e, _Closed):
+                i -= 1
+                continue
+            errors['connection'] = errors.get('connection', 0) + 1
+            continue
+        except asyncio.TimeoutError:
+            errors['timeout'] = errors.get('timeout', 0) + 1
+            writer.close()
+            reader = writer = None
+            continue
+
+        latencies.append(time.perf_counter() - start)
+        if status >= 400:
+            errors[status] = errors.get(status, 0) + 1
+        if not keep_alive:
+            writer.close()
+            reader = writer = None
+
+    if writer is not None:
+        writer.close()
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run(base_url, paths, concurrency=64, duration=20.0, timeout=30.0):
+    """
+    Ejecuta la carga y devuelve un resumen.
+
+    Args:
+        base_url: http://host:puerto (sin path)
+        paths: paths (GET) o ``Request`` a enviar en round-robin
+
+    Returns:
+        dict: requests, errors, error_rate, rps, p50_ms, p90_ms, p95_ms,
+        p99_ms, max_ms
+    """
+    parts = urlsplit(base_url)
+    host, port = parts.hostname, parts.port or 80
+    requests = [
+        (path if isinstance(path, Request) else Request(path)).encode(host, port)
+        for path in paths
+    ]
+    latencies, errors = [], {}
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    deadline = started + duration
+    await asyncio.gather(*(
+        _worker(host, port, requests, n, deadline, latencies, errors, timeout)
+        for n in range(concurrency)
+    ))
+    elapsed = loop.time() - started
+
+    # Los errores de conexión y timeouts no tienen latencia pero cuentan como intentos
+    failed = sum(errors.values())
+    attempts = len(latencies) + sum(n for key, n in errors.items() if not isinstance(key, int))
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'error_rate': failed / attempts if attempts else 0.0,
+        'rps': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p90_ms': percentile(latencies, 90) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'max_ms': max(latencies, default=0) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Closed-loop HTTP load generator')
+    parser.add_argument('url', help='Full URL, e.g. http://localhost:8001/api/posts/')
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--duration', type=float, default=20)
+    args = parser.parse_args()
+
+    parts = urlsplit(args.url)
+    path = parts.path + (f'?{parts.query}' if parts.query else '')
+    result = asyncio.run(run(f'{parts.scheme}://{parts.netloc}', [path or '/'], args.concurrency, args.duration))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
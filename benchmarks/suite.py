@@ -0,0 +1,228 @@
+"""
+Suite de carga de punta a punta contra los endpoints reales de los tres
+servicios.
+
+Cada escenario golpea un endpoint con ``--concurrency`` conexiones durante
+``--duration`` segundos (tras un calentamiento) y registra RPS, p50/p95/p99 y
+tasa de errores. Los resultados se guardan en JSON y, si hay una línea base,
+se comparan con ella: la suite termina con código 1 si algún escenario
+empeora más que ``--tolerance``.
+
+Los servicios pueden ser los de docker-compose (Postgres y Redis en
+contenedores) o cualquier instancia accesible, p. ej. ``runserver`` con una
+base local. Los escenarios de escritura (token, notify, contact) crean filas
+en cada request.
+
+Uso:
+    python benchmarks/suite.py                          # todos los escenarios
+    python benchmarks/suite.py --scenarios blog.posts auth.me --duration 10
+    python benchmarks/suite.py --save-baseline          # fija la línea base
+"""
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from loadgen import Request, run  # noqa: E402
+
+BENCH_DIR = Path(__file__).resolve().parent
+BENCH_EMAIL = 'bench-suite@example.com'
+BENCH_PASSWORD = 'bench-suite-password'
+
+# Métricas comparadas con la línea base: (clave, mayor es mejor)
+METRICS = (('rps', True), ('p50_ms', False), ('p95_ms', False), ('p99_ms', False))
+# Diferencias de latencia menores que esto se consideran ruido
+MIN_LATENCY_DELTA_MS = 1.0
+
+
+def _request(url, body=None, headers=None):
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json', **(headers or {})})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return json.load(response)
+
+
+def post_details(urls):
+    posts = _request(f"{urls['blog']}/api/posts/")['results']
+    if not posts:
+        raise SystemExit(f"{urls['blog']}: no published posts, run seed_blog first")
+    return [f"/api/posts/{post['slug']}/" for post in posts]
+
+
+def revalidations(urls):
+    # Clientes que hacen polling con caché: cada request trae el ETag vigente
+    with urllib.request.urlopen(f"{urls['blog']}/api/posts/", timeout=30) as response:
+        etag = response.headers['ETag']
+    return [Request('/api/posts/', headers={'If-None-Match': etag})]
+
+
+def credentials(urls):
+    # El usuario de la suite se registra la primera vez; después el registro da 400
+    try:
+        _request(f"{urls['auth']}/api/register/", {
+            'email': BENCH_EMAIL, 'password': BENCH_PASSWORD, 'password2': BENCH_PASSWORD,
+            'first_name': 'Bench', 'last_name': 'Suite',
+        })
+    except urllib.error.HTTPError as e:
+        if e.code != 400:
+            raise
+    return {'email': BENCH_EMAIL, 'password': BENCH_PASSWORD}
+
+
+def access_token(urls):
+    return _request(f"{urls['auth']}/api/token/", credentials(urls))['access']
+
+
+def notifications(urls):
+    return [
+        Request('/api/notify/', 'POST', body={
+            'to': f'bench+{i}@example.com',
+            'subject': f'Benchmark notification {i}',
+            'body': 'Load test notification generated by benchmarks/suite.py',
+            'source_service': 'benchmark',
+        })
+        for i in range(500)
+    ]
+
+
+def contact_messages(urls):
+    return [
+        Request('/api/contact/', 'POST', body={
+            'name': f'Bench User {i}',
+            'email': f'bench+{i}@example.com',
+            'message': 'Load test contact message generated by benchmarks/suite.py',
+        })
+        for i in range(500)
+    ]
+
+
+# Nombre -> (servicio, función que arma las requests a partir de las URLs)
+SCENARIOS = {
+    'blog.posts': ('blog', lambda urls: ['/api/posts/']),
+    'blog.post_detail': ('blog', post_details),
+    'blog.posts_304': ('blog', revalidations),
+    'blog.categories': ('blog', lambda urls: ['/api/categories/']),
+    'auth.token': ('auth', lambda urls: [Request('/api/token/', 'POST', body=credentials(urls))]),
+    'auth.me': ('auth', lambda urls: [
+        Request('/api/me/', headers={'Authorization': f'Bearer {access_token(urls)}'}),
+    ]),
+    'email.notify': ('email', notifications),
+    'email.contact': ('email', contact_messages),
+}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compara cada escenario con la línea base.
+
+    Returns:
+        list: regresiones como textos legibles
+    """
+    regressions = []
+    for name, result in results['scenarios'].items():
+        base = baseline['scenarios'].get(name)
+        if base is None:
+            continue
+        for metric, higher_is_better in METRICS:
+            current, previous = result[metric], base[metric]
+            if higher_is_better:
+                worse = current < previous * (1 - tolerance)
+            else:
+                worse = current > previous * (1 + tolerance) and current - previous > MIN_LATENCY_DELTA_MS
+            if worse:
+                regressions.append(f'{name}: {metric} {previous:.1f} -> {current:.1f}')
+        # La tasa de errores se compara en puntos absolutos (1%)
+        if result['error_rate'] > base['error_rate'] + 0.01:
+            regressions.append(f"{name}: error_rate {base['error_rate']:.2%} -> {result['error_rate']:.2%}")
+    return regressions
+
+
+def print_table(results, baseline):
+    header = f"{'scenario':<20}{'rps':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>9}{'vs base rps':>13}"
+    print(header)
+    print('-' * len(header))
+    for name, result in results['scenarios'].items():
+        base = (baseline or {}).get('scenarios', {}).get(name)
+        delta = f"{(result['rps'] / base['rps'] - 1):>+12.1%}" if base and base['rps'] else f"{'-':>12}"
+        print(
+            f"{name:<20}{result['rps']:>10.1f}{result['p50_ms']:>9.1f}{result['p95_ms']:>9.1f}"
+            f"{result['p99_ms']:>9.1f}{result['error_rate']:>9.2%} {delta}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--blog-url', default='http://localhost:8001')
+    parser.add_argument('--auth-url', default='http://localhost:8000')
+    parser.add_argument('--email-url', default='http://localhost:8002')
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=15)
+    parser.add_argument('--warmup', type=float, default=3)
+    parser.add_argument('--output', type=Path, help='Results file (default: benchmarks/results/<timestamp>.json)')
+    parser.add_argument('--baseline', type=Path, default=BENCH_DIR / 'baseline.json')
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='Allowed relative change before flagging (0.15 = 15%%)')
+    args = parser.parse_args()
+
+    urls = {'blog': args.blog_url, 'auth': args.auth_url, 'email': args.email_url}
+    started = datetime.now(timezone.utc)
+    results = {
+        'started_at': started.isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'concurrency': args.concurrency,
+        'duration': args.duration,
+        'urls': urls,
+        'scenarios': {},
+    }
+    for name in args.scenarios:
+        service, build = SCENARIOS[name]
+        requests = build(urls)
+        print(f'{name}: {len(requests)} distinct request(s) against {urls[service]}', file=sys.stderr)
+        if args.warmup:
+            asyncio.run(run(urls[service], requests, args.concurrency, args.warmup))
+        results['scenarios'][name] = asyncio.run(run(urls[service], requests, args.concurrency, args.duration))
+
+    output = args.output or BENCH_DIR / 'results' / f"{started.strftime('%Y%m%dT%H%M%SZ')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + '\n')
+
+    baseline = None
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text())
+    print_table(results, baseline)
+    print(f'\nresults: {output}')
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + '\n')
+        print(f'baseline saved: {args.baseline}')
+        return
+    if baseline is None:
+        return
+    if baseline['concurrency'] != args.concurrency:
+        print(f"warning: baseline ran with concurrency={baseline['concurrency']}", file=sys.stderr)
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
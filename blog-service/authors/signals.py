@@ -0,0 +1,18 @@
+"""
+Invalidación del detalle y el listado de los posts, que incluyen el autor
+anidado, al modificar o borrar un autor. Se invalida después del commit,
+como en ``posts.signals``.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core import versioned_cache
+from posts.cache import CACHE_NAMESPACE as POSTS_NAMESPACE, LIST_NAMESPACE as POST_LIST_NAMESPACE
+from .models import Author
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+def invalidate_author_posts(sender, instance, **kwargs):
+    transaction.on_commit(lambda: versioned_cache.bump(POSTS_NAMESPACE, POST_LIST_NAMESPACE))
@@ -24,6 +24,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'django_filters',
     'core',
@@ -33,6 +34,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.instrumentation.PrometheusMiddleware',
+    'core.tracing.TracingMiddleware',
+    'core.profiling.QueryProfilerMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -41,7 +45,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'core.middleware.RequestLoggingMiddleware',
-    'core.middleware.AuthTokenLoggingMiddleware',
+    'core.middleware.JWTAuthMiddleware',
 ]
 
 ROOT_URLCONF = 'blog_service.urls'
@@ -65,28 +69,100 @@ TEMPLATES = [
 WSGI_APPLICATION = 'blog_service.wsgi.application'
 
 # Database
+# Pool de conexiones por proceso (core.db): cada request o tarea de Celery
+# toma una conexión ya abierta y la devuelve al terminar. Con DB_POOL_ENABLED=0
+# se usa el backend estándar con conexiones persistentes (DB_CONN_MAX_AGE)
+DB_POOL_ENABLED = os.environ.get('DB_POOL_ENABLED', '1') == '1'
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'core.db' if DB_POOL_ENABLED else 'django.db.backends.postgresql',
         'NAME': os.environ.get('DB_NAME', 'main_db'),
         'USER': os.environ.get('DB_USER', 'devuser'),
         'PASSWORD': os.environ.get('DB_PASS', 'devpass'),
         'HOST': os.environ.get('DB_HOST', 'localhost'),
         'PORT': os.environ.get('DB_PORT', '5432'),
+        'CONN_MAX_AGE': 0 if DB_POOL_ENABLED else int(os.environ.get('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'pool': {
+                'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '5')),
+                'timeout': float(os.environ.get('DB_POOL_TIMEOUT', '10')),
+                'max_idle': float(os.environ.get('DB_POOL_MAX_IDLE', '300')),
+                'check_delay': float(os.environ.get('DB_POOL_CHECK_DELAY', '30')),
+            },
+        } if DB_POOL_ENABLED else {},
     }
 }
 
 # Redis Cache Configuration
+# CACHE_L1_ENABLED=1 agrega un nivel L1 en memoria de cada proceso delante de
+# Redis, invalidado entre procesos por pub/sub (core.cache.TieredRedisCache)
+CACHE_L1_ENABLED = os.environ.get('CACHE_L1_ENABLED', '0') == '1'
+
+# Formato de los valores en Redis (core/cache_codecs.py): serializador msgpack,
+# orjson o pickle, y compresión lz4, zstd, zlib o none de los valores de más de
+# CACHE_COMPRESS_MIN_BYTES bytes
+CACHE_SERIALIZER = os.environ.get('CACHE_SERIALIZER', 'msgpack')
+CACHE_COMPRESSOR = os.environ.get('CACHE_COMPRESSOR', 'lz4')
+CACHE_COMPRESS_MIN_BYTES = int(os.environ.get('CACHE_COMPRESS_MIN_BYTES', '1024'))
+CACHE_SERIALIZERS = {
+    'msgpack': 'core.cache_codecs.MSGPackSerializer',
+    'orjson': 'core.cache_codecs.ORJSONSerializer',
+    'pickle': 'django_redis.serializers.pickle.PickleSerializer',
+}
+
 CACHES = {
     'default': {
-        'BACKEND': 'django_redis.cache.RedisCache',
+        'BACKEND': 'core.cache.TieredRedisCache' if CACHE_L1_ENABLED else 'core.cache.RedisCache',
         'LOCATION': f"redis://{os.environ.get('REDIS_HOST', 'localhost')}:{os.environ.get('REDIS_PORT', '6379')}/1",
+        # Cambiar de serializador cambia las claves: no se leen entradas de otro formato
+        'KEY_PREFIX': CACHE_SERIALIZER,
         'OPTIONS': {
             'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            'SERIALIZER': CACHE_SERIALIZERS[CACHE_SERIALIZER],
+            'COMPRESSOR': 'core.cache_codecs.ThresholdCompressor',
+            'COMPRESSOR_ALGORITHM': CACHE_COMPRESSOR,
+            'COMPRESS_MIN_LENGTH': CACHE_COMPRESS_MIN_BYTES,
+            'L1_MAX_BYTES': int(os.environ.get('CACHE_L1_MAX_BYTES', str(16 * 1024 * 1024))),
+            'L1_TIMEOUT': int(os.environ.get('CACHE_L1_TIMEOUT', '60')),
         }
     }
 }
 
+# Contador de vistas write-behind (ver posts/counters.py)
+POST_VIEWS_FLUSH_INTERVAL = int(os.environ.get('POST_VIEWS_FLUSH_INTERVAL', '10'))
+
+# Caché del detalle de posts (payload serializado por slug): segundos vigente,
+# segundos extra que se sirve vencido mientras se recalcula y segundos que se
+# recuerda un slug inexistente
+POST_DETAIL_CACHE_TTL = int(os.environ.get('POST_DETAIL_CACHE_TTL', '120'))
+POST_DETAIL_STALE_TTL = int(os.environ.get('POST_DETAIL_STALE_TTL', '30'))
+POST_DETAIL_NEGATIVE_TTL = int(os.environ.get('POST_DETAIL_NEGATIVE_TTL', '10'))
+
+# Caché del listado de categorías: se invalida al guardar o borrar una
+# categoría, así que el TTL solo acota lo que ocupa en Redis
+CATEGORY_CACHE_TTL = int(os.environ.get('CATEGORY_CACHE_TTL', '300'))
+CATEGORY_CACHE_STALE_TTL = int(os.environ.get('CATEGORY_CACHE_STALE_TTL', '60'))
+
+# Requests condicionales (ETag/Last-Modified, ver core/conditional.py): segundos
+# que se cachea el max(updated_at) de los listados; guardar o borrar filas lo
+# invalida antes
+LAST_MODIFIED_CACHE_TTL = int(os.environ.get('LAST_MODIFIED_CACHE_TTL', '300'))
+
+# Health checks (/readyz): timeout por dependencia y segundos que se
+# reutiliza el último resultado
+HEALTH_CHECK_TIMEOUT = float(os.environ.get('HEALTH_CHECK_TIMEOUT', '2'))
+HEALTH_CHECK_CACHE_TTL = float(os.environ.get('HEALTH_CHECK_CACHE_TTL', '5'))
+
+# Modo de servidor: wsgi (gunicorn sync) o asgi (gunicorn + uvicorn, lecturas
+# de posts, categorías y /healthz con vistas async). Ver gunicorn.conf.py
+BLOG_SERVER_MODE = os.environ.get('BLOG_SERVER_MODE', 'wsgi')
+
+# Solo para benchmarks: latencia artificial en cada lectura de la caché de
+# detalle (ver core/latency.py)
+INJECTED_BACKEND_LATENCY_MS = float(os.environ.get('INJECTED_BACKEND_LATENCY_MS', '0'))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -118,7 +194,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # REST Framework Configuration
 REST_FRAMEWORK = {
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.HybridPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -129,6 +205,30 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Verificación local de los JWT de auth-service (ver core/tokens.py)
+# AUTH_JWT_KEYS: claves HS256 separadas por coma, la actual primero; durante
+# una rotación se deja también la anterior
+AUTH_JWT_KEYS = [key for key in os.environ.get('AUTH_JWT_KEYS', 'django-insecure-dev-key-change-in-production').split(',') if key]
+AUTH_JWT_LEEWAY = int(os.environ.get('AUTH_JWT_LEEWAY', '0'))
+AUTH_JWT_CACHE_SIZE = int(os.environ.get('AUTH_JWT_CACHE_SIZE', '4096'))
+
+# Trazas distribuidas (ver core/tracing.py). Los spans se exportan a
+# TRACING_FILE (JSON lines) o a TRACING_OTLP_ENDPOINT (OTLP/HTTP JSON, tiene
+# prioridad); sin ninguno solo se propaga el traceparent
+TRACING_SERVICE_NAME = os.environ.get('TRACING_SERVICE_NAME', 'blog-service')
+TRACING_SAMPLE_RATE = float(os.environ.get('TRACING_SAMPLE_RATE', '1.0'))
+TRACING_FILE = os.environ.get('TRACING_FILE', '')
+TRACING_OTLP_ENDPOINT = os.environ.get('TRACING_OTLP_ENDPOINT', '')
+TRACING_QUEUE_SIZE = int(os.environ.get('TRACING_QUEUE_SIZE', '10000'))
+TRACING_MAX_STATEMENT_LENGTH = 500
+
+# Perfilador de queries por request (ver core/profiling.py): para todas las
+# requests con QUERY_PROFILER_ENABLED=1, o por request con el header
+# X-Profile-Queries: 1 si QUERY_PROFILER_ALLOW_HEADER (por defecto, con DEBUG)
+QUERY_PROFILER_ENABLED = os.environ.get('QUERY_PROFILER_ENABLED', '0') == '1'
+QUERY_PROFILER_ALLOW_HEADER = os.environ.get('QUERY_PROFILER_ALLOW_HEADER', '1' if DEBUG else '0') == '1'
+QUERY_PROFILER_N_PLUS_ONE_THRESHOLD = int(os.environ.get('QUERY_PROFILER_N_PLUS_ONE_THRESHOLD', '3'))
+
 # Logging Configuration
 LOGGING = {
     'version': 1,
@@ -139,8 +239,10 @@ LOGGING = {
         },
     },
     'handlers': {
+        # Escritura en un hilo de fondo con cola acotada (ver core.logging)
         'console': {
-            'class': 'logging.StreamHandler',
+            '()': 'core.logging.QueueStreamHandler',
+            'queue_size': int(os.environ.get('LOG_QUEUE_SIZE', '10000')),
             'formatter': 'json',
         },
     },
@@ -0,0 +1,32 @@
+"""
+Versión async del listado de categorías (modo ASGI, ``BLOG_SERVER_MODE=asgi``).
+
+Un acierto de caché se sirve sin salir del event loop; un fallo pasa por el
+ViewSet sync, que recalcula con un solo vuelo por clave.
+"""
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from core import conditional, versioned_cache
+from .views import CACHE_NAMESPACE, CategoryViewSet, last_modified
+
+# Mismo formato que el JSONRenderer de DRF
+JSON_PARAMS = {'ensure_ascii': False, 'separators': (',', ':')}
+
+sync_category_list = sync_to_async(CategoryViewSet.as_view({'get': 'list'}))
+
+
+@require_GET
+async def category_list(request):
+    """GET /api/categories/ - mismo formato que CategoryViewSet.list."""
+    current, modified = await conditional.anamespace_validators(CACHE_NAMESPACE, last_modified)
+    etag = conditional.make_etag(current, modified, request.get_full_path(), 'json')
+    response = conditional.not_modified(request, etag, modified)
+    if response is not None:
+        return response
+
+    payload = await versioned_cache.aget_fresh(CACHE_NAMESPACE, request.build_absolute_uri())
+    if payload is None:
+        return await sync_category_list(request)
+    return conditional.set_validators(JsonResponse(payload, json_dumps_params=JSON_PARAMS), etag, modified)
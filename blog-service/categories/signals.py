@@ -0,0 +1,20 @@
+"""
+Invalidación de la caché de categorías al modificar o borrar una categoría.
+
+También invalida el detalle y el listado de los posts, que incluyen la
+categoría anidada. Se invalida después del commit, como en ``posts.signals``.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core import versioned_cache
+from posts.cache import CACHE_NAMESPACE as POSTS_NAMESPACE, LIST_NAMESPACE as POST_LIST_NAMESPACE
+from .models import Category
+from .views import CACHE_NAMESPACE
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_categories(sender, instance, **kwargs):
+    transaction.on_commit(lambda: versioned_cache.bump(CACHE_NAMESPACE, POSTS_NAMESPACE, POST_LIST_NAMESPACE))
@@ -0,0 +1,38 @@
+from asgiref.sync import async_to_sync
+from django.test import AsyncRequestFactory, TestCase
+
+from core import versioned_cache
+from .async_views import category_list
+from .models import Category
+from .views import CACHE_NAMESPACE
+
+
+class CategoryConditionalTests(TestCase):
+    """ETag del listado: la vista async y la sync tienen que coincidir."""
+
+    def setUp(self):
+        Category.objects.create(name='Performance', slug='performance')
+        # Versión nueva: nada cacheado de otra corrida (Redis es compartido)
+        versioned_cache.bump(CACHE_NAMESPACE)
+
+    def async_get(self, path, **headers):
+        return async_to_sync(category_list)(AsyncRequestFactory().get(path, headers=headers))
+
+    def test_async_etag_matches_sync(self):
+        sync = self.client.get('/api/categories/')
+        first = self.async_get('/api/categories/')
+        second = self.async_get('/api/categories/')
+
+        self.assertEqual(sync.status_code, 200)
+        self.assertEqual(first['ETag'], sync['ETag'])
+        self.assertEqual(second['ETag'], sync['ETag'])
+        self.assertEqual(first['Last-Modified'], sync['Last-Modified'])
+
+    def test_etag_revalidates_across_views(self):
+        sync = self.client.get('/api/categories/')
+        response = self.async_get('/api/categories/', **{'If-None-Match': sync['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+        etag = self.async_get('/api/categories/')['ETag']
+        response = self.client.get('/api/categories/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
@@ -1,5 +1,7 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from . import async_views
 from .views import CategoryViewSet
 
 router = DefaultRouter()
@@ -8,3 +10,8 @@ router.register(r'categories', CategoryViewSet, basename='category')
 urlpatterns = [
     path('', include(router.urls)),
 ]
+
+if settings.BLOG_SERVER_MODE == 'asgi':
+    urlpatterns = [
+        path('categories/', async_views.category_list, name='category-list-async'),
+    ] + urlpatterns
@@ -1,15 +1,36 @@
-from django.views.decorators.cache import cache_page
-from django.utils.decorators import method_decorator
+from django.conf import settings
+from django.db.models import Max
 from rest_framework import viewsets, mixins
+
+from core.conditional import conditional_view, namespace_validators
+from core.versioned_cache import cached_view
 from .models import Category
 from .serializers import CategorySerializer
 
+CACHE_NAMESPACE = 'categories'
+
+
+def last_modified():
+    return Category.objects.aggregate(latest=Max('updated_at'))['latest']
+
+
+def list_validators(request, *args, **kwargs):
+    return namespace_validators(CACHE_NAMESPACE, last_modified)
+
 
-@method_decorator(cache_page(60), name='list')
 class CategoryViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
     """
     ViewSet para listar categorías activas.
-    La lista está cacheada por 60 segundos.
+
+    Cada página se cachea en el namespace ``categories`` (ver
+    ``core/versioned_cache.py``); guardar o borrar una categoría invalida
+    todas las páginas (ver ``categories/signals.py``). Con ``If-None-Match``
+    o ``If-Modified-Since`` vigentes responde 304 (ver ``core/conditional.py``).
     """
     queryset = Category.objects.filter(is_active=True)
     serializer_class = CategorySerializer
+
+    @conditional_view(list_validators)
+    @cached_view(CACHE_NAMESPACE, settings.CATEGORY_CACHE_TTL, stale_timeout=settings.CATEGORY_CACHE_STALE_TTL)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
@@ -0,0 +1,65 @@
+"""
+Cliente Redis asíncrono para las vistas del modo ASGI.
+
+Usa la misma base de Redis que ``CACHES['default']`` y el mismo formato de
+claves y valores que django-redis (``make_key`` + serializador/compresor del
+cliente), así las vistas async y las sync comparten las entradas de caché.
+Con ``TieredRedisCache`` también comparten el nivel L1 del proceso.
+"""
+import asyncio
+import weakref
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from redis import asyncio as aioredis
+
+from .instrumentation import record_cache
+from .tracing import child_span
+
+# Un cliente por event loop: el pool de conexiones no se puede compartir
+# entre loops distintos
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_client():
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = aioredis.Redis.from_url(settings.CACHES['default']['LOCATION'])
+    return client
+
+
+async def cache_get(key):
+    """Equivalente async de ``cache.get(key)``."""
+    made_key = cache.make_key(key)
+    tiered = hasattr(cache, 'l1_lookup')
+    if tiered:
+        value = cache.l1_lookup(made_key)
+        if value is not None:
+            record_cache(1)
+            return cache.client.decode(value)
+        generation = cache.l1_generation()
+
+    with child_span('cache.get', 'client', {'cache.key': key}) as span:
+        if tiered:
+            value, pttl = await get_client().pipeline(transaction=False).get(made_key).pttl(made_key).execute()
+        else:
+            value = await get_client().get(made_key)
+        if span is not None:
+            span.attributes['cache.hit'] = value is not None
+    if value is None:
+        record_cache(0, 1)
+        return None
+    record_cache(1)
+    if tiered:
+        cache.l1_fill(made_key, value, pttl, generation)
+    return cache.client.decode(value)
+
+
+async def cache_set(key, value, timeout):
+    """Equivalente async de ``cache.set(key, value, timeout)``."""
+    with child_span('cache.set', 'client', {'cache.key': key}):
+        await get_client().set(cache.make_key(key), cache.client.encode(value), ex=timeout)
+    if hasattr(cache, 'l1_invalidate'):
+        await sync_to_async(cache.l1_invalidate)(cache.make_key(key))
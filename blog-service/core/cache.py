@@ -0,0 +1,335 @@
+"""
+Backend de caché Redis instrumentado.
+
+Igual que ``django_redis.cache.RedisCache``, pero anota cada lectura como
+acierto o fallo en las métricas de la request en curso
+(``instrumentation.record_cache``) y abre un span por llamada si la request
+se está trazando (``tracing.child_span``).
+
+``TieredRedisCache`` agrega un nivel L1 en memoria de cada proceso,
+invalidado por pub/sub de Redis.
+"""
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django_redis.cache import RedisCache as BaseRedisCache
+from prometheus_client import Counter
+
+from .instrumentation import record_cache
+from .tracing import child_span
+
+logger = logging.getLogger(__name__)
+
+L1_LOOKUPS = Counter(
+    'cache_l1_lookups_total', 'Lecturas del nivel L1 en memoria de TieredRedisCache',
+    ['result'],
+)
+
+_missing = object()
+
+
+class RedisCache(BaseRedisCache):
+
+    def get(self, key, default=None, version=None, client=None):
+        with child_span('cache.get', 'client', {'cache.key': key}) as span:
+            value = super().get(key, _missing, version=version, client=client)
+            hit = value is not _missing
+            if span is not None:
+                span.attributes['cache.hit'] = hit
+        if not hit:
+            record_cache(0, 1)
+            return default
+        record_cache(1)
+        return value
+
+    def get_many(self, keys, *args, **kwargs):
+        keys = list(keys)
+        with child_span('cache.get_many', 'client', {'cache.keys': len(keys)}) as span:
+            values = super().get_many(keys, *args, **kwargs)
+            if span is not None:
+                span.attributes['cache.hits'] = len(values)
+        record_cache(len(values), len(keys) - len(values))
+        return values
+
+    def set(self, key, *args, **kwargs):
+        with child_span('cache.set', 'client', {'cache.key': key}):
+            return super().set(key, *args, **kwargs)
+
+    def set_many(self, data, *args, **kwargs):
+        with child_span('cache.set_many', 'client', {'cache.keys': len(data)}):
+            return super().set_many(data, *args, **kwargs)
+
+    def delete(self, key, *args, **kwargs):
+        with child_span('cache.delete', 'client', {'cache.key': key}):
+            return super().delete(key, *args, **kwargs)
+
+
+class _LocalTier:
+    """
+    LRU en memoria del proceso con vencimiento por entrada y tope de bytes.
+
+    Guarda los valores ya serializados (los mismos bytes que Redis): cada
+    lectura devuelve una copia nueva y el tamaño que se cuenta es exacto.
+    """
+
+    # Costo aproximado de la entrada (tupla, OrderedDict) además de clave y valor
+    OVERHEAD = 100
+
+    def __init__(self, max_bytes, max_entry_bytes):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        # Cambia con cada invalidación: una lectura de Redis que empezó antes
+        # no se guarda, porque puede traer el valor que se acaba de invalidar
+        self.generation = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            raw, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return raw
+
+    def set(self, key, raw, ttl, generation):
+        size = len(key) + len(raw) + self.OVERHEAD
+        if size > self.max_entry_bytes:
+            return
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._remove(key)
+            self._entries[key] = (raw, expires_at)
+            self._size += size
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def discard(self, *keys):
+        with self._lock:
+            self.generation += 1
+            for key in keys:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._size = 0
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(key) + len(entry[0]) + self.OVERHEAD
+
+    @property
+    def size(self):
+        return self._size
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class TieredRedisCache(RedisCache):
+    """
+    ``RedisCache`` con un nivel L1 en memoria de cada proceso.
+
+    Las lecturas buscan primero en el L1; en un fallo se pide a Redis el
+    valor y su TTL en un solo round-trip y se guarda en el L1 hasta
+    ``min(TTL, L1_TIMEOUT)``. Cada escritura (set, add, delete, incr...)
+    publica las claves en un canal de Redis y todos los procesos las borran
+    de su L1. Mientras la suscripción no está activa (arranque, Redis caído)
+    el L1 no se usa y cada lectura va a Redis.
+
+    ``OPTIONS``:
+        L1_MAX_BYTES: tope de memoria del L1 por proceso (16 MB)
+        L1_MAX_ENTRY_BYTES: valores más grandes no pasan por el L1 (16 KB)
+        L1_TIMEOUT: segundos máximos en el L1, cota si se pierde una
+            invalidación (60)
+    """
+
+    def __init__(self, server, params):
+        super().__init__(server, params)
+        options = params.get('OPTIONS', {})
+        self._l1_max_bytes = int(options.get('L1_MAX_BYTES', 16 * 1024 * 1024))
+        self._l1_max_entry_bytes = int(options.get('L1_MAX_ENTRY_BYTES', 16 * 1024))
+        self._l1_timeout = float(options.get('L1_TIMEOUT', 60))
+        location = server if isinstance(server, str) else ','.join(server)
+        self._channel = f'cache:l1:{location}'
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._local = None
+        self._node = None
+        self._listening = False
+
+    # -- Nivel L1 y suscripción -------------------------------------------------
+
+    def _tier(self):
+        # Un L1 y un hilo suscriptor por proceso (también tras el fork de gunicorn)
+        pid = os.getpid()
+        if self._pid != pid:
+            with self._start_lock:
+                if self._pid != pid:
+                    self._local = _LocalTier(self._l1_max_bytes, self._l1_max_entry_bytes)
+                    self._node = uuid.uuid4().hex
+                    self._listening = False
+                    threading.Thread(
+                        target=self._listen, args=(self._local, self._node), daemon=True, name='cache-l1-invalidation',
+                    ).start()
+                    self._pid = pid
+        return self._local if self._listening else None
+
+    def _listen(self, local, node):
+        delay = 0.5
+        while True:
+            try:
+                pubsub = self.client.get_client(write=False).pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self._channel)
+                # Lo cacheado antes de suscribirse pudo perder invalidaciones
+                local.clear()
+                self._listening = True
+                delay = 0.5
+                for message in pubsub.listen():
+                    origin, _, keys = message['data'].decode().partition(' ')
+                    if origin == node:
+                        continue
+                    if keys == '*':
+                        local.clear()
+                    else:
+                        local.discard(*keys.split('\n'))
+            except Exception as e:
+                logger.warning(f'L1 cache invalidation channel lost, retrying in {delay:.1f}s: {e}')
+            self._listening = False
+            local.clear()
+            time.sleep(delay)
+            delay = min(delay * 2, 30)
+
+    def l1_invalidate(self, *keys):
+        """Borra claves ya armadas del L1 de todos los procesos (``'*'``: todo)."""
+        local = self._tier() or self._local
+        if local is not None:
+            if keys == ('*',):
+                local.clear()
+            else:
+                local.discard(*keys)
+        try:
+            self.client.get_client(write=True).publish(self._channel, f"{self._node} {chr(10).join(keys)}")
+        except Exception as e:
+            logger.error(f'Could not publish L1 cache invalidation: {e}')
+
+    def l1_lookup(self, made_key):
+        """Bytes del L1 para una clave ya armada con ``make_key``, o ``None``."""
+        local = self._tier()
+        return local.get(made_key) if local is not None else None
+
+    def l1_generation(self):
+        local = self._tier()
+        return local.generation if local is not None else None
+
+    def l1_fill(self, made_key, raw, pttl, generation):
+        """Guarda en el L1 lo leído de Redis (``pttl`` en ms, como PTTL)."""
+        local = self._tier()
+        if local is None or generation is None or pttl == -2:
+            return
+        ttl = self._l1_timeout if pttl < 0 else min(pttl / 1000, self._l1_timeout)
+        local.set(made_key, raw, ttl, generation)
+
+    def l1_stats(self):
+        local = self._tier()
+        return {'entries': len(local), 'bytes': local.size} if local is not None else None
+
+    # -- Lecturas (get_many va directo a Redis) ---------------------------------
+
+    def get(self, key, default=None, version=None, client=None):
+        if client is not None or self._tier() is None:
+            return super().get(key, default, version=version, client=client)
+        made_key = self.make_key(key, version=version)
+        raw = self.l1_lookup(made_key)
+        if raw is not None:
+            L1_LOOKUPS.labels('hit').inc()
+            record_cache(1)
+            return self.client.decode(raw)
+
+        L1_LOOKUPS.labels('miss').inc()
+        generation = self.l1_generation()
+        with child_span('cache.get', 'client', {'cache.key': key}) as span:
+            pipe = self.client.get_client(write=False).pipeline(transaction=False)
+            pipe.get(made_key)
+            pipe.pttl(made_key)
+            raw, pttl = pipe.execute()
+            if span is not None:
+                span.attributes['cache.hit'] = raw is not None
+        if raw is None:
+            record_cache(0, 1)
+            return default
+        record_cache(1)
+        self.l1_fill(made_key, raw, pttl, generation)
+        return self.client.decode(raw)
+
+    # -- Escrituras: se invalidan en todos los procesos -------------------------
+
+    def set(self, key, *args, version=None, **kwargs):
+        result = super().set(key, *args, version=version, **kwargs)
+        self.l1_invalidate(self.make_key(key, version=version))
+        return result
+
+    def add(self, key, *args, version=None, **kwargs):
+        added = super().add(key, *args, version=version, **kwargs)
+        if added:
+            self.l1_invalidate(self.make_key(key, version=version))
+        return added
+
+    def set_many(self, data, *args, version=None, **kwargs):
+        result = super().set_many(data, *args, version=version, **kwargs)
+        if data:
+            self.l1_invalidate(*(self.make_key(key, version=version) for key in data))
+        return result
+
+    def delete(self, key, *args, version=None, **kwargs):
+        result = super().delete(key, *args, version=version, **kwargs)
+        self.l1_invalidate(self.make_key(key, version=version))
+        return result
+
+    def delete_many(self, keys, *args, version=None, **kwargs):
+        keys = list(keys)
+        result = super().delete_many(keys, *args, version=version, **kwargs)
+        if keys:
+            self.l1_invalidate(*(self.make_key(key, version=version) for key in keys))
+        return result
+
+    def incr(self, key, *args, version=None, **kwargs):
+        try:
+            return super().incr(key, *args, version=version, **kwargs)
+        finally:
+            self.l1_invalidate(self.make_key(key, version=version))
+
+    def decr(self, key, *args, version=None, **kwargs):
+        try:
+            return super().decr(key, *args, version=version, **kwargs)
+        finally:
+            self.l1_invalidate(self.make_key(key, version=version))
+
+    def touch(self, key, *args, version=None, **kwargs):
+        result = super().touch(key, *args, version=version, **kwargs)
+        self.l1_invalidate(self.make_key(key, version=version))
+        return result
+
+    def delete_pattern(self, *args, **kwargs):
+        result = super().delete_pattern(*args, **kwargs)
+        self.l1_invalidate('*')
+        return result
+
+    def clear(self):
+        result = super().clear()
+        self.l1_invalidate('*')
+        return result
@@ -0,0 +1,122 @@
+"""
+Serializadores y compresor de los valores de la caché (``CACHES.OPTIONS``).
+
+django-redis guarda por defecto pickles sin comprimir. Con estas clases:
+
+- ``ORJSONSerializer``: JSON con orjson. Los valores cacheados son payloads de
+  la API (dicts, listas, textos y números); las tuplas vuelven como listas.
+- ``MSGPackSerializer``: msgpack, más compacto que JSON para muchos números.
+- ``ThresholdCompressor``: comprime con zlib, lz4 o zstd solo los valores de
+  más de ``COMPRESS_MIN_LENGTH`` bytes, donde la compresión compensa.
+
+Los valores comprimidos llevan un byte con el algoritmo delante, así una
+entrada escrita con otro ``COMPRESSOR_ALGORITHM`` se sigue leyendo. Ningún
+valor serializado empieza con esos bytes (JSON empieza con un carácter
+imprimible, pickle con ``0x80`` y msgpack con ``0x80`` o más salvo los enteros
+chicos, que django-redis guarda sin serializar).
+"""
+import zlib
+from decimal import Decimal
+
+import orjson
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.functional import Promise
+from django_redis.compressors.base import BaseCompressor
+from django_redis.exceptions import CompressorError
+from django_redis.serializers.base import BaseSerializer
+
+
+def _json_default(value):
+    # Decimal y textos traducibles (gettext_lazy) como texto; el resto falla
+    if isinstance(value, (Decimal, Promise)):
+        return str(value)
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+class ORJSONSerializer(BaseSerializer):
+
+    def dumps(self, value):
+        return orjson.dumps(value, default=_json_default)
+
+    def loads(self, value):
+        return orjson.loads(value)
+
+
+class MSGPackSerializer(BaseSerializer):
+
+    def __init__(self, options):
+        import msgpack
+        self._msgpack = msgpack
+
+    def dumps(self, value):
+        return self._msgpack.packb(value)
+
+    def loads(self, value):
+        return self._msgpack.unpackb(value, raw=False)
+
+
+def _zlib():
+    # Nivel 1: casi la misma relación que el 6 en texto, varias veces más rápido
+    return (lambda value: zlib.compress(value, 1)), zlib.decompress
+
+
+def _lz4():
+    import lz4.frame
+    return lz4.frame.compress, lz4.frame.decompress
+
+
+def _zstd():
+    import pyzstd
+    return pyzstd.compress, pyzstd.decompress
+
+
+# Algoritmo -> (byte de cabecera, función que retorna (compress, decompress));
+# lz4 y zstd se importan solo si se usan
+ALGORITHMS = {
+    'zlib': (b'\x01', _zlib),
+    'lz4': (b'\x02', _lz4),
+    'zstd': (b'\x03', _zstd),
+}
+_HEADERS = {header[0]: name for name, (header, _) in ALGORITHMS.items()}
+
+
+class ThresholdCompressor(BaseCompressor):
+    """
+    ``OPTIONS``:
+        COMPRESSOR_ALGORITHM: 'zlib', 'lz4', 'zstd' o 'none' (solo descomprime)
+        COMPRESS_MIN_LENGTH: bytes desde los que se comprime (1024)
+    """
+
+    def __init__(self, options):
+        super().__init__(options)
+        algorithm = options.get('COMPRESSOR_ALGORITHM', 'zlib')
+        if algorithm != 'none' and algorithm not in ALGORITHMS:
+            raise ImproperlyConfigured(f'Unknown cache compressor {algorithm!r}, expected none or one of {", ".join(ALGORITHMS)}')
+        self.min_length = int(options.get('COMPRESS_MIN_LENGTH', 1024))
+        self._header = None
+        if algorithm != 'none':
+            self._header, load = ALGORITHMS[algorithm]
+            self._compress = load()[0]
+        self._decompressors = {}
+
+    def compress(self, value):
+        if self._header is None or len(value) < self.min_length:
+            return value
+        compressed = self._compress(value)
+        # Datos que no se achican (ya comprimidos, aleatorios) quedan como están
+        if len(compressed) + 1 >= len(value):
+            return value
+        return self._header + compressed
+
+    def decompress(self, value):
+        name = _HEADERS.get(value[0]) if value else None
+        if name is None:
+            # Sin cabecera: valor guardado sin comprimir
+            raise CompressorError('not compressed')
+        decompress = self._decompressors.get(name)
+        if decompress is None:
+            decompress = self._decompressors[name] = ALGORITHMS[name][1]()[1]
+        try:
+            return decompress(memoryview(value)[1:])
+        except Exception as e:
+            raise CompressorError(e)
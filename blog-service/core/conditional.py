@@ -0,0 +1,135 @@
+"""
+Requests condicionales (ETag / Last-Modified) sin serializar el payload.
+
+Los validadores salen de la caché versionada (``core.versioned_cache``):
+
+- ETag (débil): hash de la versión del namespace, el Last-Modified, la URL
+  y el formato de salida. Todo lo que invalida el namespace (guardar o borrar
+  filas, cambios en autores o categorías anidados) cambia la versión; las
+  escrituras que no pasan por las señales (``update()``, SQL directo) lo
+  cambian al vencer el Last-Modified cacheado.
+- Last-Modified: el mayor entre ``max(updated_at)`` de las tablas que
+  muestra la respuesta (una consulta de agregado, cacheada en el namespace)
+  y la hora del último ``bump``, que también cubre los borrados.
+
+Un ``If-None-Match`` o ``If-Modified-Since`` vigente se responde con 304
+desde esas lecturas de caché, sin ejecutar la vista ni consultar la base.
+El contador ``views`` no forma parte de los validadores (por eso los ETag
+son débiles): un 304 no trae las vistas nuevas.
+"""
+import functools
+import hashlib
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date
+
+from . import aredis, versioned_cache
+
+LAST_MODIFIED_KEY = 'last-modified'
+
+
+def make_etag(*parts):
+    digest = hashlib.blake2b('|'.join(map(str, parts)).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def timestamp(value):
+    """datetime, texto ISO (como lo serializa DRF) o ``None`` -> epoch en segundos."""
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        value = parse_datetime(value)
+    return value.timestamp() if isinstance(value, datetime) else float(value)
+
+
+def namespace_state(namespace):
+    """(versión, hora del último ``bump`` o 0) del namespace."""
+    values = cache.get_many([versioned_cache.version_key(namespace), versioned_cache.changed_key(namespace)])
+    current = values.get(versioned_cache.version_key(namespace))
+    if current is None:
+        current = versioned_cache.version(namespace)
+    return current, values.get(versioned_cache.changed_key(namespace)) or 0
+
+
+async def anamespace_state(namespace):
+    """Versión async de ``namespace_state`` (modo ASGI)."""
+    current = await aredis.cache_get(versioned_cache.version_key(namespace))
+    if current is None:
+        return await sync_to_async(namespace_state)(namespace)
+    return current, await aredis.cache_get(versioned_cache.changed_key(namespace)) or 0
+
+
+def namespace_validators(namespace, last_modified):
+    """
+    (versión, Last-Modified en epoch) de una respuesta derivada del namespace.
+
+    Args:
+        last_modified: callable -> datetime o ``None``, el ``max(updated_at)``
+            de lo que muestra la respuesta; se cachea dentro del namespace
+            ``LAST_MODIFIED_CACHE_TTL`` segundos
+    """
+    current, changed = namespace_state(namespace)
+    key = versioned_cache.make_key(namespace, LAST_MODIFIED_KEY, current)
+    stored = cache.get(key)
+    if stored is None:
+        stored = timestamp(last_modified())
+        cache.set(key, stored, settings.LAST_MODIFIED_CACHE_TTL)
+    return current, max(stored, changed)
+
+
+async def anamespace_validators(namespace, last_modified):
+    """Versión async de ``namespace_validators``; un fallo se calcula en un hilo."""
+    current, changed = await anamespace_state(namespace)
+    stored = await aredis.cache_get(versioned_cache.make_key(namespace, LAST_MODIFIED_KEY, current))
+    if stored is None:
+        return await sync_to_async(namespace_validators)(namespace, last_modified)
+    return current, max(stored, changed)
+
+
+def set_validators(response, etag, last_modified):
+    response.headers['ETag'] = etag
+    if last_modified:
+        response.headers['Last-Modified'] = http_date(int(last_modified))
+    return response
+
+
+def not_modified(request, etag, last_modified):
+    """
+    Respuesta 304 (o 412) si las precondiciones de la request lo piden, o
+    ``None`` si hay que responder completo.
+    """
+    response = get_conditional_response(request, etag=etag, last_modified=int(last_modified) or None)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def conditional_view(validators):
+    """
+    Decorador para métodos de vistas DRF: responde 304 sin ejecutar el
+    método si el cliente ya tiene la representación y agrega ETag y
+    Last-Modified a las respuestas 200.
+
+    Args:
+        validators: callable(request, *args, **kwargs) -> (versión,
+            Last-Modified en epoch), p. ej. con ``namespace_validators``
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            current, last_modified = validators(request, *args, **kwargs)
+            etag = make_etag(current, last_modified, request.get_full_path(), request.accepted_renderer.format)
+            response = not_modified(request, etag, last_modified)
+            if response is not None:
+                return response
+            response = method(view, request, *args, **kwargs)
+            if response.status_code == 200:
+                set_validators(response, etag, last_modified)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,212 @@
+"""
+Datos sintéticos para benchmarks.
+
+- ``TextGenerator``: títulos, párrafos, nombres y emails con aspecto real y
+  deterministas: con la misma semilla y los mismos argumentos se generan
+  exactamente las mismas filas.
+- ``bulk_load``: inserta las filas de un iterador por lotes, con ``COPY``
+  (PostgreSQL) o ``bulk_create``, sin cargar el dataset entero en memoria.
+"""
+import io
+import time
+import uuid
+from datetime import timedelta
+from random import Random
+
+from django.db import connections, transaction
+from django.utils import timezone
+
+WORDS = (
+    'service api request response latency throughput cache database query index '
+    'container cluster deployment pipeline release rollback version build test '
+    'message queue event stream broker consumer producer worker task retry '
+    'network gateway proxy load balancer timeout connection pool socket protocol '
+    'security token identity access policy secret certificate encryption audit '
+    'metric trace log alert dashboard incident outage recovery backup replica '
+    'schema migration table column transaction lock partition shard storage '
+    'memory thread process kernel scheduler runtime compiler profile benchmark '
+    'python django postgres redis docker kubernetes terraform nginx celery linux '
+    'design pattern architecture module interface contract boundary domain model '
+    'team review feedback practice tradeoff decision constraint requirement goal '
+    'fast slow simple complex reliable scalable secure consistent available durable '
+    'the a an of to in for with on by from about into over after before while '
+    'is are was be can should will must may often usually never always rarely '
+    'we you they it this that these those each every most many few some all '
+    'improve reduce measure avoid handle handles build builds run runs scale '
+    'explore explain compare choose learn understand debug monitor deploy ship'
+).split()
+
+TOPICS = (
+    'Microservices', 'Docker', 'Kubernetes', 'PostgreSQL', 'Redis', 'Caching',
+    'Observability', 'Security', 'Testing', 'CI/CD', 'Python', 'Django',
+    'Message Queues', 'API Design', 'Performance', 'Networking', 'Databases',
+    'Cloud', 'DevOps', 'Architecture', 'Concurrency', 'Search', 'Logging',
+)
+
+TITLE_TEMPLATES = (
+    'Getting Started with {topic}',
+    '{topic} in Production: Lessons Learned',
+    'A Practical Guide to {topic}',
+    '{n} Mistakes to Avoid with {topic}',
+    'Scaling {topic} to Millions of Requests',
+    'Understanding {topic} Internals',
+    '{topic} vs {other}: Choosing the Right Tool',
+    'Debugging {topic} Performance Issues',
+    'Why We Moved to {topic}',
+    '{topic} Patterns for Microservices',
+)
+
+FIRST_NAMES = (
+    'Ana', 'Luis', 'Maria', 'Carlos', 'Sofia', 'Diego', 'Lucia', 'Jorge', 'Elena',
+    'Pablo', 'Valeria', 'Andres', 'Camila', 'Mateo', 'Daniela', 'Javier', 'Paula',
+    'John', 'Jane', 'Mike', 'Emma', 'Liam', 'Olivia', 'Noah', 'Ava', 'Ethan',
+    'Mia', 'Lucas', 'Chloe', 'Leo', 'Grace', 'Omar', 'Yuki', 'Priya', 'Chen',
+)
+
+LAST_NAMES = (
+    'Garcia', 'Martinez', 'Lopez', 'Hernandez', 'Gonzalez', 'Perez', 'Sanchez',
+    'Ramirez', 'Torres', 'Flores', 'Rivera', 'Gomez', 'Diaz', 'Reyes', 'Morales',
+    'Smith', 'Johnson', 'Brown', 'Davis', 'Miller', 'Wilson', 'Moore', 'Taylor',
+    'Anderson', 'Thomas', 'Jackson', 'White', 'Harris', 'Clark', 'Lewis', 'Walker',
+)
+
+DOMAINS = ('example.com', 'example.org', 'mail.example.net', 'corp.example.io')
+
+
+class TextGenerator:
+    """
+    Generador determinista de texto y datos personales ficticios.
+
+    Las fechas son relativas al momento en que se crea el generador.
+
+    Args:
+        seed: semilla del generador; la misma semilla da la misma secuencia
+    """
+
+    def __init__(self, seed=42):
+        self.random = Random(seed)
+        self.now = timezone.now()
+
+    def sentence(self, min_words=8, max_words=20):
+        words = self.random.choices(WORDS, k=self.random.randint(min_words, max_words))
+        return ' '.join(words).capitalize() + '.'
+
+    def paragraph(self, sentences=None):
+        count = sentences or self.random.randint(3, 7)
+        return ' '.join(self.sentence() for _ in range(count))
+
+    def text(self, words=250):
+        """Párrafos hasta juntar aproximadamente ``words`` palabras."""
+        paragraphs = []
+        total = 0
+        while total < words:
+            paragraph = self.paragraph()
+            paragraphs.append(paragraph)
+            total += paragraph.count(' ') + 1
+        return '\n\n'.join(paragraphs)
+
+    def title(self):
+        topic, other = self.random.sample(TOPICS, 2)
+        template = self.random.choice(TITLE_TEMPLATES)
+        return template.format(topic=topic, other=other, n=self.random.randint(3, 12))
+
+    def name(self):
+        return self.random.choice(FIRST_NAMES), self.random.choice(LAST_NAMES)
+
+    def email(self, first, last, index):
+        # El índice garantiza emails únicos aunque se repita el nombre
+        return f'{first}.{last}.{index}@{self.random.choice(DOMAINS)}'.lower()
+
+    def uuid(self):
+        return uuid.UUID(int=self.random.getrandbits(128), version=4)
+
+    def past(self, days):
+        """Fecha aleatoria dentro de los últimos ``days`` días."""
+        return self.now - timedelta(seconds=self.random.randint(0, days * 86400))
+
+    def chance(self, probability):
+        return self.random.random() < probability
+
+
+def truncate(*models, using='default'):
+    """Vacía las tablas; en PostgreSQL con TRUNCATE y reiniciando las secuencias."""
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        tables = ', '.join(connection.ops.quote_name(model._meta.db_table) for model in models)
+        with connection.cursor() as cursor:
+            cursor.execute(f'TRUNCATE {tables} RESTART IDENTITY CASCADE')
+    else:
+        for model in models:
+            model.objects.using(using).all().delete()
+
+
+def _batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def _copy_value(value):
+    # Formato text de COPY: \N es NULL y se escapan \, tab y saltos de línea
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value).translate(_ESCAPES)
+
+
+def _copy(connection, model, fields, batch):
+    buffer = io.StringIO()
+    for row in batch:
+        buffer.write('\t'.join(map(_copy_value, row)))
+        buffer.write('\n')
+    buffer.seek(0)
+    columns = ', '.join(connection.ops.quote_name(model._meta.get_field(name).column) for name in fields)
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(f'COPY {table} ({columns}) FROM STDIN', buffer)
+
+
+def bulk_load(model, fields, rows, batch_size=10_000, method='copy', using='default', progress=None):
+    """
+    Inserta ``rows`` (tuplas en el orden de ``fields``) por lotes.
+
+    Cada lote es una transacción. Con ``bulk_create`` Django asigna la hora
+    actual a los campos ``auto_now``/``auto_now_add``; ``COPY`` respeta los
+    valores generados.
+
+    Args:
+        method: 'copy' (solo PostgreSQL) o 'bulk'
+        progress: callable(filas_insertadas, segundos) tras cada lote
+
+    Returns:
+        tuple: (filas insertadas, segundos)
+    """
+    connection = connections[using]
+    if method == 'copy' and connection.vendor != 'postgresql':
+        raise ValueError(f'COPY needs PostgreSQL, not {connection.vendor}')
+
+    start = time.perf_counter()
+    count = 0
+    for batch in _batches(rows, batch_size):
+        with transaction.atomic(using=using):
+            if method == 'copy':
+                _copy(connection, model, fields, batch)
+            else:
+                model.objects.using(using).bulk_create(
+                    [model(**dict(zip(fields, row))) for row in batch], batch_size=batch_size,
+                )
+        count += len(batch)
+        if progress is not None:
+            progress(count, time.perf_counter() - start)
+    return count, time.perf_counter() - start
@@ -0,0 +1,115 @@
+"""
+Health checks de liveness y readiness.
+
+- ``/livez``: el proceso responde; no hace I/O.
+- ``/readyz`` (y ``/healthz``): comprueba las dependencias en paralelo, cada
+  una con un límite de ``HEALTH_CHECK_TIMEOUT`` segundos, y guarda el
+  resultado ``HEALTH_CHECK_CACHE_TTL`` segundos en memoria del proceso. Los
+  probes seguidos de varios orquestadores cuestan una sola ronda de
+  comprobaciones, y una dependencia colgada no retiene el worker más que el
+  timeout.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.http import JsonResponse
+
+from .db.pool import pool_stats
+
+logger = logging.getLogger(__name__)
+
+
+def check_database():
+    try:
+        connection.close_if_unusable_or_obsolete()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except Exception:
+        # La próxima comprobación abre una conexión nueva
+        connection.close()
+        raise
+    # Igual que al terminar una request: con pool la conexión vuelve al pool
+    # en vez de quedar retenida por el hilo del health check
+    connection.close_if_unusable_or_obsolete()
+
+
+def check_redis():
+    # Un GET basta para comprobar la conexión (un solo round-trip)
+    cache.get('health_check')
+
+
+CHECKS = {
+    'database': check_database,
+    'redis': check_redis,
+}
+
+_executor = ThreadPoolExecutor(max_workers=len(CHECKS) * 2, thread_name_prefix='health')
+_lock = threading.Lock()
+_running = {}
+_last = {'at': 0.0, 'result': None}
+
+
+def _timed(check):
+    start = time.perf_counter()
+    check()
+    return (time.perf_counter() - start) * 1000
+
+
+def run_checks():
+    """
+    Ejecuta todas las comprobaciones en paralelo.
+
+    Returns:
+        dict: estado global y, por dependencia, estado y latencia en ms
+    """
+    timeout = settings.HEALTH_CHECK_TIMEOUT
+    for name, check in CHECKS.items():
+        # Si la comprobación anterior sigue colgada no se encola otra
+        if name not in _running or _running[name].done():
+            _running[name] = _executor.submit(_timed, check)
+
+    futures = {name: _running[name] for name in CHECKS}
+    done, _ = wait(futures.values(), timeout=timeout)
+
+    checks = {}
+    for name, future in futures.items():
+        if future not in done:
+            checks[name] = {'status': 'timeout', 'latency_ms': round(timeout * 1000, 2)}
+            logger.error(f"Health check '{name}' timed out after {timeout}s")
+        elif future.exception() is not None:
+            checks[name] = {'status': 'error', 'error': str(future.exception())}
+            logger.error(f"Health check '{name}' failed: {future.exception()}")
+        else:
+            checks[name] = {'status': 'ok', 'latency_ms': round(future.result(), 2)}
+
+    healthy = all(check['status'] == 'ok' for check in checks.values())
+    return {'status': 'healthy' if healthy else 'unhealthy', 'checks': checks}
+
+
+def get_health():
+    """Resultado de ``run_checks`` cacheado ``HEALTH_CHECK_CACHE_TTL`` segundos."""
+    with _lock:
+        now = time.monotonic()
+        cached = _last['result'] is not None and now - _last['at'] < settings.HEALTH_CHECK_CACHE_TTL
+        if not cached:
+            _last['result'] = run_checks()
+            _last['at'] = now
+        return {**_last['result'], 'cached': cached, 'age_s': round(now - _last['at'], 2)}
+
+
+def livez(request):
+    """GET /livez - liveness: sin I/O."""
+    return JsonResponse({'status': 'alive'})
+
+
+def readyz(request):
+    """GET /readyz - readiness: base de datos y Redis."""
+    health = get_health()
+    # Las métricas del pool son del proceso que atiende la request y no se cachean
+    health['db_pool'] = pool_stats()
+    return JsonResponse(health, status=200 if health['status'] == 'healthy' else 503)
@@ -0,0 +1,164 @@
+"""
+Métricas Prometheus por request.
+
+``PrometheusMiddleware`` registra, por ruta (nombre de la URL resuelta, nunca
+el path, para acotar la cardinalidad): latencia, requests en curso, tamaño de
+la respuesta, número y tiempo de queries SQL y lecturas de caché (aciertos y
+fallos). ``metrics`` las expone en ``/metrics`` en formato de texto Prometheus.
+
+Con varios workers de gunicorn cada proceso escribe sus valores en
+``PROMETHEUS_MULTIPROC_DIR`` (lo fija ``gunicorn.conf.py``) y ``/metrics``
+agrega los de todos los procesos, sin importar qué worker atienda el scrape.
+"""
+import os
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+UNRESOLVED = '<unresolved>'
+
+REQUESTS = Counter(
+    'http_requests_total', 'Requests HTTP atendidas',
+    ['method', 'route', 'status'],
+)
+LATENCY = Histogram(
+    'http_request_duration_seconds', 'Latencia de las requests HTTP',
+    ['method', 'route'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1, 2.5, 5, 10),
+)
+IN_PROGRESS = Gauge(
+    'http_requests_in_progress', 'Requests HTTP en curso',
+    multiprocess_mode='livesum',
+)
+RESPONSE_SIZE = Histogram(
+    'http_response_size_bytes', 'Tamaño del cuerpo de las respuestas',
+    ['route'],
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000),
+)
+DB_QUERIES = Histogram(
+    'http_request_db_queries', 'Queries SQL por request',
+    ['route'],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+DB_DURATION = Histogram(
+    'http_request_db_duration_seconds', 'Tiempo en queries SQL por request',
+    ['route'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+CACHE_LOOKUPS = Counter(
+    'http_request_cache_lookups_total', 'Lecturas de caché hechas durante las requests',
+    ['route', 'result'],
+)
+
+# Contadores de la request en curso. Las vistas sync que Django ejecuta en
+# un hilo (modo ASGI) copian el contexto y comparten el mismo dict.
+_current = ContextVar('request_metrics', default=None)
+
+
+def record_cache(hits, misses=0):
+    """Anota lecturas de caché en la request en curso (si la hay)."""
+    stats = _current.get()
+    if stats is not None:
+        stats['cache_hits'] += hits
+        stats['cache_misses'] += misses
+
+
+def _record_query(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats['db_queries'] += 1
+        stats['db_time'] += time.perf_counter() - start
+
+
+def _install_query_wrapper(sender, connection, **kwargs):
+    # connection_created se emite en cada conexión (con pool, en cada checkout)
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+connection_created.connect(_install_query_wrapper)
+
+
+class PrometheusMiddleware:
+    """
+    Instrumenta cada request. Va primero en ``MIDDLEWARE`` para medir también
+    el resto de middlewares.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats, token, start = self._start()
+        try:
+            response = self.get_response(request)
+        finally:
+            IN_PROGRESS.dec()
+            _current.reset(token)
+        self._observe(request, response, stats, start)
+        return response
+
+    async def __acall__(self, request):
+        stats, token, start = self._start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            IN_PROGRESS.dec()
+            _current.reset(token)
+        self._observe(request, response, stats, start)
+        return response
+
+    def _start(self):
+        IN_PROGRESS.inc()
+        stats = {'db_queries': 0, 'db_time': 0.0, 'cache_hits': 0, 'cache_misses': 0}
+        return stats, _current.set(stats), time.perf_counter()
+
+    def _observe(self, request, response, stats, start):
+        duration = time.perf_counter() - start
+        match = request.resolver_match
+        route = match.view_name if match is not None else UNRESOLVED
+
+        REQUESTS.labels(request.method, route, response.status_code).inc()
+        LATENCY.labels(request.method, route).observe(duration)
+        if not response.streaming:
+            RESPONSE_SIZE.labels(route).observe(len(response.content))
+        DB_QUERIES.labels(route).observe(stats['db_queries'])
+        DB_DURATION.labels(route).observe(stats['db_time'])
+        if stats['cache_hits']:
+            CACHE_LOOKUPS.labels(route, 'hit').inc(stats['cache_hits'])
+        if stats['cache_misses']:
+            CACHE_LOOKUPS.labels(route, 'miss').inc(stats['cache_misses'])
+
+
+def metrics(request):
+    """GET /metrics - métricas en formato de texto Prometheus."""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,22 @@
+"""
+Latencia artificial de backend para benchmarks.
+
+Con ``INJECTED_BACKEND_LATENCY_MS`` > 0 cada lectura de la caché de detalle
+espera ese tiempo, simulando un Redis o PostgreSQL lento. En modo sync la
+espera bloquea el worker (``time.sleep``); en modo ASGI solo suspende la
+corrutina (``asyncio.sleep``). Siempre 0 fuera de un benchmark.
+"""
+import asyncio
+import time
+
+from django.conf import settings
+
+
+def inject():
+    if settings.INJECTED_BACKEND_LATENCY_MS:
+        time.sleep(settings.INJECTED_BACKEND_LATENCY_MS / 1000)
+
+
+async def ainject():
+    if settings.INJECTED_BACKEND_LATENCY_MS:
+        await asyncio.sleep(settings.INJECTED_BACKEND_LATENCY_MS / 1000)
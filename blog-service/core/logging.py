@@ -1,20 +1,119 @@
-import json
+"""
+Logging estructurado en JSON con escritura en segundo plano.
+
+- ``JsonFormatter``: una sola serialización (orjson) por registro; los campos
+  pasados con ``extra={...}`` van como claves de primer nivel.
+- ``QueueStreamHandler``: el hilo de la request solo encola el registro; la
+  serialización y la escritura ocurren en un ``QueueListener``. La cola está
+  acotada: si se llena, el registro se descarta y se cuenta en
+  ``log_records_dropped_total`` en vez de bloquear la request.
+"""
+import atexit
 import logging
-from datetime import datetime
+import os
+import queue
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+import orjson
+from prometheus_client import Counter
+
+# Atributos propios de LogRecord; el resto son campos de ``extra``
+RESERVED_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+DROPPED = Counter('log_records_dropped_total', 'Registros de log descartados por cola llena')
+
+_exc_formatter = logging.Formatter()
 
 
 class JsonFormatter(logging.Formatter):
     """Formateador para logging en formato JSON."""
-    
+
+    _second = None
+    _prefix = ''
+
     def format(self, record):
         log_data = {
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': self.timestamp(record.created),
             'level': record.levelname,
             'logger': record.name,
             'message': record.getMessage(),
         }
-        
-        if hasattr(record, 'exc_info') and record.exc_info:
-            log_data['exception'] = self.formatException(record.exc_info)
-        
-        return json.dumps(log_data)
+
+        for key, value in record.__dict__.items():
+            if key not in RESERVED_ATTRS:
+                log_data[key] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            log_data['exception'] = record.exc_text
+
+        return orjson.dumps(log_data, default=str).decode()
+
+    def timestamp(self, created):
+        # ISO 8601 en UTC, con la parte de fecha y hora cacheada por segundo
+        second = int(created)
+        if second != self._second:
+            self._prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(second))
+            self._second = second
+        return f'{self._prefix}.{int((created - second) * 1_000_000):06d}'
+
+
+class QueueStreamHandler(QueueHandler):
+    """
+    ``StreamHandler`` cuya escritura ocurre en un hilo de fondo.
+
+    Args:
+        queue_size: registros en espera como máximo antes de descartar
+        stream: destino de la escritura (por defecto ``sys.stderr``)
+    """
+
+    def __init__(self, queue_size=10_000, stream=None):
+        super().__init__(queue.Queue(queue_size))
+        self.queue_size = queue_size
+        self.target = logging.StreamHandler(stream or sys.stderr)
+        self.dropped = 0
+        self._start_listener()
+        # Los procesos hijos (Celery prefork) no heredan el hilo del listener
+        os.register_at_fork(after_in_child=self._restart_after_fork)
+        atexit.register(self.close)
+
+    def _start_listener(self):
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
+
+    def _restart_after_fork(self):
+        self.queue = queue.Queue(self.queue_size)
+        self._start_listener()
+
+    def setFormatter(self, fmt):
+        # El formato se aplica en el listener, no al encolar
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        # En el hilo de la request solo se resuelve lo que no puede esperar:
+        # los argumentos del mensaje (pueden cambiar) y el traceback
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = _exc_formatter.formatException(record.exc_info)
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            DROPPED.inc()
+
+    def close(self):
+        # Escribe lo que quede en la cola antes de terminar el proceso
+        listener, self.listener = self.listener, None
+        if listener is not None:
+            try:
+                listener.stop()
+            except queue.Full:
+                pass
+        super().close()
@@ -0,0 +1,109 @@
+import random
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.cache import RedisCache, TieredRedisCache
+from core.datagen import TextGenerator
+
+KEY_PREFIX = 'bench:tiers'
+
+
+class Command(BaseCommand):
+    help = 'Benchmark cache reads with plain Redis vs the in-process L1 tier, and cross-process invalidation latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keys', type=int, default=100, help='Hot keys read at random')
+        parser.add_argument('--reads', type=int, default=20000, help='Operations per scenario')
+        parser.add_argument('--write-ratio', type=float, default=0.01, help='Fraction of writes in the mixed scenarios')
+        parser.add_argument('--invalidations', type=int, default=200, help='Writes timed in the invalidation test')
+
+    def handle(self, *args, **options):
+        config = settings.CACHES['default']
+        if 'redis' not in config['BACKEND'].lower():
+            raise CommandError(f"CACHES['default'] is {config['BACKEND']}, this benchmark needs Redis")
+        params = {**config, 'KEY_PREFIX': KEY_PREFIX}
+        plain = RedisCache(config['LOCATION'], params)
+        tiered = TieredRedisCache(config['LOCATION'], params)
+        if not self.wait_listening(tiered):
+            raise CommandError('The L1 invalidation channel did not connect')
+
+        gen = TextGenerator(seed=1)
+        # Valores con la forma de lo que guarda la app: versión de namespace y detalle de post
+        payloads = [
+            ('version (int)', lambda i: 1_700_000_000_000 + i),
+            ('post detail', lambda i: ({
+                'id': i, 'title': gen.title(), 'slug': f'bench-{i}', 'body': gen.text(250),
+                'author': {'id': 1, 'name': 'Bench Author', 'email': 'bench@example.com'},
+                'category': {'id': 1, 'name': 'Performance', 'slug': 'performance'},
+                'views': 0, 'published_at': '2024-01-01T00:00:00Z',
+            }, time.time() + 300, 0.004, None)),
+        ]
+
+        header = f"{'scenario':<36}{'ops/s':>10}{'p50 us':>9}{'p99 us':>9}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        try:
+            for payload_name, make_value in payloads:
+                keys = [f'key:{i}' for i in range(options['keys'])]
+                values = {key: make_value(i) for i, key in enumerate(keys)}
+                plain.set_many(values, timeout=300)
+                for write_ratio in (0, options['write_ratio']):
+                    for name, backend in (('redis', plain), ('redis + L1', tiered)):
+                        label = f"{payload_name}, {name}" + (f', {write_ratio:.0%} writes' if write_ratio else '')
+                        self.run_scenario(label, backend, keys, values, write_ratio, options['reads'])
+            self.invalidation_latency(params, options['invalidations'])
+        finally:
+            plain.delete_pattern('*')
+
+    def wait_listening(self, cache, timeout=5):
+        cache.l1_generation()
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if cache.l1_stats() is not None:
+                return True
+            time.sleep(0.01)
+        return False
+
+    def run_scenario(self, label, backend, keys, values, write_ratio, reads):
+        rng = random.Random(1)
+        durations = []
+        for _ in range(reads):
+            key = rng.choice(keys)
+            start = time.perf_counter()
+            if rng.random() < write_ratio:
+                backend.set(key, values[key], timeout=300)
+            else:
+                backend.get(key)
+            durations.append((time.perf_counter() - start) * 1_000_000)
+        p99 = statistics.quantiles(durations, n=100)[98]
+        self.stdout.write(
+            f'{label:<36}{len(durations) / (sum(durations) / 1_000_000):>10.0f}'
+            f'{statistics.median(durations):>9.0f}{p99:>9.0f}'
+        )
+
+    def invalidation_latency(self, params, count):
+        # Dos instancias con su propio L1 y suscripción, como dos workers
+        writer = TieredRedisCache(params['LOCATION'], params)
+        reader = TieredRedisCache(params['LOCATION'], params)
+        if not (self.wait_listening(writer) and self.wait_listening(reader)):
+            raise CommandError('The L1 invalidation channel did not connect')
+
+        delays = []
+        for i in range(count):
+            reader.get('invalidation')
+            writer.set('invalidation', i, timeout=60)
+            start = time.perf_counter()
+            while reader.get('invalidation') != i:
+                # Cede el GIL al hilo suscriptor (en otro proceso no competiría)
+                time.sleep(0)
+                if time.perf_counter() - start > 1:
+                    raise CommandError(f'Invalidation {i} not received after 1s')
+            delays.append((time.perf_counter() - start) * 1_000_000)
+        p99 = statistics.quantiles(delays, n=100)[98]
+        self.stdout.write(
+            f'\ninvalidation across instances: p50 {statistics.median(delays):.0f} us, p99 {p99:.0f} us, '
+            f'max {max(delays):.0f} us ({count} writes)'
+        )
@@ -0,0 +1,71 @@
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.db.pool import get_pool
+
+QUERY = "SELECT id, title, slug FROM posts_post WHERE status = 'published' ORDER BY published_at DESC LIMIT 10"
+
+
+class Command(BaseCommand):
+    help = 'Benchmark per-request database latency with new, persistent and pooled PostgreSQL connections'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Requests per thread and scenario')
+        parser.add_argument('--threads', type=int, default=1, help='Concurrent threads (e.g. workers or ASGI threads)')
+        parser.add_argument('--pool-size', type=int, default=5, help='max_size of the pool scenario')
+        parser.add_argument('--query', default=QUERY, help='SQL executed on each request')
+
+    def handle(self, *args, **options):
+        base = connections['default'].settings_dict
+        scenarios = [
+            ('new connection', 'django.db.backends.postgresql', 0, {}),
+            ('persistent', 'django.db.backends.postgresql', 60, {}),
+            ('pool', 'core.db', 0, {'pool': {'max_size': options['pool_size']}}),
+        ]
+
+        header = f"{'scenario':<18}{'p50 ms':>10}{'p99 ms':>10}{'connects':>10}{'waits':>8}{'wait ms':>10}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        for name, engine, max_age, db_options in scenarios:
+            alias = f"bench_{name.replace(' ', '_')}"
+            connections.settings[alias] = {**base, 'ENGINE': engine, 'CONN_MAX_AGE': max_age, 'OPTIONS': db_options}
+            durations = []
+            connects = []
+
+            def worker():
+                # django.db.connections da un wrapper distinto por hilo
+                wrapper = connections[alias]
+                local = []
+                for _ in range(options['requests']):
+                    start = time.perf_counter()
+                    opened = wrapper.connection is None
+                    with wrapper.cursor() as cursor:
+                        cursor.execute(options['query'])
+                        cursor.fetchall()
+                    # Lo mismo que request_finished al terminar cada request
+                    wrapper.close_if_unusable_or_obsolete()
+                    local.append((time.perf_counter() - start) * 1000)
+                    connects.append(opened)
+                wrapper.close()
+                durations.extend(local)
+
+            threads = [threading.Thread(target=worker) for _ in range(options['threads'])]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            if engine == 'core.db':
+                stats = get_pool(alias, base['NAME'], {}).snapshot()
+                opened, waits, wait_ms = stats['connections_created'], stats['waits'], f"{stats['wait_time_ms']:.1f}"
+            else:
+                opened, waits, wait_ms = sum(connects), '-', '-'
+            p99 = statistics.quantiles(durations, n=100)[98]
+            self.stdout.write(
+                f'{name:<18}{statistics.median(durations):>10.3f}{p99:>10.3f}{opened:>10}{waits:>8}{wait_ms:>10}'
+            )
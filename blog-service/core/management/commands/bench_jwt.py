@@ -0,0 +1,54 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+
+from core.tokens import TokenVerifier, sign
+
+CURRENT_KEY = 'bench-current-key'
+PREVIOUS_KEY = 'bench-previous-key'
+
+
+class Command(BaseCommand):
+    help = 'Benchmark local JWT verification (HMAC + claims) with and without the in-process LRU'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tokens', type=int, default=1000, help='Distinct tokens (distinct users)')
+        parser.add_argument('--iterations', type=int, default=100_000, help='Verifications per scenario')
+
+    def handle(self, *args, **options):
+        count = options['tokens']
+        iterations = options['iterations']
+        exp = int(time.time()) + 3600
+
+        def make_tokens(key):
+            return [
+                sign({'token_type': 'access', 'exp': exp, 'jti': uuid.uuid4().hex, 'user_id': i}, key)
+                for i in range(count)
+            ]
+
+        current = make_tokens(CURRENT_KEY)
+        previous = make_tokens(PREVIOUS_KEY)
+        keys = [CURRENT_KEY, PREVIOUS_KEY]
+
+        scenarios = [
+            ('no cache', TokenVerifier(keys=keys, cache_size=0), current),
+            ('no cache, rotated key', TokenVerifier(keys=keys, cache_size=0), previous),
+            ('LRU', TokenVerifier(keys=keys, cache_size=count), current),
+        ]
+
+        header = f"{'scenario':<24}{'verif/s':>12}{'us/verif':>10}{'hit ratio':>11}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        for name, verifier, tokens in scenarios:
+            start = time.perf_counter()
+            for i in range(iterations):
+                verifier.verify(tokens[i % count])
+            elapsed = time.perf_counter() - start
+
+            lookups = verifier.hits + verifier.misses
+            hit_ratio = f'{verifier.hits / lookups:.1%}' if lookups else '-'
+            self.stdout.write(
+                f'{name:<24}{iterations / elapsed:>12.0f}{elapsed / iterations * 1e6:>10.2f}{hit_ratio:>11}'
+            )
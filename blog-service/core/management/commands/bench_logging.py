@@ -0,0 +1,108 @@
+import json
+import logging
+import os
+import statistics
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand
+
+from core.logging import JsonFormatter, QueueStreamHandler
+
+
+class LegacyJsonFormatter(logging.Formatter):
+    """Formateador anterior: json.dumps sobre un mensaje que ya es JSON."""
+
+    def format(self, record):
+        return json.dumps({
+            'timestamp': datetime.utcnow().isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        })
+
+
+class SlowStream:
+    """Stream que tarda ``delay`` segundos por escritura (pipe o disco lento)."""
+
+    def __init__(self, stream, delay):
+        self.stream = stream
+        self.delay = delay
+
+    def write(self, data):
+        if self.delay:
+            time.sleep(self.delay)
+        return self.stream.write(data)
+
+    def flush(self):
+        self.stream.flush()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark per-request logging overhead: legacy double JSON vs orjson vs orjson + background queue'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--records', type=int, default=50_000, help='Log records per scenario')
+        parser.add_argument('--queue-size', type=int, default=10_000, help='Queue size of the background handler')
+        parser.add_argument('--sink-latency-ms', type=float, default=0, help='Delay per write to simulate a slow sink')
+
+    def handle(self, *args, **options):
+        count = options['records']
+        devnull = open(os.devnull, 'w')
+        sink = SlowStream(devnull, options['sink_latency_ms'] / 1000)
+
+        def legacy(logger, i):
+            logger.info(json.dumps({
+                'method': 'GET',
+                'path': f'/api/posts/{i}/',
+                'status_code': 200,
+                'duration_ms': 1.23,
+                'user_agent': 'bench',
+            }))
+
+        def structured(logger, i):
+            logger.info(f'GET /api/posts/{i}/ 200', extra={
+                'method': 'GET',
+                'path': f'/api/posts/{i}/',
+                'status_code': 200,
+                'duration_ms': 1.23,
+                'user_agent': 'bench',
+            })
+
+        sync_handler = logging.StreamHandler(sink)
+        queue_handler = QueueStreamHandler(queue_size=options['queue_size'], stream=sink)
+        scenarios = [
+            ('legacy (json x2, sync)', sync_handler, LegacyJsonFormatter(), legacy),
+            ('orjson, sync', sync_handler, JsonFormatter(), structured),
+            ('orjson + queue', queue_handler, JsonFormatter(), structured),
+        ]
+
+        header = f"{'scenario':<24}{'p50 us':>10}{'p99 us':>10}{'mean us':>10}{'drain s':>10}{'dropped':>10}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        for name, handler, formatter, emit in scenarios:
+            handler.setFormatter(formatter)
+            logger = logging.Logger(f'bench.{name}')
+            logger.addHandler(handler)
+
+            durations = []
+            for i in range(count):
+                start = time.perf_counter()
+                emit(logger, i)
+                durations.append((time.perf_counter() - start) * 1e6)
+
+            # Tiempo hasta que el listener termina de escribir lo encolado
+            start = time.perf_counter()
+            if handler is queue_handler:
+                handler.close()
+            drain = time.perf_counter() - start
+
+            dropped = handler.dropped if handler is queue_handler else '-'
+            p99 = statistics.quantiles(durations, n=100)[98]
+            self.stdout.write(
+                f'{name:<24}{statistics.median(durations):>10.2f}{p99:>10.2f}'
+                f'{statistics.fmean(durations):>10.2f}{drain:>10.2f}{dropped:>10}'
+            )
+
+        devnull.close()
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from categories.views import CACHE_NAMESPACE as CATEGORIES_NAMESPACE
+from core import versioned_cache
+from core.profiling import query_budget
+from posts.cache import CACHE_NAMESPACE as POSTS_NAMESPACE, LIST_NAMESPACE as POST_LIST_NAMESPACE
+from posts.models import Post
+
+# Máximo de queries por endpoint con la caché fría; {slug} es un post publicado.
+# Los listados suman el max(updated_at) de Last-Modified (ver core/conditional.py)
+BUDGETS = [
+    ('/api/posts/', 3),
+    ('/api/posts/?search=docker', 3),
+    ('/api/posts/?pagination=cursor', 2),
+    ('/api/posts/{slug}/', 1),
+    ('/api/posts-stats/', 0),
+    ('/api/categories/', 3),
+]
+
+
+class Command(BaseCommand):
+    help = 'Check that each API endpoint stays within its SQL query budget and issues no N+1 queries'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cold-cache', action='store_true', help="Invalidate this service's cache namespaces before each request (worst case)")
+
+    def handle(self, *args, **options):
+        slug = Post.objects.filter(status='published').values_list('slug', flat=True).first()
+        if slug is None:
+            raise CommandError('No published posts, run seed_blog first')
+
+        client = Client(HTTP_HOST='localhost')
+        failures = []
+        header = f"{'endpoint':<36}{'queries':>9}{'budget':>8}{'db ms':>9}  result"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        for path, budget in BUDGETS:
+            path = path.format(slug=slug)
+            if options['cold_cache']:
+                # No cache.clear(): la DB de Redis es compartida (contador de
+                # vistas pendientes, perfiles de auth-service)
+                versioned_cache.bump(POSTS_NAMESPACE, POST_LIST_NAMESPACE, CATEGORIES_NAMESPACE)
+            try:
+                with query_budget(budget) as profile:
+                    response = client.get(path)
+                result = 'ok'
+                if response.status_code != 200:
+                    result = f'HTTP {response.status_code}'
+                    failures.append(f'{path}: HTTP {response.status_code}')
+            except AssertionError as e:
+                result = 'FAIL'
+                failures.append(str(e))
+            self.stdout.write(f'{path[:35]:<36}{profile.count:>9}{budget:>8}{profile.time_ms:>9.2f}  {result}')
+
+        for failure in failures:
+            self.stderr.write(failure)
+        if failures:
+            raise CommandError(f'{len(failures)} endpoint(s) failed or over their query budget')
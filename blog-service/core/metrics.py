@@ -0,0 +1,71 @@
+"""
+Contadores de métricas compartidos entre workers.
+
+Los incrementos se acumulan en memoria y se publican en un hash de Redis
+como máximo una vez por ``FLUSH_INTERVAL`` segundos, así el camino caliente
+de una request no paga un round-trip extra por cada contador.
+"""
+import logging
+import threading
+import time
+from collections import Counter
+
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+COUNTERS_KEY = 'metrics:counters'
+FLUSH_INTERVAL = 1.0
+
+_lock = threading.Lock()
+_pending = Counter()
+_last_flush = time.monotonic()
+
+
+def incr(name, amount=1):
+    """Incrementa un contador compartido."""
+    global _last_flush
+
+    with _lock:
+        _pending[name] += amount
+        if time.monotonic() - _last_flush < FLUSH_INTERVAL:
+            return
+        batch = dict(_pending)
+        _pending.clear()
+        _last_flush = time.monotonic()
+
+    _publish(batch)
+
+
+def _publish(batch):
+    try:
+        pipe = get_redis_connection('default').pipeline(transaction=False)
+        for name, amount in batch.items():
+            pipe.hincrby(COUNTERS_KEY, name, amount)
+        pipe.execute()
+    except Exception as e:
+        logger.error(f"Could not publish metrics counters: {str(e)}")
+
+
+def get_counters(*names):
+    """
+    Valor actual de los contadores (todos los workers).
+
+    Incluye los incrementos locales que aún no se publicaron.
+    """
+    with _lock:
+        local = {name: _pending[name] for name in names}
+
+    try:
+        values = get_redis_connection('default').hmget(COUNTERS_KEY, names)
+    except Exception as e:
+        logger.error(f"Could not read metrics counters: {str(e)}")
+        values = [None] * len(names)
+
+    return {name: int(value or 0) + local[name] for name, value in zip(names, values)}
+
+
+def hit_rate(hits, misses):
+    """Proporción de aciertos, redondeada a 4 decimales."""
+    total = hits + misses
+    return round(hits / total, 4) if total else 0.0
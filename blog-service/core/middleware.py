@@ -1,37 +1,61 @@
-import json
 import logging
 import time
 from django.utils.deprecation import MiddlewareMixin
 
+from core.tokens import InvalidToken, verifier
+from core.tracing import current_span
+
+logger = logging.getLogger('django.request')
+
 
 class RequestLoggingMiddleware(MiddlewareMixin):
     """Middleware para logging estructurado de requests en formato JSON."""
     
     def process_request(self, request):
-        request._start_time = time.time()
+        request._start_time = time.perf_counter()
         return None
     
     def process_response(self, request, response):
         if hasattr(request, '_start_time'):
-            duration = time.time() - request._start_time
-            log_data = {
-                'method': request.method,
-                'path': request.path,
-                'status_code': response.status_code,
-                'duration_ms': round(duration * 1000, 2),
-                'user_agent': request.META.get('HTTP_USER_AGENT', ''),
-            }
-            logger = logging.getLogger('django.request')
-            logger.info(json.dumps(log_data))
+            duration = time.perf_counter() - request._start_time
+            span = current_span()
+            # Campos estructurados: JsonFormatter los serializa una sola vez
+            logger.info(
+                f"{request.method} {request.path} {response.status_code}",
+                extra={
+                    'method': request.method,
+                    'path': request.path,
+                    'status_code': response.status_code,
+                    'duration_ms': round(duration * 1000, 2),
+                    'user_agent': request.META.get('HTTP_USER_AGENT', ''),
+                    'trace_id': span.trace_id if span is not None else None,
+                },
+            )
         return response
 
 
-class AuthTokenLoggingMiddleware(MiddlewareMixin):
-    """Middleware que lee el header Authorization para preparar integración futura con Auth."""
+class JWTAuthMiddleware(MiddlewareMixin):
+    """
+    Verifica localmente el access token de auth-service y expone sus claims.
+    
+    ``request.auth_claims`` queda con los claims del token, o None si no hay
+    header o el token no es válido. No rechaza la request: decidir si un
+    endpoint exige autenticación corresponde a la vista.
+    """
     
     def process_request(self, request):
+        request.auth_claims = None
         auth_header = request.META.get('HTTP_AUTHORIZATION', '')
-        if auth_header:
+        if not auth_header:
+            return None
+        
+        scheme, _, token = auth_header.partition(' ')
+        if scheme != 'Bearer' or not token:
+            return None
+        
+        try:
+            request.auth_claims = verifier.verify(token)
+        except InvalidToken as e:
             logger = logging.getLogger('django')
-            logger.info(f"Authorization header detected: {auth_header[:20]}... (will be validated in Day 4)")
+            logger.info(f"Rejected bearer token on {request.path}: {e}")
         return None
@@ -0,0 +1,193 @@
+"""
+Paginación por número de página con modo cursor (keyset) opcional.
+
+Por defecto se comporta como ``PageNumberPagination``. Con
+``?pagination=cursor`` (o cualquier ``?cursor=``) pagina por keyset sobre
+``view.keyset_ordering``: sin ``COUNT(*)`` ni ``OFFSET``, así que la página
+10.000 cuesta lo mismo que la primera. El último campo del ordering debe
+ser único (normalmente ``id``) para desempatar.
+
+Los parámetros de ``view.keyset_excluded_params`` (p. ej. una búsqueda que
+ordena por relevancia) vuelven al modo por página: el keyset reemplazaría su
+orden.
+"""
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class HybridPagination(PageNumberPagination):
+    """PageNumberPagination + keyset opt-in por request."""
+
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+    keyset_ordering = ('-created_at', '-id')
+    invalid_cursor_message = 'Cursor inválido.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = (
+            (
+                self.cursor_query_param in request.query_params
+                or request.query_params.get(self.mode_query_param) == 'cursor'
+            )
+            and not any(
+                request.query_params.get(param, '').strip()
+                for param in getattr(view, 'keyset_excluded_params', ())
+            )
+        )
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.ordering = tuple(getattr(view, 'keyset_ordering', self.keyset_ordering))
+        self.model = queryset.model
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(self._flip(field) for field in ordering)
+
+        # El primer campo no puede ser NULL para que la comparación sea total
+        queryset = queryset.filter(**{f'{self._name(ordering[0])}__isnull': False})
+        if position is not None:
+            queryset = queryset.filter(self._after(ordering, position))
+
+        rows = list(queryset.order_by(*ordering)[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.page_rows = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next or not self.page_rows:
+            return None
+        return self._link(self.page_rows[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        if not self.has_previous or not self.page_rows:
+            return None
+        return self._link(self.page_rows[0], reverse=True)
+
+    def encode_cursor(self, row, reverse=False):
+        """Cursor opaco con la posición de ``row`` en el ordering."""
+        values = [str(self._value(row, self._name(field))) for field in self.ordering]
+        raw = json.dumps({'v': values, 'r': reverse}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            raw = base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4))
+            data = json.loads(raw)
+            values = data['v']
+            if len(values) != len(self.ordering):
+                raise ValueError('cursor length mismatch')
+            position = [
+                self.model._meta.get_field(self._name(field)).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+            return position, bool(data.get('r'))
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _after(self, ordering, position):
+        """
+        Condición keyset: (a, b) después de (va, vb) según el ordering.
+
+        Se añade ``a <= va`` (o ``>=``) como condición redundante para que
+        PostgreSQL la use como límite del index scan.
+        """
+        first = ordering[0]
+        lookup = 'lte' if first.startswith('-') else 'gte'
+        condition = Q()
+        for i, field in enumerate(ordering):
+            op = 'lt' if field.startswith('-') else 'gt'
+            term = Q(**{f'{self._name(field)}__{op}': position[i]})
+            for prev, value in zip(ordering[:i], position[:i]):
+                term &= Q(**{self._name(prev): value})
+            condition |= term
+        return Q(**{f'{self._name(first)}__{lookup}': position[0]}) & condition
+
+    def _link(self, row, reverse):
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(row, reverse))
+
+    @staticmethod
+    def _name(field):
+        return field.lstrip('-')
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def _value(row, name):
+        return row[name] if isinstance(row, dict) else getattr(row, name)
+
+
+async def apaginate(request, queryset, serializer_class):
+    """
+    Paginación por número de página para vistas async, con el mismo formato
+    de respuesta que ``PageNumberPagination`` (count, next, previous, results).
+
+    Returns:
+        dict con la página, o None si ``?page=`` no es una página válida
+    """
+    page_size = HybridPagination.page_size
+    try:
+        page = int(request.GET.get('page', 1))
+    except ValueError:
+        return None
+
+    count = await queryset.acount()
+    num_pages = max(1, -(-count // page_size))
+    if not 1 <= page <= num_pages:
+        return None
+
+    offset = (page - 1) * page_size
+    rows = [obj async for obj in queryset[offset:offset + page_size]]
+
+    url = request.build_absolute_uri()
+    if page == 1:
+        previous = None
+    elif page == 2:
+        previous = remove_query_param(url, 'page')
+    else:
+        previous = replace_query_param(url, 'page', page - 1)
+
+    return {
+        'count': count,
+        'next': replace_query_param(url, 'page', page + 1) if page < num_pages else None,
+        'previous': previous,
+        'results': serializer_class(rows, many=True).data,
+    }
@@ -0,0 +1,244 @@
+"""
+Perfilador de queries SQL por request y detector de N+1.
+
+``QueryProfilerMiddleware`` registra cada query de la request (forma
+normalizada, duración y la línea del proyecto que la originó), agrupa las
+que se repiten con la misma forma desde el mismo origen y, si alguna supera
+``QUERY_PROFILER_N_PLUS_ONE_THRESHOLD`` repeticiones, la marca como N+1.
+El resumen sale en los headers ``X-Query-Profile`` y ``Server-Timing`` y en
+una línea de log (``WARNING`` si hay N+1).
+
+Se activa para todas las requests con ``QUERY_PROFILER_ENABLED=1`` o para
+una sola con el header ``X-Profile-Queries: 1`` si
+``QUERY_PROFILER_ALLOW_HEADER`` lo permite (por defecto, solo con DEBUG).
+
+``query_budget`` aplica lo mismo a un bloque de código, para comprobar en
+pruebas o comandos que un endpoint no pasa de cierto número de queries.
+"""
+import logging
+import os
+import re
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger('profiling')
+
+_current = ContextVar('query_profile', default=None)
+
+# Listas de placeholders (IN (%s, %s, ...), VALUES (...), (...)) y literales
+_IN_LIST = re.compile(r'\((?:\s*%s\s*,)+\s*%s\s*\)')
+_VALUES = re.compile(r'(VALUES\s*\([^)]*\))(?:\s*,\s*\([^)]*\))+', re.IGNORECASE)
+_NUMBER = re.compile(r'\b\d+\b')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+
+
+def query_shape(sql):
+    """Normaliza una query para agrupar las que solo cambian en valores."""
+    shape = _IN_LIST.sub('(...)', sql)
+    shape = _VALUES.sub(r'\1, ...', shape)
+    shape = _STRING.sub('?', shape)
+    return _NUMBER.sub('?', shape)
+
+
+# Módulos propios que envuelven la ejecución de queries: no son el origen
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+_WRAPPERS = tuple(
+    os.path.join(_PACKAGE_DIR, name)
+    for name in ('profiling.py', 'tracing.py', 'instrumentation.py', 'db' + os.sep)
+)
+
+
+@lru_cache(maxsize=1024)
+def _project_path(filename):
+    # Ruta relativa a BASE_DIR si el archivo es del proyecto (no de Django,
+    # DRF u otra dependencia, ni un execute wrapper); None si no
+    if filename.startswith('<'):
+        return None
+    path = os.path.abspath(filename)
+    base = str(settings.BASE_DIR) + os.sep
+    if not path.startswith(base) or 'site-packages' in path or path.startswith(_WRAPPERS):
+        return None
+    return path[len(base):]
+
+
+def _origin():
+    # Primer frame del código del proyecto que llevó a la query
+    frame = sys._getframe(2)
+    while frame is not None:
+        path = _project_path(frame.f_code.co_filename)
+        if path is not None:
+            return f'{path}:{frame.f_lineno} in {frame.f_code.co_name}'
+        frame = frame.f_back
+    return '<unknown>'
+
+
+class QueryProfile:
+    """Queries registradas durante una request o un bloque ``query_budget``."""
+
+    def __init__(self):
+        self.queries = []
+
+    def record(self, sql, duration, origin):
+        self.queries.append((query_shape(sql), duration, origin))
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def time_ms(self):
+        return sum(duration for _, duration, _ in self.queries) * 1000
+
+    def repeated(self, threshold=None):
+        """
+        Grupos de queries con la misma forma y el mismo origen.
+
+        Returns:
+            list: dicts con sql, origin, count y time_ms, de mayor a menor
+            repetición; solo los que llegan a ``threshold``
+        """
+        threshold = threshold or settings.QUERY_PROFILER_N_PLUS_ONE_THRESHOLD
+        groups = {}
+        for shape, duration, origin in self.queries:
+            group = groups.setdefault((shape, origin), [0, 0.0])
+            group[0] += 1
+            group[1] += duration
+        return sorted(
+            (
+                {'sql': shape, 'origin': origin, 'count': count, 'time_ms': round(total * 1000, 2)}
+                for (shape, origin), (count, total) in groups.items()
+                if count >= threshold
+            ),
+            key=lambda group: group['count'],
+            reverse=True,
+        )
+
+    def report(self):
+        lines = [f'{self.count} queries in {self.time_ms:.2f} ms']
+        for shape, duration, origin in self.queries:
+            lines.append(f'  {duration * 1000:7.2f} ms  {origin}  {shape[:200]}')
+        for group in self.repeated():
+            lines.append(f"  N+1: {group['count']}x from {group['origin']}: {group['sql'][:200]}")
+        return '\n'.join(lines)
+
+
+def _profile_query(execute, sql, params, many, context):
+    profile = _current.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.record(sql, time.perf_counter() - start, _origin())
+
+
+def _install_query_wrapper(sender, connection, **kwargs):
+    if _profile_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_profile_query)
+
+
+connection_created.connect(_install_query_wrapper)
+
+
+@contextmanager
+def query_budget(max_queries, allow_n_plus_one=False):
+    """
+    Falla (``AssertionError``) si el bloque ejecuta más de ``max_queries``
+    queries o, salvo ``allow_n_plus_one``, alguna query N+1.
+
+    Uso::
+
+        with query_budget(2):
+            client.get('/api/posts/')
+    """
+    # Las conexiones abiertas antes de importar este módulo no tienen el wrapper
+    for connection in connections.all(initialized_only=True):
+        _install_query_wrapper(None, connection)
+    profile = QueryProfile()
+    token = _current.set(profile)
+    try:
+        yield profile
+    finally:
+        _current.reset(token)
+    if profile.count > max_queries:
+        raise AssertionError(f'Query budget exceeded ({profile.count} > {max_queries}): {profile.report()}')
+    if not allow_n_plus_one and profile.repeated():
+        raise AssertionError(f'N+1 queries detected: {profile.report()}')
+
+
+class QueryProfilerMiddleware:
+    """
+    Perfila las requests habilitadas. Va justo después de los middlewares de
+    métricas y trazas para incluir las queries del resto de middlewares.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._enabled(request):
+            return self.get_response(request)
+        profile = QueryProfile()
+        token = _current.set(profile)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._summarize(request, response, profile)
+        return response
+
+    async def __acall__(self, request):
+        if not self._enabled(request):
+            return await self.get_response(request)
+        profile = QueryProfile()
+        token = _current.set(profile)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._summarize(request, response, profile)
+        return response
+
+    def _enabled(self, request):
+        if settings.QUERY_PROFILER_ENABLED:
+            return True
+        return settings.QUERY_PROFILER_ALLOW_HEADER and request.headers.get('X-Profile-Queries') == '1'
+
+    def _summarize(self, request, response, profile):
+        repeated = profile.repeated()
+        time_ms = round(profile.time_ms, 2)
+        response['X-Query-Profile'] = f'count={profile.count}, time_ms={time_ms}, n_plus_one={len(repeated)}'
+        response['Server-Timing'] = f'db;dur={time_ms};desc="{profile.count} queries"'
+
+        slowest = sorted(profile.queries, key=lambda query: query[1], reverse=True)[:5]
+        extra = {
+            'method': request.method,
+            'path': request.path,
+            'queries': profile.count,
+            'db_time_ms': time_ms,
+            'slowest': [
+                {'sql': shape, 'time_ms': round(duration * 1000, 2), 'origin': origin}
+                for shape, duration, origin in slowest
+            ],
+            'n_plus_one': repeated,
+        }
+        message = f'{request.method} {request.path}: {profile.count} queries in {time_ms} ms'
+        if repeated:
+            logger.warning(f'{message}, {len(repeated)} N+1', extra=extra)
+        else:
+            logger.info(message, extra=extra)
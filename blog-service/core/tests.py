@@ -0,0 +1,182 @@
+import threading
+import time
+import uuid
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import Http404
+from django.test import SimpleTestCase, override_settings
+
+from . import versioned_cache
+from .tokens import InvalidToken, TokenVerifier, sign
+
+
+class NamespaceTestCase(SimpleTestCase):
+
+    def setUp(self):
+        # Namespace propio por test: Redis es compartido con la base de desarrollo
+        self.namespace = f'test-{uuid.uuid4().hex}'
+        self.addCleanup(cache.delete_many, [
+            versioned_cache.version_key(self.namespace), versioned_cache.changed_key(self.namespace),
+        ])
+
+    def fail(self):
+        raise AssertionError('compute() should not run')
+
+
+class VersionedCacheTests(NamespaceTestCase):
+    """``get_or_compute``: invalidación por versión y un solo recálculo por clave."""
+
+    def test_bump_invalidates_the_namespace(self):
+        values = iter([1, 2])
+        compute = lambda: next(values)
+        self.assertEqual(versioned_cache.get_or_compute(self.namespace, 'k', compute, 60), 1)
+        self.assertEqual(versioned_cache.get_or_compute(self.namespace, 'k', compute, 60), 1)
+
+        before = versioned_cache.version(self.namespace)
+        versioned_cache.bump(self.namespace)
+        self.assertNotEqual(versioned_cache.version(self.namespace), before)
+        self.assertEqual(versioned_cache.get_or_compute(self.namespace, 'k', compute, 60), 2)
+
+    def test_concurrent_misses_compute_once(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'value'
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(
+                versioned_cache.get_or_compute(self.namespace, 'k', compute, 60)
+            ))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['value'] * 8)
+
+    def test_waits_for_the_process_holding_the_lock(self):
+        # Otro proceso tomó el lock de Redis y guarda el valor un momento después
+        full_key = versioned_cache.make_key(self.namespace, 'k')
+        cache.add(f'{full_key}:lock', 1, 5)
+        self.addCleanup(cache.delete, f'{full_key}:lock')
+        entry = ('from another process', time.time() + 60, 0.01, None)
+        timer = threading.Timer(0.1, cache.set, (full_key, entry, 60))
+        timer.start()
+        self.addCleanup(timer.cancel)
+
+        self.assertEqual(versioned_cache.get_or_compute(self.namespace, 'k', self.fail, 60), 'from another process')
+
+
+class StampedeProtectionTests(NamespaceTestCase):
+    """XFetch, stale-while-revalidate y caché negativa de ``get_or_compute``."""
+
+    def store(self, value, fresh_for, delta=0.01, missing=None):
+        full_key = versioned_cache.make_key(self.namespace, 'k')
+        cache.set(full_key, (value, time.time() + fresh_for, delta, missing), 60)
+        return full_key
+
+    def test_xfetch_recomputes_early_only_near_expiry(self):
+        far = ('v', time.time() + 60, 0.1, None)
+        near = ('v', time.time() + 0.05, 0.1, None)
+        # u -> 1: log(1 - u) muy negativo, la lectura más "impaciente" posible
+        with mock.patch.object(versioned_cache.random, 'random', return_value=0.999):
+            self.assertTrue(versioned_cache._is_fresh(far))
+            self.assertFalse(versioned_cache._is_fresh(near))
+        with mock.patch.object(versioned_cache.random, 'random', return_value=0.0):
+            self.assertTrue(versioned_cache._is_fresh(near))
+        self.assertFalse(versioned_cache._is_fresh(('v', time.time() - 1, 0.0, None)))
+
+    def test_serves_stale_while_another_process_recomputes(self):
+        full_key = self.store('old', fresh_for=-1)
+        cache.add(f'{full_key}:lock', 1, 5)
+        self.addCleanup(cache.delete, f'{full_key}:lock')
+        self.assertEqual(versioned_cache.get_or_compute(self.namespace, 'k', self.fail, 60, stale_timeout=30), 'old')
+
+    def test_expired_entry_is_recomputed(self):
+        self.store('old', fresh_for=-1)
+        self.assertEqual(versioned_cache.get_or_compute(self.namespace, 'k', lambda: 'new', 60), 'new')
+        self.assertEqual(versioned_cache.get_or_compute(self.namespace, 'k', self.fail, 60), 'new')
+
+    def test_negative_caching(self):
+        def missing():
+            raise Http404('No Post matches the given query.')
+
+        with self.assertRaises(Http404):
+            versioned_cache.get_or_compute(self.namespace, 'k', missing, 60, negative_timeout=30)
+        with self.assertRaisesMessage(Http404, 'No Post matches'):
+            versioned_cache.get_or_compute(self.namespace, 'k', self.fail, 60, negative_timeout=30)
+
+    def test_404_is_not_cached_without_negative_timeout(self):
+        calls = []
+
+        def missing():
+            calls.append(1)
+            raise Http404('gone')
+
+        for _ in range(2):
+            with self.assertRaises(Http404):
+                versioned_cache.get_or_compute(self.namespace, 'k', missing, 60)
+        self.assertEqual(len(calls), 2)
+
+
+@override_settings(AUTH_JWT_KEYS=['current-key', 'previous-key'], AUTH_JWT_LEEWAY=0)
+class TokenVerifierTests(SimpleTestCase):
+    """Verificación local de JWT con LRU de tokens ya verificados."""
+
+    def setUp(self):
+        self.verifier = TokenVerifier(cache_size=2)
+
+    def token(self, key='current-key', **claims):
+        return sign({'token_type': 'access', 'user_id': 1, 'exp': int(time.time()) + 60, **claims}, key)
+
+    def test_valid_token_is_cached(self):
+        token = self.token()
+        self.assertEqual(self.verifier.verify(token)['user_id'], 1)
+        self.assertEqual(self.verifier.verify(token)['user_id'], 1)
+        self.assertEqual((self.verifier.hits, self.verifier.misses), (1, 1))
+
+    def test_previous_key_is_accepted_until_retired(self):
+        token = self.token('previous-key')
+        self.assertEqual(self.verifier.verify(token)['user_id'], 1)
+        # Retirar la clave vacía el LRU: el token cacheado tampoco vale
+        with override_settings(AUTH_JWT_KEYS=['current-key']):
+            with self.assertRaisesMessage(InvalidToken, 'Invalid signature'):
+                self.verifier.verify(token)
+
+    def test_cached_token_still_expires(self):
+        token = self.token(exp=int(time.time()) + 1)
+        self.verifier.verify(token)
+        with mock.patch('core.tokens.time.time', return_value=time.time() + 5):
+            with self.assertRaisesMessage(InvalidToken, 'Token expired'):
+                self.verifier.verify(token)
+
+    def test_rejected_tokens(self):
+        header, payload, signature = self.token().split('.')
+        forged = sign({'token_type': 'access', 'user_id': 2, 'exp': int(time.time()) + 60}, 'current-key').split('.')[1]
+        none_header = 'eyJhbGciOiJub25lIiwidHlwIjoiSldUIn0'  # {"alg":"none","typ":"JWT"}
+        cases = {
+            'Invalid signature': [self.token('other-key'), f'{header}.{forged}.{signature}'],
+            'Unsupported algorithm': [f'{none_header}.{payload}.'],
+            'Not an access token': [self.token(token_type='refresh')],
+            'Token expired': [self.token(exp=int(time.time()) - 10)],
+            'Malformed token': ['not-a-token', f'{header}.{signature}'],
+        }
+        for message, tokens in cases.items():
+            for token in tokens:
+                with self.subTest(token=token), self.assertRaisesMessage(InvalidToken, message):
+                    self.verifier.verify(token)
+
+    def test_lru_evicts_least_recently_used(self):
+        first, second, third = (self.token(user_id=i) for i in range(3))
+        for token in (first, second, first, third):
+            self.verifier.verify(token)
+        self.assertIn(first, self.verifier._cache)
+        self.assertNotIn(second, self.verifier._cache)
+        self.assertEqual(len(self.verifier._cache), 2)
@@ -1,6 +1,14 @@
+from django.conf import settings
 from django.urls import path
-from .views import healthcheck
+from .health import livez, readyz
+from .instrumentation import metrics
+from .views import readyz_async
+
+readiness = readyz_async if settings.BLOG_SERVER_MODE == 'asgi' else readyz
 
 urlpatterns = [
-    path('healthz', healthcheck, name='healthcheck'),
+    path('livez', livez, name='livez'),
+    path('readyz', readiness, name='readyz'),
+    path('healthz', readiness, name='healthcheck'),
+    path('metrics', metrics, name='metrics'),
 ]
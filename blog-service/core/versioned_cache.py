@@ -0,0 +1,281 @@
+"""
+Caché versionada por namespace a prueba de estampidas.
+
+Cada namespace (``categories``, ``posts``...) tiene un número de versión en
+Redis que forma parte de la clave de todas sus entradas. ``bump`` incrementa
+la versión y con eso invalida de una vez todo lo derivado del namespace, en
+todas las réplicas: las entradas viejas dejan de leerse y expiran por TTL.
+También guarda la hora del cambio (``ns:{namespace}:changed``), que usan los
+validadores HTTP de ``core.conditional``.
+
+``get_or_compute`` (y el decorador ``cached_view`` para vistas DRF) guarda
+el valor con su vencimiento y lo que tardó en calcularse, y evita que una
+clave que vence mande a todos los workers a PostgreSQL a la vez:
+
+- TTL con jitter (±10%) para que entradas creadas juntas no venzan juntas.
+- Expiración anticipada probabilística (XFetch): una lectura puede decidir
+  recalcular antes del vencimiento, con más probabilidad cuanto más cerca
+  está y más caro es el cálculo.
+- Stale-while-revalidate: vencida, la entrada se sigue sirviendo durante
+  ``stale_timeout`` mientras una sola request la recalcula.
+- Coalescencia: un solo recálculo en vuelo por clave y proceso (el resto de
+  los hilos espera su resultado) y un lock en Redis (``cache.add``) entre
+  procesos.
+- Caché negativa: un ``Http404`` se guarda ``negative_timeout`` segundos,
+  así un slug inexistente no llega a la base en cada request.
+
+Cada lectura se cuenta por namespace y resultado (hit, stale, coalesced,
+negative, miss) en ``cache_results_total`` (``/metrics``) y en los
+contadores compartidos de ``core.metrics``.
+"""
+import functools
+import math
+import random
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.http import Http404
+from prometheus_client import Counter
+from rest_framework.response import Response
+
+from . import aredis, metrics
+
+RESULTS = ('hit', 'stale', 'coalesced', 'negative', 'miss')
+CACHE_RESULTS = Counter(
+    'cache_results_total', 'Lecturas de la caché versionada por resultado',
+    ['namespace', 'result'],
+)
+
+TTL_JITTER = 0.1
+# Cota del recálculo: si el proceso que tiene el lock muere, vence solo
+LOCK_TIMEOUT = 10
+# Espera máxima de las requests sin valor anterior mientras otra recalcula
+WAIT_TIMEOUT = 2.0
+WAIT_STEP = 0.05
+
+# Recálculos en vuelo en este proceso: clave -> Event que se marca al terminar
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def version_key(namespace):
+    return f'ns:{namespace}:version'
+
+
+def _initial_version():
+    # Basada en el reloj: si Redis desaloja la versión no se reutiliza una vieja
+    return time.time_ns() // 1_000_000
+
+
+def version(namespace):
+    """Versión actual del namespace (se crea la primera vez)."""
+    key = version_key(namespace)
+    current = cache.get(key)
+    if current is None:
+        cache.add(key, _initial_version(), timeout=None)
+        current = cache.get(key)
+    return current
+
+
+def changed_key(namespace):
+    return f'ns:{namespace}:changed'
+
+
+def bump(*namespaces):
+    """Invalida todas las entradas de los namespaces y anota cuándo cambiaron."""
+    # Primero la hora: quien lea en el medio ve una hora nueva con la versión
+    # vieja (un 200 de más), nunca al revés
+    cache.set_many({changed_key(namespace): time.time() for namespace in namespaces}, timeout=None)
+    for namespace in namespaces:
+        try:
+            cache.incr(version_key(namespace))
+        except ValueError:
+            cache.add(version_key(namespace), _initial_version(), timeout=None)
+
+
+def make_key(namespace, key, current=None):
+    if current is None:
+        current = version(namespace)
+    return f'ns:{namespace}:{current}:{key}'
+
+
+async def amake_key(namespace, key):
+    """Versión async de ``make_key`` (modo ASGI)."""
+    current = await aredis.cache_get(version_key(namespace))
+    if current is None:
+        current = await sync_to_async(version)(namespace)
+    return make_key(namespace, key, current)
+
+
+def _count(namespace, result):
+    CACHE_RESULTS.labels(namespace, result).inc()
+    metrics.incr(f'cache.{namespace}.{result}')
+
+
+def stats(namespace):
+    """Lecturas del namespace por resultado (todos los workers)."""
+    counters = metrics.get_counters(*(f'cache.{namespace}.{result}' for result in RESULTS))
+    return {result: counters[f'cache.{namespace}.{result}'] for result in RESULTS}
+
+
+def _is_fresh(entry, beta=1.0):
+    # Entrada: (valor, vigente_hasta, segundos_de_cálculo, mensaje_404 o None)
+    _, fresh_until, delta, _ = entry
+    # XFetch: log(u) con u en (0, 1] es <= 0, así que adelanta el vencimiento
+    return time.time() - delta * beta * math.log(1.0 - random.random()) < fresh_until
+
+
+def _unwrap(namespace, entry, result):
+    value, _, _, missing = entry
+    if missing is not None:
+        _count(namespace, 'negative')
+        raise Http404(missing)
+    _count(namespace, result)
+    return value
+
+
+def _jitter(seconds):
+    return seconds * random.uniform(1 - TTL_JITTER, 1 + TTL_JITTER)
+
+
+def _wait(key):
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(WAIT_STEP)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+    return None
+
+
+def _store(full_key, compute, timeout, stale_timeout, negative_timeout):
+    start = time.perf_counter()
+    try:
+        value, missing, fresh = compute(), None, _jitter(timeout)
+    except Http404 as e:
+        if not negative_timeout:
+            raise
+        value, missing, fresh = None, str(e), _jitter(negative_timeout)
+    delta = time.perf_counter() - start
+    entry = (value, time.time() + fresh, delta, missing)
+    cache.set(full_key, entry, fresh + (stale_timeout if missing is None else 0))
+    return entry
+
+
+def _refresh(namespace, full_key, entry, compute, timeout, stale_timeout, negative_timeout):
+    # Entre procesos: solo quien toma el lock de Redis recalcula
+    lock = f'{full_key}:lock'
+    acquired = cache.add(lock, 1, LOCK_TIMEOUT)
+    if not acquired:
+        if entry is not None:
+            return _unwrap(namespace, entry, 'stale')
+        entry = _wait(full_key)
+        if entry is not None:
+            return _unwrap(namespace, entry, 'coalesced')
+        # Quien tiene el lock tarda demasiado: calcular sin él
+
+    try:
+        _count(namespace, 'miss')
+        entry = _store(full_key, compute, timeout, stale_timeout, negative_timeout)
+    finally:
+        if acquired:
+            cache.delete(lock)
+    value, _, _, missing = entry
+    if missing is not None:
+        raise Http404(missing)
+    return value
+
+
+def get_or_compute(namespace, key, compute, timeout, stale_timeout=0, negative_timeout=0):
+    """
+    Valor cacheado de ``key`` en el namespace, o ``compute()`` con un solo
+    recálculo a la vez por clave.
+
+    Args:
+        timeout: segundos que la entrada está vigente (con jitter)
+        stale_timeout: segundos extra que se sirve vencida mientras otra
+            request la recalcula
+        negative_timeout: segundos que se recuerda un ``Http404`` de
+            ``compute`` (0 = no se cachea)
+
+    Raises:
+        Http404: si ``compute`` lo lanzó ahora o dentro de la caché negativa
+    """
+    full_key = make_key(namespace, key)
+    entry = cache.get(full_key)
+    if entry is not None and _is_fresh(entry):
+        return _unwrap(namespace, entry, 'hit')
+
+    # Dentro del proceso: el primer hilo recalcula y el resto espera su resultado
+    with _inflight_lock:
+        done = _inflight.get(full_key)
+        leader = done is None
+        if leader:
+            done = _inflight[full_key] = threading.Event()
+
+    if not leader:
+        if entry is not None:
+            return _unwrap(namespace, entry, 'stale')
+        done.wait(WAIT_TIMEOUT)
+        entry = cache.get(full_key)
+        if entry is not None:
+            return _unwrap(namespace, entry, 'coalesced')
+        return _refresh(namespace, full_key, None, compute, timeout, stale_timeout, negative_timeout)
+
+    try:
+        return _refresh(namespace, full_key, entry, compute, timeout, stale_timeout, negative_timeout)
+    finally:
+        with _inflight_lock:
+            _inflight.pop(full_key, None)
+        done.set()
+
+
+async def aget_fresh(namespace, key):
+    """
+    Valor cacheado y vigente de ``key`` sin bloquear el event loop, o
+    ``None`` si hay que pasar por ``get_or_compute`` (modo ASGI).
+    """
+    entry = await aredis.cache_get(await amake_key(namespace, key))
+    if entry is None or entry[3] is not None or not _is_fresh(entry):
+        return None
+    _count(namespace, 'hit')
+    return entry[0]
+
+
+class _Uncacheable(Exception):
+
+    def __init__(self, response):
+        self.response = response
+
+
+def cached_view(namespace, timeout, stale_timeout=0, negative_timeout=0, key=None):
+    """
+    Decorador para métodos de vistas DRF (``list``, ``retrieve``, acciones):
+    cachea ``response.data`` de las respuestas 200 con ``get_or_compute``.
+
+    Las demás respuestas se devuelven sin cachear; los ``Http404`` se
+    recuerdan ``negative_timeout`` segundos.
+
+    Args:
+        key: callable(request, *args, **kwargs) -> clave; por defecto la URL
+            absoluta, porque la paginación de DRF arma links absolutos
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            def compute():
+                response = method(view, request, *args, **kwargs)
+                if response.status_code != 200:
+                    raise _Uncacheable(response)
+                return response.data
+
+            cache_key = key(request, *args, **kwargs) if key else request.build_absolute_uri()
+            try:
+                data = get_or_compute(namespace, cache_key, compute, timeout, stale_timeout, negative_timeout)
+            except _Uncacheable as e:
+                return e.response
+            return Response(data)
+        return wrapper
+    return decorator
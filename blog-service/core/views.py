@@ -1,48 +1,15 @@
+from asgiref.sync import sync_to_async
 from django.http import JsonResponse
-from django.db import connection
-from django.core.cache import cache
-import logging
 
-logger = logging.getLogger(__name__)
+from .db.pool import pool_stats
+from .health import get_health
 
 
-def healthcheck(request):
+async def readyz_async(request):
     """
-    Endpoint de healthcheck que verifica:
-    - Conexión a PostgreSQL
-    - Conexión a Redis
+    Versión async de ``health.readyz`` (modo ASGI): la espera de las
+    comprobaciones ocurre fuera del event loop.
     """
-    health_status = {
-        'status': 'healthy',
-        'checks': {
-            'database': 'unknown',
-            'redis': 'unknown'
-        }
-    }
-    
-    # Check Database
-    try:
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT 1")
-        health_status['checks']['database'] = 'ok'
-    except Exception as e:
-        health_status['status'] = 'unhealthy'
-        health_status['checks']['database'] = f'error: {str(e)}'
-        logger.error(f"Database health check failed: {str(e)}")
-    
-    # Check Redis
-    try:
-        cache.set('health_check', 'ok', 10)
-        result = cache.get('health_check')
-        if result == 'ok':
-            health_status['checks']['redis'] = 'ok'
-        else:
-            health_status['checks']['redis'] = 'error: unexpected value'
-            health_status['status'] = 'unhealthy'
-    except Exception as e:
-        health_status['status'] = 'unhealthy'
-        health_status['checks']['redis'] = f'error: {str(e)}'
-        logger.error(f"Redis health check failed: {str(e)}")
-    
-    status_code = 200 if health_status['status'] == 'healthy' else 503
-    return JsonResponse(health_status, status=status_code)
+    health = await sync_to_async(get_health, thread_sensitive=False)()
+    health['db_pool'] = pool_stats()
+    return JsonResponse(health, status=200 if health['status'] == 'healthy' else 503)
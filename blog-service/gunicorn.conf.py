@@ -0,0 +1,38 @@
+"""
+Configuración de gunicorn.
+
+BLOG_SERVER_MODE elige la aplicación y el tipo de worker:
+- wsgi: blog_service.wsgi con workers sync (uno por request)
+- asgi: blog_service.asgi con workers uvicorn (event loop por worker)
+
+Las métricas Prometheus de todos los workers se escriben en
+PROMETHEUS_MULTIPROC_DIR y /metrics las agrega (ver core/instrumentation.py).
+"""
+import os
+import shutil
+
+mode = os.environ.get('BLOG_SERVER_MODE', 'wsgi')
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8001')
+workers = int(os.environ.get('GUNICORN_WORKERS', '3'))
+
+if mode == 'asgi':
+    wsgi_app = 'blog_service.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    wsgi_app = 'blog_service.wsgi:application'
+
+# Se hereda en los workers antes de que importen prometheus_client
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/prometheus')
+
+
+def on_starting(server):
+    # Los valores de una ejecución anterior no deben sumarse a los nuevos
+    metrics_dir = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
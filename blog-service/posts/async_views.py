@@ -0,0 +1,75 @@
+"""
+Versiones async de las lecturas de posts (modo ASGI, ``BLOG_SERVER_MODE=asgi``).
+
+Usan el ORM async de Django y el cliente Redis async, así una espera de
+Redis o PostgreSQL suspende la corrutina en vez de bloquear el worker.
+Devuelven el mismo JSON que ``PostViewSet``; lo que no tiene versión async
+(búsqueda, cursor) se delega al ViewSet.
+"""
+from asgiref.sync import sync_to_async
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_GET
+
+from core import conditional
+from core.pagination import apaginate
+from .cache import LIST_NAMESPACE, adetail_validators, aget_detail, compute_detail
+from .counters import arecord_view
+from .serializers import LIST_FIELDS, PostDetailSerializer, PostListSerializer
+from .views import PostViewSet, list_last_modified
+
+# Mismo formato que el JSONRenderer de DRF
+JSON_PARAMS = {'ensure_ascii': False, 'separators': (',', ':')}
+
+# Parámetros del listado que solo entiende el ViewSet sync
+SYNC_LIST_PARAMS = {'q', 'search', 'cursor', 'pagination'}
+
+sync_post_list = sync_to_async(PostViewSet.as_view({'get': 'list'}))
+
+
+@sync_to_async
+def load_detail(slug):
+    # Fallo de caché: recálculo de un solo vuelo en un hilo, como en el modo WSGI
+    return compute_detail(
+        slug, lambda: dict(PostDetailSerializer(get_object_or_404(PostViewSet.queryset, slug=slug)).data),
+    )
+
+
+@require_GET
+async def post_list(request):
+    """GET /api/posts/ - mismo formato que PostViewSet.list."""
+    if SYNC_LIST_PARAMS.intersection(request.GET):
+        return await sync_post_list(request)
+
+    current, last_modified = await conditional.anamespace_validators(LIST_NAMESPACE, list_last_modified)
+    etag = conditional.make_etag(current, last_modified, request.get_full_path(), 'json')
+    response = conditional.not_modified(request, etag, last_modified)
+    if response is not None:
+        return response
+
+    payload = await apaginate(request, PostViewSet.queryset.only(*LIST_FIELDS), PostListSerializer)
+    if payload is None:
+        return JsonResponse({'detail': 'Invalid page.'}, status=404)
+    return conditional.set_validators(JsonResponse(payload, json_dumps_params=JSON_PARAMS), etag, last_modified)
+
+
+@require_GET
+async def post_detail(request, slug):
+    """GET /api/posts/{slug}/ - mismo comportamiento que PostViewSet.retrieve."""
+    payload = await aget_detail(slug)
+    if payload is None:
+        try:
+            payload = await load_detail(slug)
+        except Http404 as e:
+            return JsonResponse({'detail': str(e)}, status=404)
+
+    pending = await arecord_view(payload['id'])
+
+    current, last_modified = await adetail_validators(payload)
+    etag = conditional.make_etag(current, last_modified, request.get_full_path(), 'json')
+    response = conditional.not_modified(request, etag, last_modified)
+    if response is not None:
+        return response
+    return conditional.set_validators(
+        JsonResponse({**payload, 'views': payload['views'] + pending}, json_dumps_params=JSON_PARAMS), etag, last_modified,
+    )
@@ -0,0 +1,89 @@
+"""
+Caché del detalle de posts.
+
+Se guarda el payload serializado (no la respuesta HTTP) por slug, de modo
+que la vista sigue ejecutándose en cada request y puede contar la vista y
+superponer el contador vivo sobre el valor cacheado.
+
+Las claves están en el namespace versionado ``posts``: el payload incluye
+el autor y la categoría, así que modificarlos invalida todos los detalles de
+una vez (``versioned_cache.bump``). El recálculo es a prueba de estampidas
+(stale-while-revalidate, un solo recálculo por slug) y los slugs
+inexistentes se recuerdan ``POST_DETAIL_NEGATIVE_TTL`` segundos.
+
+El listado no se cachea, pero sus validadores HTTP (``core.conditional``)
+viven en el namespace ``post_list``, que se invalida al modificar posts,
+autores o categorías.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from core import conditional, metrics, versioned_cache
+from core.latency import ainject, inject
+
+CACHE_NAMESPACE = 'posts'
+LIST_NAMESPACE = 'post_list'
+
+
+def compute_detail(slug, compute):
+    """
+    Payload del post desde la caché o ``compute()``.
+
+    Raises:
+        Http404: si el post no existe (también desde la caché negativa)
+    """
+    return versioned_cache.get_or_compute(
+        CACHE_NAMESPACE,
+        f'detail:{slug}',
+        compute,
+        settings.POST_DETAIL_CACHE_TTL,
+        stale_timeout=settings.POST_DETAIL_STALE_TTL,
+        negative_timeout=settings.POST_DETAIL_NEGATIVE_TTL,
+    )
+
+
+def get_detail(slug, compute):
+    inject()
+    return compute_detail(slug, compute)
+
+
+async def aget_detail(slug):
+    """Payload cacheado y vigente o ``None`` (modo ASGI; el fallo va por ``compute_detail``)."""
+    await ainject()
+    return await versioned_cache.aget_fresh(CACHE_NAMESPACE, f'detail:{slug}')
+
+
+def invalidate_detail(*slugs):
+    current = versioned_cache.version(CACHE_NAMESPACE)
+    cache.delete_many([versioned_cache.make_key(CACHE_NAMESPACE, f'detail:{slug}', current) for slug in slugs])
+
+
+def _detail_validators(state, payload):
+    current, changed = state
+    updated_at = payload['updated_at']
+    return f'{current}:{updated_at}', max(conditional.timestamp(updated_at), changed)
+
+
+def detail_validators(payload):
+    """
+    (versión, Last-Modified) del detalle a partir del payload cacheado: su
+    ``updated_at`` y la versión del namespace, que cambia con el autor o la
+    categoría.
+    """
+    return _detail_validators(conditional.namespace_state(CACHE_NAMESPACE), payload)
+
+
+async def adetail_validators(payload):
+    return _detail_validators(await conditional.anamespace_state(CACHE_NAMESPACE), payload)
+
+
+def detail_cache_stats():
+    counters = versioned_cache.stats(CACHE_NAMESPACE)
+    misses = counters['miss']
+    hits = sum(counters.values()) - misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': metrics.hit_rate(hits, misses),
+        **{result: counters[result] for result in ('stale', 'coalesced', 'negative')},
+    }
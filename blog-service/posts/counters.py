@@ -0,0 +1,122 @@
+"""
+Contador de vistas write-behind.
+
+Cada vista se acumula en un hash de Redis (``HINCRBY``) y un proceso
+periódico vuelca los incrementos a PostgreSQL con UPDATEs atómicos
+``views = views + n`` agrupados por incremento.
+"""
+import logging
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F
+from django_redis import get_redis_connection
+
+from core import aredis
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = 'posts:views:pending'
+FLUSHING_KEY = 'posts:views:flushing'
+FLUSH_LOCK_KEY = 'posts:views:flush-lock'
+
+
+def _redis():
+    return get_redis_connection('default')
+
+
+def record_view(post_id, amount=1):
+    """
+    Registra vistas de un post sin tocar la base de datos.
+
+    Si Redis no está disponible, aplica el incremento directamente en
+    PostgreSQL para no perder la vista.
+
+    Returns:
+        int: vistas del post pendientes de volcar (incluida esta)
+    """
+    try:
+        pipe = _redis().pipeline(transaction=False)
+        pipe.hincrby(PENDING_KEY, post_id, amount)
+        pipe.hget(FLUSHING_KEY, post_id)
+        pending, flushing = pipe.execute()
+        return pending + int(flushing or 0)
+    except Exception as e:
+        logger.error(f"View counter buffer unavailable, writing through: {str(e)}")
+        from .models import Post
+        Post.objects.filter(pk=post_id).update(views=F('views') + amount)
+        return 0
+
+
+async def arecord_view(post_id, amount=1):
+    """Versión async de ``record_view`` (modo ASGI)."""
+    try:
+        pipe = aredis.get_client().pipeline(transaction=False)
+        pipe.hincrby(PENDING_KEY, post_id, amount)
+        pipe.hget(FLUSHING_KEY, post_id)
+        pending, flushing = await pipe.execute()
+        return pending + int(flushing or 0)
+    except Exception as e:
+        logger.error(f"View counter buffer unavailable, writing through: {str(e)}")
+        from .models import Post
+        await Post.objects.filter(pk=post_id).aupdate(views=F('views') + amount)
+        return 0
+
+
+def pending_views(post_id=None):
+    """
+    Vistas acumuladas pendientes de volcar.
+
+    Sin ``post_id`` retorna el total de todos los posts.
+    """
+    try:
+        r = _redis()
+        if post_id is not None:
+            return sum(int(r.hget(key, post_id) or 0) for key in (PENDING_KEY, FLUSHING_KEY))
+        return sum(int(value) for key in (PENDING_KEY, FLUSHING_KEY) for value in r.hvals(key))
+    except Exception as e:
+        logger.error(f"Could not read pending views: {str(e)}")
+        return 0
+
+
+def flush_views():
+    """
+    Vuelca las vistas acumuladas a PostgreSQL.
+
+    El hash pendiente se renombra de forma atómica, así las vistas que
+    llegan durante el volcado se acumulan en un hash nuevo. Si un volcado
+    anterior quedó a medias, se reprocesa su hash antes de tomar uno nuevo.
+
+    Returns:
+        int: número de vistas volcadas
+    """
+    from .cache import invalidate_detail
+    from .models import Post
+
+    r = _redis()
+    with r.lock(FLUSH_LOCK_KEY, timeout=300, blocking_timeout=5):
+        if not r.exists(FLUSHING_KEY):
+            if not r.exists(PENDING_KEY):
+                return 0
+            r.rename(PENDING_KEY, FLUSHING_KEY)
+
+        pending = r.hgetall(FLUSHING_KEY)
+
+        # Un UPDATE por cada incremento distinto: WHERE id IN (...)
+        by_amount = defaultdict(list)
+        for post_id, amount in pending.items():
+            by_amount[int(amount)].append(int(post_id))
+
+        with transaction.atomic():
+            for amount, post_ids in by_amount.items():
+                Post.objects.filter(pk__in=post_ids).update(views=F('views') + amount)
+
+        r.delete(FLUSHING_KEY)
+
+        # Los payloads cacheados ya no reflejan el valor persistido
+        slugs = Post.objects.filter(pk__in=[int(post_id) for post_id in pending]).values_list('slug', flat=True)
+        invalidate_detail(*slugs)
+
+    total = sum(amount * len(post_ids) for amount, post_ids in by_amount.items())
+    logger.info(f"Flushed {total} views for {len(pending)} posts")
+    return total
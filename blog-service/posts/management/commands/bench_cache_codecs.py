@@ -0,0 +1,91 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django_redis.compressors.identity import IdentityCompressor
+from django_redis.exceptions import CompressorError
+from django_redis.serializers.pickle import PickleSerializer
+
+from core.cache_codecs import MSGPackSerializer, ORJSONSerializer, ThresholdCompressor
+from core.datagen import TextGenerator
+from posts.models import Post
+from posts.serializers import PostDetailSerializer
+
+SERIALIZERS = (('pickle', PickleSerializer), ('orjson', ORJSONSerializer), ('msgpack', MSGPackSerializer))
+COMPRESSORS = ('none', 'zlib', 'lz4', 'zstd')
+
+
+class Command(BaseCommand):
+    help = 'Benchmark bytes stored and encode/decode latency of post detail cache entries per serializer and compressor'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=50, help='Published posts read from the database')
+        parser.add_argument('--body-kb', type=int, nargs='+', default=[20, 100], help='Extra synthetic posts with these body sizes')
+        parser.add_argument('--min-length', type=int, default=1024, help='COMPRESS_MIN_LENGTH of the compressors')
+        parser.add_argument('--repeat', type=int, default=200, help='Encode/decode rounds per payload')
+
+    def handle(self, *args, **options):
+        posts = Post.objects.filter(status='published').select_related('author', 'category')[:options['posts']]
+        details = [dict(PostDetailSerializer(post).data) for post in posts]
+        if not details:
+            raise CommandError('No published posts, run seed_blog first')
+
+        groups = [(f'{len(details)} posts from the DB', details)]
+        gen = TextGenerator(seed=1)
+        for kb in options['body_kb']:
+            body = gen.text(kb * 1024 // 6)[:kb * 1024]
+            groups.append((f'{kb} KB body', [{**details[0], 'body': body}]))
+
+        # Primera fila: lo que usa django-redis por defecto
+        codecs = [('pickle', PickleSerializer({}), IdentityCompressor({}))]
+        for serializer_name, serializer_class in SERIALIZERS:
+            for algorithm in COMPRESSORS:
+                if (serializer_name, algorithm) == ('pickle', 'none'):
+                    continue
+                try:
+                    serializer = serializer_class({})
+                    compressor = ThresholdCompressor({
+                        'COMPRESSOR_ALGORITHM': algorithm, 'COMPRESS_MIN_LENGTH': options['min_length'],
+                    })
+                except ImportError as e:
+                    self.stdout.write(f'skipping {serializer_name} + {algorithm}: {e}')
+                    continue
+                codecs.append((f'{serializer_name} + {algorithm}', serializer, compressor))
+
+        for group, payloads in groups:
+            # La forma de la entrada que guarda versioned_cache
+            entries = [(payload, time.time() + 120, 0.004, None) for payload in payloads]
+            self.stdout.write(f'\n{group}')
+            header = f"{'codec':<18}{'avg bytes':>11}{'vs pickle':>11}{'encode us':>11}{'decode us':>11}"
+            self.stdout.write(header)
+            self.stdout.write('-' * len(header))
+            base_size = None
+            for name, serializer, compressor in codecs:
+                size, encode_us, decode_us = self.measure(serializer, compressor, entries, options['repeat'])
+                base_size = base_size or size
+                self.stdout.write(
+                    f'{name:<18}{size:>11.0f}{size / base_size:>11.0%}{encode_us:>11.1f}{decode_us:>11.1f}'
+                )
+
+    def measure(self, serializer, compressor, entries, repeat):
+        sizes, encodes, decodes = [], [], []
+        for entry in entries:
+            # Igual que DefaultClient.encode/decode de django-redis
+            start = time.perf_counter()
+            for _ in range(repeat):
+                raw = compressor.compress(serializer.dumps(entry))
+            encodes.append((time.perf_counter() - start) / repeat * 1_000_000)
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                try:
+                    value = compressor.decompress(raw)
+                except CompressorError:
+                    value = raw
+                decoded = serializer.loads(value)
+            decodes.append((time.perf_counter() - start) / repeat * 1_000_000)
+
+            if decoded[0] != entry[0]:
+                raise CommandError(f'{type(serializer).__name__} did not round-trip the payload')
+            sizes.append(len(raw))
+        return statistics.mean(sizes), statistics.mean(encodes), statistics.mean(decodes)
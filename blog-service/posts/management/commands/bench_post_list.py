@@ -0,0 +1,99 @@
+import statistics
+import time
+import tracemalloc
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from authors.models import Author
+from authors.serializers import AuthorSerializer
+from categories.models import Category
+from categories.serializers import CategorySerializer
+from core.datagen import TextGenerator
+from posts.models import Post, make_excerpt
+from posts.serializers import LIST_FIELDS, PostListSerializer
+from posts.views import PostViewSet
+
+
+class ModelPostListSerializer(serializers.ModelSerializer):
+    """Serializer de lista anterior (ModelSerializer con serializers anidados)."""
+
+    author = AuthorSerializer(read_only=True)
+    category = CategorySerializer(read_only=True)
+
+    class Meta:
+        model = Post
+        fields = ['id', 'title', 'slug', 'excerpt', 'author', 'category', 'published_at', 'views']
+
+
+class Command(BaseCommand):
+    help = 'Benchmark latency and peak memory of a post list page with large bodies (full rows vs only() projection)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=100, help='Temporary published posts with large bodies')
+        parser.add_argument('--body-kb', type=int, default=100, help='Body size of each temporary post, in KB')
+        parser.add_argument('--rows', type=int, default=10, help='Rows per list (10 = one API page)')
+        parser.add_argument('--repeat', type=int, default=50, help='Measured runs per scenario')
+
+    def handle(self, *args, **options):
+        author = Author.objects.first()
+        if author is None:
+            raise CommandError('No authors, run seed_blog first')
+        category = Category.objects.first()
+
+        # Los posts de prueba se crean en una transacción que se descarta al final
+        with transaction.atomic():
+            self.create_posts(author, category, options)
+            self.run_scenarios(options)
+            transaction.set_rollback(True)
+
+    def create_posts(self, author, category, options):
+        gen = TextGenerator(seed=1)
+        paragraph = gen.text(200)
+        body = (paragraph * (options['body_kb'] * 1024 // len(paragraph) + 1))[:options['body_kb'] * 1024]
+        now = timezone.now()
+        # published_at en el futuro cercano: son la primera página del listado
+        Post.objects.bulk_create([
+            Post(
+                title=f'Bench post {i}', slug=f'bench-post-list-{i}', body=body, excerpt=make_excerpt(body),
+                author=author, category=category, status='published', published_at=now + timedelta(seconds=i),
+            )
+            for i in range(options['posts'])
+        ])
+        self.stdout.write(f"{options['posts']} posts with {options['body_kb']} KB bodies, {options['rows']} rows per list")
+
+    def run_scenarios(self, options):
+        rows = options['rows']
+        base = PostViewSet.queryset.order_by(*PostViewSet.keyset_ordering)
+        scenarios = [
+            ('full rows + ModelSerializer', base, ModelPostListSerializer),
+            ('only() + ModelSerializer', base.only(*LIST_FIELDS), ModelPostListSerializer),
+            ('only() + fast serializer', base.only(*LIST_FIELDS), PostListSerializer),
+        ]
+
+        header = f"{'scenario':<30}{'avg ms':>10}{'p95 ms':>10}{'peak KB':>10}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        for name, queryset, serializer_class in scenarios:
+            def page():
+                return serializer_class(list(queryset[:rows]), many=True).data
+
+            page()
+            durations = []
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                page()
+                durations.append((time.perf_counter() - start) * 1000)
+
+            # Memoria medida aparte: tracemalloc hace más lentas las asignaciones
+            tracemalloc.start()
+            page()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            p95 = sorted(durations)[max(0, int(len(durations) * 0.95) - 1)]
+            self.stdout.write(f'{name:<30}{statistics.mean(durations):>10.2f}{p95:>10.2f}{peak / 1024:>10.0f}')
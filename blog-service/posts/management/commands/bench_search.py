@@ -0,0 +1,59 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.filters import SearchFilter
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from posts.models import Post
+from posts.search import FullTextSearchFilter
+from posts.views import PostViewSet
+
+DEFAULT_TERMS = ['microservices', 'docker', 'kubernetes security', 'database performance', 'zzzunmatched']
+
+
+class Command(BaseCommand):
+    help = 'Benchmark full-text search (?q=) against the SearchFilter icontains scan (?search=)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--terms', nargs='+', default=DEFAULT_TERMS, help='Search terms to benchmark')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per term and backend')
+        parser.add_argument('--page-size', type=int, default=10, help='Rows fetched per query')
+
+    def handle(self, *args, **options):
+        corpus = Post.objects.filter(status='published').count()
+        self.stdout.write(f'Corpus: {corpus} published posts')
+        if corpus < 1_000_000:
+            self.stdout.write(self.style.WARNING(
+                'For representative numbers run this against a corpus of ~1M published posts'
+            ))
+
+        factory = APIRequestFactory()
+        view = PostViewSet()
+        backends = [
+            ('search', SearchFilter()),
+            ('q', FullTextSearchFilter()),
+        ]
+
+        header = f"{'term':<24}{'mode':<8}{'rows':>10}{'avg ms':>12}{'p95 ms':>12}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        for term in options['terms']:
+            for param, backend in backends:
+                request = Request(factory.get('/api/posts/', {param: term}))
+                view.request = request
+                durations = []
+                total = 0
+                for _ in range(options['repeat']):
+                    start = time.perf_counter()
+                    queryset = backend.filter_queryset(request, view.get_queryset(), view)
+                    total = queryset.count()
+                    list(queryset[:options['page_size']])
+                    durations.append((time.perf_counter() - start) * 1000)
+
+                p95 = sorted(durations)[max(0, int(len(durations) * 0.95) - 1)]
+                self.stdout.write(
+                    f'{term:<24}{param:<8}{total:>10}{statistics.mean(durations):>12.2f}{p95:>12.2f}'
+                )
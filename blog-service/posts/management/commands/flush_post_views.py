@@ -0,0 +1,36 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from redis.exceptions import LockError
+
+from posts.counters import flush_views
+
+
+class Command(BaseCommand):
+    help = 'Flush buffered post views from Redis to PostgreSQL'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run a single flush and exit',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.POST_VIEWS_FLUSH_INTERVAL,
+            help='Seconds between flushes (default: POST_VIEWS_FLUSH_INTERVAL)',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                flushed = flush_views()
+                self.stdout.write(f'Flushed {flushed} views')
+            except LockError:
+                self.stdout.write(self.style.WARNING('Another flush is in progress, skipping'))
+
+            if options['once']:
+                break
+            time.sleep(options['interval'])
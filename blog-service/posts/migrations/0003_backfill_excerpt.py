@@ -0,0 +1,31 @@
+from django.db import migrations
+from django.db.models import Case, TextField, Value, When
+from django.db.models.functions import Concat, Left, Length
+from django.db.models.lookups import GreaterThan
+
+EXCERPT_LENGTH = 200
+
+
+def backfill_excerpt(apps, schema_editor):
+    # Posts cargados sin pasar por save(): el listado ya no lee el body
+    Post = apps.get_model('posts', 'Post')
+    Post.objects.filter(excerpt='').exclude(body='').update(
+        excerpt=Case(
+            When(
+                GreaterThan(Length('body'), EXCERPT_LENGTH),
+                then=Concat(Left('body', EXCERPT_LENGTH), Value('...'), output_field=TextField()),
+            ),
+            default='body',
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0002_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_excerpt, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,18 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import F
 from slugify import slugify
 from categories.models import Category
 from authors.models import Author
 
+EXCERPT_LENGTH = 200
+
+
+def make_excerpt(body):
+    """Excerpt guardado con el post: el listado lo lee en lugar del body."""
+    return body[:EXCERPT_LENGTH] + ('...' if len(body) > EXCERPT_LENGTH else '')
+
 
 class Post(models.Model):
     """Modelo de Post para el blog."""
@@ -24,11 +34,18 @@ class Post(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # Mantenido por el trigger posts_post_search_vector_trigger (migración 0002)
+    search_vector = SearchVectorField(null=True, editable=False)
+    
+    # Configuración de text search usada por el trigger y por las consultas
+    SEARCH_CONFIG = 'english'
+    
     class Meta:
         ordering = ['-published_at', '-created_at']
         indexes = [
             models.Index(fields=['status', '-published_at']),
             models.Index(fields=['slug']),
+            GinIndex(fields=['search_vector'], name='posts_post_search_gin'),
         ]
     
     def __str__(self):
@@ -40,11 +57,11 @@ class Post(models.Model):
         
         # Generar excerpt si no existe
         if not self.excerpt and self.body:
-            self.excerpt = self.body[:200] + ('...' if len(self.body) > 200 else '')
+            self.excerpt = make_excerpt(self.body)
         
         super().save(*args, **kwargs)
     
-    def increment_views(self):
-        """Incrementa el contador de vistas."""
-        self.views += 1
-        self.save(update_fields=['views'])
+    def increment_views(self, amount=1):
+        """Incrementa el contador de vistas con un UPDATE atómico."""
+        Post.objects.filter(pk=self.pk).update(views=F('views') + amount)
+        self.views += amount
@@ -0,0 +1,49 @@
+"""
+Búsqueda full-text de posts sobre PostgreSQL.
+
+``?q=`` filtra por ``search_vector`` (índice GIN), ordena por relevancia y
+anota un fragmento resaltado del body. ``?search=`` (SearchFilter) se
+mantiene por compatibilidad.
+"""
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db.models import F
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Post
+
+SEARCH_PARAM = 'q'
+
+
+def search_posts(queryset, terms):
+    """Filtra ``queryset`` por ``terms`` ordenando por relevancia."""
+    query = SearchQuery(terms, config=Post.SEARCH_CONFIG, search_type='websearch')
+    return (
+        queryset
+        .filter(search_vector=query)
+        .annotate(
+            rank=SearchRank(F('search_vector'), query),
+            headline=SearchHeadline(
+                'body',
+                query,
+                config=Post.SEARCH_CONFIG,
+                start_sel='<mark>',
+                stop_sel='</mark>',
+                max_fragments=2,
+            ),
+        )
+        .order_by('-rank', '-published_at', '-id')
+    )
+
+
+def get_search_terms(request):
+    return request.query_params.get(SEARCH_PARAM, '').strip()
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """Filter backend para ``?q=``."""
+
+    def filter_queryset(self, request, queryset, view):
+        terms = get_search_terms(request)
+        if not terms:
+            return queryset
+        return search_posts(queryset, terms)
@@ -4,24 +4,52 @@ from categories.serializers import CategorySerializer
 from authors.serializers import AuthorSerializer
 
 
-class PostListSerializer(serializers.ModelSerializer):
-    """Serializer para lista de posts."""
-    
-    author = AuthorSerializer(read_only=True)
-    category = CategorySerializer(read_only=True)
-    
-    class Meta:
-        model = Post
-        fields = [
-            'id',
-            'title',
-            'slug',
-            'excerpt',
-            'author',
-            'category',
-            'published_at',
-            'views'
-        ]
+# Columnas que lee PostListSerializer: el listado nunca trae el body
+LIST_FIELDS = (
+    'id', 'title', 'slug', 'excerpt', 'published_at', 'views',
+    'author__id', 'author__display_name', 'author__email',
+    'category__id', 'category__name', 'category__slug',
+)
+
+_datetime = serializers.DateTimeField()
+
+
+class PostListSerializer(serializers.BaseSerializer):
+    """
+    Serializer de solo lectura para lista de posts.
+
+    Arma el dict directamente en lugar de recorrer un campo de
+    ModelSerializer por atributo y post; la salida es la misma que la de
+    ``AuthorSerializer``/``CategorySerializer`` anidados. El queryset debe
+    traer ``LIST_FIELDS`` con ``select_related('author', 'category')``.
+    """
+
+    def to_representation(self, post):
+        author = post.author
+        category = post.category
+        return {
+            'id': post.id,
+            'title': post.title,
+            'slug': post.slug,
+            'excerpt': post.excerpt,
+            'author': {'id': author.id, 'display_name': author.display_name, 'email': author.email},
+            'category': (
+                {'id': category.id, 'name': category.name, 'slug': category.slug}
+                if category is not None else None
+            ),
+            'published_at': _datetime.to_representation(post.published_at) if post.published_at else None,
+            'views': post.views,
+        }
+
+
+class PostSearchSerializer(PostListSerializer):
+    """Serializer para resultados de búsqueda full-text (?q=)."""
+
+    def to_representation(self, post):
+        data = super().to_representation(post)
+        data['rank'] = post.rank
+        data['headline'] = post.headline
+        return data
 
 
 class PostDetailSerializer(serializers.ModelSerializer):
@@ -0,0 +1,25 @@
+"""
+Invalidación de la caché de detalle y de los validadores del listado al
+modificar o borrar posts.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core import versioned_cache
+from .cache import LIST_NAMESPACE, invalidate_detail
+from .models import Post
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_detail(sender, instance, **kwargs):
+    # Después del commit: antes, un fallo de caché concurrente todavía lee
+    # la fila vieja y la vuelve a cachear con la versión nueva
+    slug = instance.slug
+
+    def invalidate():
+        invalidate_detail(slug)
+        versioned_cache.bump(LIST_NAMESPACE)
+
+    transaction.on_commit(invalidate)
@@ -0,0 +1,174 @@
+from datetime import timedelta
+
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, TestCase
+from django.utils import timezone
+
+from authors.models import Author
+from categories.models import Category
+from core import versioned_cache
+from core.conditional import LAST_MODIFIED_KEY
+from core.pagination import HybridPagination
+from . import async_views, counters
+from .cache import CACHE_NAMESPACE, LIST_NAMESPACE
+from .models import Post
+
+
+def create_post(title, **fields):
+    author, _ = Author.objects.get_or_create(email='ada@example.com', defaults={'display_name': 'Ada'})
+    category, _ = Category.objects.get_or_create(name='Performance', slug='performance')
+    fields.setdefault('body', f'{title} body')
+    return Post.objects.create(
+        title=title, author=author, category=category, status='published',
+        published_at=fields.pop('published_at', timezone.now()), **fields,
+    )
+
+
+class PostConditionalTests(TestCase):
+    """ETag y Last-Modified: las vistas async (modo ASGI) y el ViewSet sync coinciden."""
+
+    def setUp(self):
+        self.post = create_post('Connection pooling')
+        # Versión nueva: nada cacheado de otra corrida (Redis es compartido)
+        versioned_cache.bump(CACHE_NAMESPACE, LIST_NAMESPACE)
+
+    def async_get(self, view, path, *args, **headers):
+        return async_to_sync(view)(AsyncRequestFactory().get(path, headers=headers), *args)
+
+    def assert_parity(self, path, view, *args):
+        sync = self.client.get(path)
+        response = self.async_get(view, path, *args)
+        self.assertEqual(sync.status_code, 200)
+        self.assertEqual(response['ETag'], sync['ETag'])
+        self.assertEqual(response['Last-Modified'], sync['Last-Modified'])
+
+        # El ETag de una vista revalida en la otra
+        self.assertEqual(self.async_get(view, path, *args, **{'If-None-Match': sync['ETag']}).status_code, 304)
+        self.assertEqual(self.client.get(path, headers={'If-None-Match': response['ETag']}).status_code, 304)
+
+    def test_list_parity(self):
+        self.assert_parity('/api/posts/', async_views.post_list)
+
+    def test_detail_parity(self):
+        self.assert_parity(f'/api/posts/{self.post.slug}/', async_views.post_detail, self.post.slug)
+
+    def test_etag_changes_with_last_modified(self):
+        # Una escritura sin señales (update()) cambia el ETag cuando se
+        # recalcula el Last-Modified, aunque la versión del namespace sea la misma
+        etag = self.client.get('/api/posts/')['ETag']
+        Post.objects.filter(pk=self.post.pk).update(updated_at=timezone.now() + timedelta(minutes=1))
+        # Simula el vencimiento de LAST_MODIFIED_CACHE_TTL
+        cache.delete(versioned_cache.make_key(LIST_NAMESPACE, LAST_MODIFIED_KEY, versioned_cache.version(LIST_NAMESPACE)))
+        response = self.client.get('/api/posts/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class PostCursorPaginationTests(TestCase):
+    """Modo cursor (keyset) del listado y su convivencia con la búsqueda ``?q=``."""
+
+    def setUp(self):
+        base = timezone.now()
+        # Grupos con el mismo published_at: el id tiene que desempatar
+        for i in range(25):
+            create_post(f'Post {i}', slug=f'post-{i}', published_at=base - timedelta(hours=i // 3))
+        versioned_cache.bump(LIST_NAMESPACE)
+
+    def walk(self, url, link):
+        slugs, pages = [], 0
+        while url:
+            data = self.client.get(url).json()
+            self.assertNotIn('count', data)
+            slugs.extend(post['slug'] for post in data['results'])
+            url = data[link]
+            pages += 1
+        return slugs, pages
+
+    def test_next_links_cover_every_post_once(self):
+        expected = list(
+            Post.objects.filter(status='published').order_by('-published_at', '-id').values_list('slug', flat=True)
+        )
+        slugs, pages = self.walk('/api/posts/?pagination=cursor', 'next')
+        self.assertEqual(slugs, expected)
+        self.assertEqual(pages, 3)
+
+    def test_previous_links_walk_back(self):
+        data = self.client.get('/api/posts/?pagination=cursor').json()
+        self.assertIsNone(data['previous'])
+        first_page = [post['slug'] for post in data['results']]
+        second = self.client.get(data['next']).json()
+        back = self.client.get(second['previous']).json()
+        self.assertEqual([post['slug'] for post in back['results']], first_page)
+
+    def test_cursor_round_trip(self):
+        post = Post.objects.get(slug='post-4')
+        paginator = HybridPagination()
+        paginator.ordering, paginator.model = ('-published_at', '-id'), Post
+        cursor = paginator.encode_cursor(post, reverse=True)
+        request = type('Request', (), {'query_params': {'cursor': cursor}})
+        self.assertEqual(paginator.decode_cursor(request), ([post.published_at, post.id], True))
+
+    def test_invalid_cursor_is_404(self):
+        for cursor in ('not-base64!', 'eyJ2IjpbXX0', 'eyJ2IjpbIngiLCIxIl19'):
+            self.assertEqual(self.client.get(f'/api/posts/?cursor={cursor}').status_code, 404, cursor)
+
+    def test_search_keeps_relevance_order_in_cursor_mode(self):
+        create_post('Redis caching', body='redis redis redis cache', published_at=timezone.now() - timedelta(days=30))
+        create_post('Queues', body='a queue backed by redis', published_at=timezone.now())
+
+        ranked = self.client.get('/api/posts/?q=redis').json()
+        cursor = self.client.get('/api/posts/?q=redis&pagination=cursor').json()
+        self.assertEqual(cursor, ranked)
+        self.assertIn('count', cursor)
+        self.assertEqual([post['slug'] for post in cursor['results']], ['redis-caching', 'queues'])
+
+
+class PostViewCounterTests(TestCase):
+    """Contador write-behind: las vistas se acumulan en Redis y se vuelcan en bloque."""
+
+    def setUp(self):
+        # Claves propias: no tocar las vistas pendientes de la base de desarrollo
+        for name in ('PENDING_KEY', 'FLUSHING_KEY', 'FLUSH_LOCK_KEY'):
+            patcher = mock.patch.object(counters, name, f'test:{getattr(counters, name)}')
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(counters._redis().delete, counters.PENDING_KEY, counters.FLUSHING_KEY)
+        self.first = create_post('First')
+        self.second = create_post('Second')
+        versioned_cache.bump(CACHE_NAMESPACE)
+
+    def test_flush_applies_pending_views(self):
+        for _ in range(3):
+            counters.record_view(self.first.pk)
+        counters.record_view(self.second.pk)
+        self.assertEqual(counters.pending_views(self.first.pk), 3)
+        self.assertEqual(counters.pending_views(), 4)
+
+        self.assertEqual(counters.flush_views(), 4)
+        self.assertEqual(Post.objects.get(pk=self.first.pk).views, 3)
+        self.assertEqual(Post.objects.get(pk=self.second.pk).views, 1)
+        self.assertEqual(counters.pending_views(), 0)
+        self.assertEqual(counters.flush_views(), 0)
+
+    def test_interrupted_flush_is_resumed_first(self):
+        # Un volcado anterior renombró el hash y no llegó a borrarlo
+        r = counters._redis()
+        r.hset(counters.FLUSHING_KEY, self.first.pk, 2)
+        counters.record_view(self.first.pk)
+        self.assertEqual(counters.pending_views(self.first.pk), 3)
+
+        self.assertEqual(counters.flush_views(), 2)
+        self.assertEqual(counters.pending_views(self.first.pk), 1)
+        self.assertEqual(counters.flush_views(), 1)
+        self.assertEqual(Post.objects.get(pk=self.first.pk).views, 3)
+
+    def test_detail_includes_pending_views(self):
+        path = f'/api/posts/{self.first.slug}/'
+        self.assertEqual(self.client.get(path).json()['views'], 1)
+        self.assertEqual(self.client.get(path).json()['views'], 2)
+        counters.flush_views()
+        # El volcado invalida el payload cacheado: 2 persistidas + esta
+        self.assertEqual(self.client.get(path).json()['views'], 3)
@@ -1,10 +1,21 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from . import async_views
 from .views import PostViewSet
 
 router = DefaultRouter()
 router.register(r'posts', PostViewSet, basename='post')
 
 urlpatterns = [
+    # Fuera de posts/: ahí taparía al post con slug "stats"
+    path('posts-stats/', PostViewSet.as_view({'get': 'stats'}), name='post-stats'),
     path('', include(router.urls)),
 ]
+
+if settings.BLOG_SERVER_MODE == 'asgi':
+    # Lecturas async por delante del router
+    urlpatterns = [
+        path('posts/', async_views.post_list, name='post-list-async'),
+        path('posts/<slug:slug>/', async_views.post_detail, name='post-detail-async'),
+    ] + urlpatterns
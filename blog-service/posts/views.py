@@ -1,36 +1,96 @@
-from django.views.decorators.cache import cache_page
-from django.utils.decorators import method_decorator
+from django.db.models import Max
 from rest_framework import viewsets, mixins
 from rest_framework.filters import SearchFilter
+from rest_framework.response import Response
+
+from core.conditional import conditional_view, make_etag, namespace_validators, not_modified, set_validators
+from .cache import LIST_NAMESPACE, detail_validators, get_detail, detail_cache_stats
+from .counters import record_view, pending_views
 from .models import Post
-from .serializers import PostListSerializer, PostDetailSerializer
+from .search import SEARCH_PARAM, FullTextSearchFilter, get_search_terms
+from .serializers import LIST_FIELDS, PostListSerializer, PostSearchSerializer, PostDetailSerializer
+
+
+def list_last_modified():
+    # Los cambios de autores y categorías entran por la hora del bump del namespace
+    return Post.objects.filter(status='published').aggregate(latest=Max('updated_at'))['latest']
+
+
+def list_validators(request, *args, **kwargs):
+    return namespace_validators(LIST_NAMESPACE, list_last_modified)
 
 
 class PostViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
     """
     ViewSet para posts del blog.
-    
-    - List: búsqueda por título/body, paginación
-    - Retrieve: detalle cacheado por 120 segundos, incrementa views
+
+    - List: búsqueda full-text (?q=) o por título/body (?search=), paginación
+      por página o por cursor (?pagination=cursor); solo lee las columnas del
+      listado (``LIST_FIELDS``), nunca el body
+    - Retrieve: payload cacheado por slug, cuenta vistas en cada request
+    - Stats: vistas pendientes de volcar y aciertos de la caché de detalle
+
+    List y retrieve responden 304 a ``If-None-Match``/``If-Modified-Since``
+    sin serializar (ver ``core/conditional.py``).
     """
-    
-    queryset = Post.objects.filter(status='published').select_related('author', 'category')
-    filter_backends = [SearchFilter]
+
+    queryset = (
+        Post.objects.filter(status='published')
+        .select_related('author', 'category')
+        .defer('search_vector')
+    )
+    filter_backends = [FullTextSearchFilter, SearchFilter]
     search_fields = ['title', 'body']
     lookup_field = 'slug'
-    
+    # Modo cursor (?pagination=cursor) sobre el índice (status, -published_at);
+    # ?q= ordena por relevancia, así que pagina siempre por número de página
+    keyset_ordering = ('-published_at', '-id')
+    keyset_excluded_params = (SEARCH_PARAM,)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            return queryset.only(*LIST_FIELDS)
+        return queryset
+
     def get_serializer_class(self):
         if self.action == 'retrieve':
             return PostDetailSerializer
+        if get_search_terms(self.request):
+            return PostSearchSerializer
         return PostListSerializer
-    
-    @method_decorator(cache_page(120))
+
+    @conditional_view(list_validators)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def retrieve(self, request, *args, **kwargs):
-        """Detalle de post con cache de 120 segundos."""
-        response = super().retrieve(request, *args, **kwargs)
-        
-        # Incrementar views (fuera del cache)
-        instance = self.get_object()
-        instance.increment_views()
-        
-        return response
+        """
+        Detalle de post con caché del payload por slug (ver ``posts/cache.py``).
+
+        La vista se cuenta en cada request (también con acierto de caché) y
+        el valor de ``views`` se completa con las vistas pendientes de volcar.
+        Una revalidación que termina en 304 también cuenta como vista.
+        """
+        slug = kwargs[self.lookup_field]
+        payload = get_detail(slug, lambda: dict(self.get_serializer(self.get_object()).data))
+
+        # La vista se acumula en Redis y se vuelca con flush_post_views
+        pending = record_view(payload['id'])
+
+        current, last_modified = detail_validators(payload)
+        etag = make_etag(current, last_modified, request.get_full_path(), request.accepted_renderer.format)
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+        return set_validators(Response({**payload, 'views': payload['views'] + pending}), etag, last_modified)
+
+    def stats(self, request):
+        """
+        Métricas del contador de vistas y de la caché de detalle.
+        GET /api/posts-stats/ (fuera de /api/posts/ para no tapar un post con slug "stats")
+        """
+        return Response({
+            'pending_views': pending_views(),
+            'detail_cache': detail_cache_stats(),
+        })
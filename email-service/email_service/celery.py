@@ -3,6 +3,9 @@ Celery configuration for email_service.
 """
 import os
 from celery import Celery
+from celery.signals import after_task_publish, before_task_publish, task_failure, task_postrun, task_prerun
+
+from utils import tracing
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'email_service.settings')
@@ -20,12 +23,57 @@ app.autodiscover_tasks()
 app.conf.task_routes = {
     'notifications.tasks.send_email_task': {'queue': 'emails'},
     'notifications.tasks.send_notification_task': {'queue': 'notifications'},
+    'notifications.tasks.send_queued_notifications_task': {'queue': 'notifications'},
 }
 
 # Configure task retry settings
 app.conf.task_default_retry_delay = 5  # 5 seconds
 app.conf.task_max_retries = 3
 
+# Trazas: el span de publicación viaja como ``traceparent`` en los headers
+# del mensaje y el worker abre el span de la tarea como hijo suyo. En modo
+# eager no hay mensaje y la tarea hereda el span en curso.
+_spans = {}
+
+
+@before_task_publish.connect
+def _start_publish_span(sender=None, headers=None, **kwargs):
+    if headers is None or tracing.current_span() is None:
+        return
+    context = tracing.span(f'celery.publish {sender}', 'producer', {'celery.task_id': headers.get('id')})
+    headers['traceparent'] = context.__enter__().traceparent()
+    _spans[('publish', headers.get('id'))] = context
+
+
+@after_task_publish.connect
+def _end_publish_span(sender=None, headers=None, **kwargs):
+    context = _spans.pop(('publish', (headers or {}).get('id')), None)
+    if context is not None:
+        context.__exit__(None, None, None)
+
+
+@task_prerun.connect
+def _start_task_span(task_id=None, task=None, **kwargs):
+    parent = tracing.parse_traceparent(getattr(task.request, 'traceparent', None))
+    context = tracing.span(f'celery.task {task.name}', 'consumer', {'celery.task_id': task_id}, parent=parent)
+    context.__enter__()
+    _spans[('task', task_id)] = context
+
+
+@task_failure.connect
+def _mark_task_span(exception=None, **kwargs):
+    current = tracing.current_span()
+    if current is not None:
+        current.error = f'{type(exception).__name__}: {exception}'
+
+
+@task_postrun.connect
+def _end_task_span(task_id=None, **kwargs):
+    context = _spans.pop(('task', task_id), None)
+    if context is not None:
+        context.__exit__(None, None, None)
+
+
 @app.task(bind=True, ignore_result=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
@@ -37,6 +37,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'utils.instrumentation.PrometheusMiddleware',
+    'utils.tracing.TracingMiddleware',
+    'utils.profiling.QueryProfilerMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -46,6 +49,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'utils.middleware.RequestLoggingMiddleware',
+    'utils.middleware.JWTAuthMiddleware',
 ]
 
 ROOT_URLCONF = 'email_service.urls'
@@ -69,14 +73,29 @@ TEMPLATES = [
 WSGI_APPLICATION = 'email_service.wsgi.application'
 
 # Database
+# Pool de conexiones por proceso (utils.db): cada request o tarea de Celery
+# toma una conexión ya abierta y la devuelve al terminar. Con DB_POOL_ENABLED=0
+# se usa el backend estándar con conexiones persistentes (DB_CONN_MAX_AGE)
+DB_POOL_ENABLED = os.getenv('DB_POOL_ENABLED', '1') == '1'
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'utils.db' if DB_POOL_ENABLED else 'django.db.backends.postgresql',
         'NAME': os.getenv('DB_NAME', 'email_db'),
         'USER': os.getenv('DB_USER', 'devuser'),
         'PASSWORD': os.getenv('DB_PASS', 'devpass'),
         'HOST': os.getenv('DB_HOST', 'postgres'),
         'PORT': os.getenv('DB_PORT', '5432'),
+        'CONN_MAX_AGE': 0 if DB_POOL_ENABLED else int(os.getenv('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'pool': {
+                'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '5')),
+                'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+                'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', '300')),
+                'check_delay': float(os.getenv('DB_POOL_CHECK_DELAY', '30')),
+            },
+        } if DB_POOL_ENABLED else {},
     }
 }
 
@@ -120,20 +139,74 @@ REST_FRAMEWORK = {
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'utils.pagination.HybridPagination',
     'PAGE_SIZE': 20,
 }
 
+# Verificación local de los JWT de auth-service (ver utils/tokens.py)
+# AUTH_JWT_KEYS: claves HS256 separadas por coma, la actual primero; durante
+# una rotación se deja también la anterior
+AUTH_JWT_KEYS = [key for key in os.getenv('AUTH_JWT_KEYS', 'django-insecure-dev-key-change-in-production').split(',') if key]
+AUTH_JWT_LEEWAY = int(os.getenv('AUTH_JWT_LEEWAY', '0'))
+AUTH_JWT_CACHE_SIZE = int(os.getenv('AUTH_JWT_CACHE_SIZE', '4096'))
+
+# Ingesta masiva de notificaciones (POST /api/notify/bulk/)
+NOTIFY_BULK_MAX_ITEMS = int(os.getenv('NOTIFY_BULK_MAX_ITEMS', '5000'))
+NOTIFY_BULK_BATCH_SIZE = int(os.getenv('NOTIFY_BULK_BATCH_SIZE', '500'))
+
+# Health checks (/readyz): timeout por dependencia y segundos que se
+# reutiliza el último resultado
+HEALTH_CHECK_TIMEOUT = float(os.getenv('HEALTH_CHECK_TIMEOUT', '2'))
+HEALTH_CHECK_CACHE_TTL = float(os.getenv('HEALTH_CHECK_CACHE_TTL', '5'))
+
+# Segundos que se cachean /api/contact/stats/ y /api/notify/stats/
+STATS_CACHE_TTL = int(os.getenv('STATS_CACHE_TTL', '5'))
+
+# Entrega de notificaciones:
+# - immediate: una tarea send_notification_task por notificación
+# - batch: las notificaciones quedan en 'queued' y send_queued_notifications_task
+#   las envía en lotes con una sola conexión SMTP (programada con Celery beat)
+NOTIFICATIONS_DELIVERY_MODE = os.getenv('NOTIFICATIONS_DELIVERY_MODE', 'immediate')
+NOTIFICATIONS_BATCH_SIZE = int(os.getenv('NOTIFICATIONS_BATCH_SIZE', '100'))
+NOTIFICATIONS_BATCH_INTERVAL = float(os.getenv('NOTIFICATIONS_BATCH_INTERVAL', '5'))
+NOTIFICATIONS_BATCH_MAX_ATTEMPTS = int(os.getenv('NOTIFICATIONS_BATCH_MAX_ATTEMPTS', '3'))
+# Segundos tras los que un mensaje en 'sending' (worker caído) se puede volver a tomar
+NOTIFICATIONS_CLAIM_TIMEOUT = int(os.getenv('NOTIFICATIONS_CLAIM_TIMEOUT', '300'))
+
 # Redis Configuration
 REDIS_HOST = os.getenv('REDIS_HOST', 'redis')
 REDIS_PORT = os.getenv('REDIS_PORT', '6379')
 
+# CACHE_L1_ENABLED=1 agrega un nivel L1 en memoria de cada proceso delante de
+# Redis, invalidado entre procesos por pub/sub (utils.cache.TieredRedisCache)
+CACHE_L1_ENABLED = os.getenv('CACHE_L1_ENABLED', '0') == '1'
+
+# Formato de los valores en Redis (utils/cache_codecs.py): serializador msgpack,
+# orjson o pickle, y compresión lz4, zstd, zlib o none de los valores de más de
+# CACHE_COMPRESS_MIN_BYTES bytes
+CACHE_SERIALIZER = os.getenv('CACHE_SERIALIZER', 'msgpack')
+CACHE_COMPRESSOR = os.getenv('CACHE_COMPRESSOR', 'lz4')
+CACHE_COMPRESS_MIN_BYTES = int(os.getenv('CACHE_COMPRESS_MIN_BYTES', '1024'))
+CACHE_SERIALIZERS = {
+    'msgpack': 'utils.cache_codecs.MSGPackSerializer',
+    'orjson': 'utils.cache_codecs.ORJSONSerializer',
+    'pickle': 'django_redis.serializers.pickle.PickleSerializer',
+}
+
 CACHES = {
     'default': {
-        'BACKEND': 'django_redis.cache.RedisCache',
+        'BACKEND': 'utils.cache.TieredRedisCache' if CACHE_L1_ENABLED else 'utils.cache.RedisCache',
         'LOCATION': f"redis://{REDIS_HOST}:{REDIS_PORT}/2",
+        # Cambiar de serializador cambia las claves: no se leen entradas de otro formato
+        'KEY_PREFIX': CACHE_SERIALIZER,
         'OPTIONS': {
             'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            'SERIALIZER': CACHE_SERIALIZERS[CACHE_SERIALIZER],
+            'COMPRESSOR': 'utils.cache_codecs.ThresholdCompressor',
+            'COMPRESSOR_ALGORITHM': CACHE_COMPRESSOR,
+            'COMPRESS_MIN_LENGTH': CACHE_COMPRESS_MIN_BYTES,
+            'L1_MAX_BYTES': int(os.getenv('CACHE_L1_MAX_BYTES', str(16 * 1024 * 1024))),
+            'L1_TIMEOUT': int(os.getenv('CACHE_L1_TIMEOUT', '60')),
         }
     }
 }
@@ -148,6 +221,12 @@ CELERY_TIMEZONE = TIME_ZONE
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutos
 CELERY_TASK_SOFT_TIME_LIMIT = 25 * 60  # 25 minutos
+CELERY_BEAT_SCHEDULE = {}
+if NOTIFICATIONS_DELIVERY_MODE == 'batch':
+    CELERY_BEAT_SCHEDULE['send-queued-notifications'] = {
+        'task': 'notifications.tasks.send_queued_notifications_task',
+        'schedule': NOTIFICATIONS_BATCH_INTERVAL,
+    }
 
 # Email Configuration
 EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
@@ -159,6 +238,23 @@ EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
 DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'noreply@microservices-lab.com')
 
+# Trazas distribuidas (ver utils/tracing.py). Los spans se exportan a
+# TRACING_FILE (JSON lines) o a TRACING_OTLP_ENDPOINT (OTLP/HTTP JSON, tiene
+# prioridad); sin ninguno solo se propaga el traceparent
+TRACING_SERVICE_NAME = os.getenv('TRACING_SERVICE_NAME', 'email-service')
+TRACING_SAMPLE_RATE = float(os.getenv('TRACING_SAMPLE_RATE', '1.0'))
+TRACING_FILE = os.getenv('TRACING_FILE', '')
+TRACING_OTLP_ENDPOINT = os.getenv('TRACING_OTLP_ENDPOINT', '')
+TRACING_QUEUE_SIZE = int(os.getenv('TRACING_QUEUE_SIZE', '10000'))
+TRACING_MAX_STATEMENT_LENGTH = 500
+
+# Perfilador de queries por request (ver utils/profiling.py): para todas las
+# requests con QUERY_PROFILER_ENABLED=1, o por request con el header
+# X-Profile-Queries: 1 si QUERY_PROFILER_ALLOW_HEADER (por defecto, con DEBUG)
+QUERY_PROFILER_ENABLED = os.getenv('QUERY_PROFILER_ENABLED', '0') == '1'
+QUERY_PROFILER_ALLOW_HEADER = os.getenv('QUERY_PROFILER_ALLOW_HEADER', '1' if DEBUG else '0') == '1'
+QUERY_PROFILER_N_PLUS_ONE_THRESHOLD = int(os.getenv('QUERY_PROFILER_N_PLUS_ONE_THRESHOLD', '3'))
+
 # Logging Configuration
 LOGGING = {
     'version': 1,
@@ -173,8 +269,10 @@ LOGGING = {
         },
     },
     'handlers': {
+        # Escritura en un hilo de fondo con cola acotada (ver utils.logger)
         'console': {
-            'class': 'logging.StreamHandler',
+            '()': 'utils.logger.QueueStreamHandler',
+            'queue_size': int(os.getenv('LOG_QUEUE_SIZE', '10000')),
             'formatter': 'json',
         },
     },
@@ -6,6 +6,6 @@ from django.urls import path, include
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('healthz', include('utils.urls')),
+    path('', include('utils.urls')),
     path('api/', include('notifications.urls')),
 ]
@@ -0,0 +1,27 @@
+"""
+Configuración de gunicorn.
+
+Las métricas Prometheus de todos los workers se escriben en
+PROMETHEUS_MULTIPROC_DIR y /metrics las agrega (ver utils/instrumentation.py).
+"""
+import os
+import shutil
+
+wsgi_app = 'email_service.wsgi:application'
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8002')
+workers = int(os.environ.get('GUNICORN_WORKERS', '3'))
+
+# Se hereda en los workers antes de que importen prometheus_client
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/prometheus')
+
+
+def on_starting(server):
+    # Los valores de una ejecución anterior no deben sumarse a los nuevos
+    metrics_dir = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,119 @@
+"""
+Ingesta masiva de notificaciones.
+
+Procesa miles de notificaciones con un número constante de consultas:
+una consulta IN para la idempotencia, ``bulk_create`` por lotes (ya en
+estado 'queued') y la publicación de todas las tareas con un solo
+productor de Celery.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+import logging
+
+from .models import NotificationLog
+from .serializers import NotificationBulkItemSerializer
+from .tasks import enqueue_notifications
+
+logger = logging.getLogger('notifications')
+
+
+def ingest_notifications(items):
+    """
+    Valida, deduplica, inserta y encola una lista de notificaciones.
+
+    Args:
+        items: lista de dicts con el mismo formato que POST /api/notify/
+
+    Returns:
+        list: un resultado por item, en el mismo orden que la entrada
+    """
+    results = [None] * len(items)
+
+    # 1. Validación por item (sin consultas a la base de datos)
+    valid = []
+    for index, item in enumerate(items):
+        serializer = NotificationBulkItemSerializer(data=item)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            results[index] = {'index': index, 'status': 'invalid', 'errors': serializer.errors}
+
+    # 2. Idempotencia: una sola consulta IN
+    # Las claves vacías ya llegan como None (ver NotificationSerializer)
+    keys = {data['idempotency_key'] for _, data in valid if data.get('idempotency_key') is not None}
+    existing = {}
+    if keys:
+        existing = {
+            row['idempotency_key']: row
+            for row in NotificationLog.objects.filter(idempotency_key__in=keys).values('id', 'idempotency_key', 'status')
+        }
+
+    # 3. Construir filas nuevas ya encoladas; las claves repetidas dentro
+    #    de la misma request apuntan a la primera aparición
+    new = []
+    by_key = {}
+    repeated = []
+    for index, data in valid:
+        key = data.get('idempotency_key')
+        if key in existing:
+            row = existing[key]
+            results[index] = {'index': index, 'id': row['id'], 'status': 'duplicate', 'current_status': row['status']}
+        elif key in by_key:
+            repeated.append((index, key))
+        else:
+            notification = NotificationLog(**data, status='queued')
+            new.append((index, notification))
+            if key is not None:
+                by_key[key] = notification
+
+    NotificationLog.objects.bulk_create(
+        [notification for _, notification in new],
+        batch_size=settings.NOTIFY_BULK_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+    # 4. Una request concurrente pudo insertar la misma clave entre la
+    #    consulta IN y el INSERT: la fila ganadora es la que quedó guardada
+    winners = {}
+    if by_key:
+        winners = {
+            row['idempotency_key']: row
+            for row in NotificationLog.objects.filter(idempotency_key__in=by_key).values('id', 'idempotency_key', 'status')
+        }
+
+    created = []
+    for index, notification in new:
+        key = notification.idempotency_key
+        row = winners.get(key)
+        if row and row['id'] != notification.id:
+            results[index] = {'index': index, 'id': row['id'], 'status': 'duplicate', 'current_status': row['status']}
+        else:
+            created.append(notification.id)
+            results[index] = {'index': index, 'id': notification.id, 'status': 'queued'}
+
+    for index, key in repeated:
+        row = winners[key]
+        results[index] = {'index': index, 'id': row['id'], 'status': 'duplicate', 'current_status': row['status']}
+
+    # 5. Publicar todas las tareas con una sola conexión al broker
+    if created:
+        try:
+            enqueue_notifications(created)
+            logger.info(f"Bulk ingestion queued {len(created)} notifications")
+        except Exception as e:
+            logger.error(f"Error queuing bulk notifications: {str(e)}")
+            # Solo las que siguen en 'queued': las tareas que sí se publicaron
+            # antes del error pueden haberlas tomado (o enviado) ya
+            with transaction.atomic():
+                reverted = set(
+                    NotificationLog.objects.select_for_update()
+                    .filter(id__in=created, status='queued')
+                    .values_list('id', flat=True)
+                )
+                NotificationLog.objects.filter(id__in=reverted).update(status='pending', updated_at=timezone.now())
+            for result in results:
+                if result['status'] == 'queued' and result['id'] in reverted:
+                    result['status'] = 'pending'
+
+    return results
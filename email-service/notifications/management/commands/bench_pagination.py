@@ -0,0 +1,60 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+from notifications.models import NotificationLog
+from utils.pagination import HybridPagination
+
+ENDPOINT = '/api/notify/'
+ORDERING = ('-created_at', '-id')
+
+
+class Command(BaseCommand):
+    help = 'Benchmark page-number vs cursor pagination on /api/notify/ (page 1 vs a deep page)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page', type=int, default=10_000, help='Deep page number to compare with page 1')
+        parser.add_argument('--repeat', type=int, default=5, help='Requests per scenario')
+
+    def handle(self, *args, **options):
+        page_size = HybridPagination.page_size
+        deep_page = options['page']
+        total = NotificationLog.objects.count()
+        self.stdout.write(f'Rows: {total} | page size: {page_size}')
+
+        if total < deep_page * page_size:
+            self.stderr.write(self.style.ERROR(
+                f'Page {deep_page} needs at least {deep_page * page_size} rows; use --page or seed more data'
+            ))
+            return
+
+        # Cursor que apunta al último elemento de la página anterior a la profunda
+        anchor = NotificationLog.objects.order_by(*ORDERING)[(deep_page - 1) * page_size - 1]
+        paginator = HybridPagination()
+        paginator.ordering = ORDERING
+        deep_cursor = paginator.encode_cursor(anchor)
+
+        scenarios = [
+            ('page 1', {'page': 1}),
+            (f'page {deep_page}', {'page': deep_page}),
+            ('cursor page 1', {'pagination': 'cursor'}),
+            (f'cursor page {deep_page}', {'cursor': deep_cursor}),
+        ]
+
+        client = Client()
+        header = f"{'scenario':<24}{'avg ms':>12}{'p95 ms':>12}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        for name, params in scenarios:
+            durations = []
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                response = client.get(ENDPOINT, params)
+                durations.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    raise RuntimeError(f'{name}: HTTP {response.status_code}')
+            p95 = sorted(durations)[max(0, int(len(durations) * 0.95) - 1)]
+            self.stdout.write(f'{name:<24}{statistics.mean(durations):>12.2f}{p95:>12.2f}')
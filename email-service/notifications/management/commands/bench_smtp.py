@@ -0,0 +1,65 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from utils.mailer import send_email, send_email_batch
+from utils.smtp_sink import SMTPSink
+
+
+class Command(BaseCommand):
+    help = 'Benchmark per-message SMTP connections vs batched delivery against a local SMTP sink'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=200, help='Messages per scenario')
+        parser.add_argument('--batch-size', type=int, default=100, help='Messages per connection in batch mode')
+        parser.add_argument(
+            '--connect-latency-ms',
+            type=float,
+            default=20,
+            help='Simulated session setup cost (TCP + TLS handshake) per connection',
+        )
+
+    def handle(self, *args, **options):
+        # Sin logs por mensaje durante la medición
+        logging.getLogger('notifications').setLevel(logging.WARNING)
+
+        count = options['messages']
+        batch_size = options['batch_size']
+        messages = [
+            {'to': [f'user{i}@example.com'], 'subject': f'Benchmark {i}', 'body': 'x' * 512}
+            for i in range(count)
+        ]
+
+        with SMTPSink(connect_delay=options['connect_latency_ms'] / 1000) as sink:
+            smtp_settings = {
+                'EMAIL_BACKEND': 'django.core.mail.backends.smtp.EmailBackend',
+                'EMAIL_HOST': '127.0.0.1',
+                'EMAIL_PORT': sink.port,
+                'EMAIL_USE_TLS': False,
+                'EMAIL_HOST_USER': '',
+                'EMAIL_HOST_PASSWORD': '',
+            }
+            with override_settings(**smtp_settings):
+                scenarios = [
+                    ('per-message', lambda: [
+                        send_email(to=m['to'], subject=m['subject'], body=m['body']) for m in messages
+                    ]),
+                    (f'batch ({batch_size}/conn)', lambda: [
+                        send_email_batch(messages[i:i + batch_size]) for i in range(0, count, batch_size)
+                    ]),
+                ]
+
+                header = f"{'mode':<22}{'seconds':>10}{'msg/s':>10}{'conns':>8}{'delivered':>11}"
+                self.stdout.write(header)
+                self.stdout.write('-' * len(header))
+
+                for name, run in scenarios:
+                    sink.connections = sink.messages = 0
+                    start = time.perf_counter()
+                    run()
+                    elapsed = time.perf_counter() - start
+                    self.stdout.write(
+                        f'{name:<22}{elapsed:>10.3f}{count / elapsed:>10.1f}{sink.connections:>8}{sink.messages:>11}'
+                    )
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from notifications.stats import invalidate_stats
+from utils.profiling import query_budget
+
+# Máximo de queries por endpoint con la caché fría
+BUDGETS = [
+    ('/api/contact/', 2),
+    ('/api/contact/?pagination=cursor', 1),
+    ('/api/contact/stats/', 1),
+    ('/api/notify/', 2),
+    ('/api/notify/?status=sent', 2),
+    ('/api/notify/?pagination=cursor', 1),
+    ('/api/notify/stats/', 1),
+]
+
+
+class Command(BaseCommand):
+    help = 'Check that each API endpoint stays within its SQL query budget and issues no N+1 queries'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cold-cache', action='store_true', help="Invalidate this service's cached stats before each request (worst case)")
+
+    def handle(self, *args, **options):
+        client = Client(HTTP_HOST='localhost')
+        failures = []
+        header = f"{'endpoint':<36}{'queries':>9}{'budget':>8}{'db ms':>9}  result"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        for path, budget in BUDGETS:
+            if options['cold_cache']:
+                # No cache.clear(): vaciaría toda la base de Redis
+                invalidate_stats()
+            try:
+                with query_budget(budget) as profile:
+                    response = client.get(path)
+                result = 'ok'
+                if response.status_code != 200:
+                    result = f'HTTP {response.status_code}'
+                    failures.append(f'{path}: HTTP {response.status_code}')
+            except AssertionError as e:
+                result = 'FAIL'
+                failures.append(str(e))
+            self.stdout.write(f'{path[:35]:<36}{profile.count:>9}{budget:>8}{profile.time_ms:>9.2f}  {result}')
+
+        for failure in failures:
+            self.stderr.write(failure)
+        if failures:
+            raise CommandError(f'{len(failures)} endpoint(s) failed or over their query budget')
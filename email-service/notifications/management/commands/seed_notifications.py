@@ -0,0 +1,96 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from notifications.models import ContactMessage, NotificationLog
+from utils.datagen import TextGenerator, bulk_load, truncate
+
+SOURCES = ('blog-service', 'auth-service', 'billing-service', '')
+
+
+class Command(BaseCommand):
+    help = 'Replace notifications and contact messages with a large deterministic dataset for benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--notifications', type=int, default=100_000, help='NotificationLog rows to generate')
+        parser.add_argument('--contacts', type=int, default=10_000, help='ContactMessage rows to generate')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed; the same seed gives the same rows')
+        parser.add_argument('--body-words', type=int, default=80, help='Approximate words per notification body')
+        parser.add_argument(
+            '--with-queued', action='store_true',
+            help="Also generate 'queued' and 'pending' notifications (batch delivery mode sends the queued ones)",
+        )
+        parser.add_argument('--batch-size', type=int, default=10_000, help='Rows per COPY / bulk_create batch')
+        parser.add_argument(
+            '--method', choices=['copy', 'bulk'],
+            help='copy (PostgreSQL COPY, default on PostgreSQL) or bulk (bulk_create)',
+        )
+
+    def handle(self, *args, **options):
+        method = options['method'] or ('copy' if connection.vendor == 'postgresql' else 'bulk')
+        if method == 'copy' and connection.vendor != 'postgresql':
+            raise CommandError('--method copy needs PostgreSQL')
+        gen = TextGenerator(options['seed'])
+
+        self.stdout.write('Clearing existing data...')
+        truncate(NotificationLog, ContactMessage)
+
+        def notifications():
+            for i in range(options['notifications']):
+                first, last = gen.name()
+                created = gen.past(90)
+                roll = gen.random.random()
+                # La mayoría ya se envió; una cola reciente sigue pendiente o en
+                # curso, solo con --with-queued (si no, se cuenta como enviada)
+                if roll >= 0.92 and not options['with_queued']:
+                    roll = 0
+                if roll < 0.85:
+                    status, sent_at, retries, error = 'sent', created + timedelta(seconds=gen.random.randint(1, 120)), 0, None
+                elif roll < 0.92:
+                    status, sent_at, retries, error = 'failed', None, gen.random.randint(1, 3), 'SMTPServerDisconnected: Connection unexpectedly closed'
+                elif roll < 0.97:
+                    status, sent_at, retries, error = 'queued', None, 0, None
+                else:
+                    status, sent_at, retries, error = 'pending', None, 0, None
+                key = f'seed-{options["seed"]}-{i}' if gen.chance(0.3) else None
+                yield (
+                    gen.uuid(), 'email', gen.email(first, last, i), gen.title(), gen.text(options['body_words']),
+                    status, gen.random.choice(SOURCES), key, created, sent_at or created, sent_at, retries, error,
+                )
+
+        def contacts():
+            for i in range(options['contacts']):
+                first, last = gen.name()
+                created = gen.past(180)
+                processed = created + timedelta(seconds=gen.random.randint(1, 300))
+                status = 'sent' if gen.chance(0.9) else gen.random.choice(['pending', 'failed'])
+                yield (
+                    gen.uuid(), f'{first} {last}', gen.email(first, last, i), gen.paragraph(), status,
+                    created, processed if status != 'pending' else created,
+                    processed if status != 'pending' else None, 0,
+                )
+
+        self.load('notifications', NotificationLog, [
+            'id', 'notification_type', 'to', 'subject', 'body', 'status', 'source_service',
+            'idempotency_key', 'created_at', 'updated_at', 'sent_at', 'retry_count', 'last_error',
+        ], notifications(), options, method)
+        self.load('contacts', ContactMessage, [
+            'id', 'name', 'email', 'message', 'status', 'created_at', 'updated_at', 'processed_at', 'retry_count',
+        ], contacts(), options, method)
+
+        with connection.cursor() as cursor:
+            for model in (NotificationLog, ContactMessage):
+                cursor.execute(f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
+        self.stdout.write(self.style.SUCCESS('Seed completed successfully!'))
+
+    def load(self, label, model, fields, rows, options, method):
+        batch_size = options['batch_size']
+
+        def progress(count, seconds):
+            if count % (batch_size * 10) == 0:
+                self.stdout.write(f'  {label}: {count:,} rows ({count / seconds:,.0f} rows/s)')
+
+        count, seconds = bulk_load(model, fields, rows, batch_size, method, progress=progress)
+        rate = count / seconds if seconds else 0
+        self.stdout.write(f'{label}: {count:,} rows in {seconds:.1f}s ({rate:,.0f} rows/s, {method})')
@@ -0,0 +1,36 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from notifications.tasks import send_queued_notifications_task
+
+
+class Command(BaseCommand):
+    help = "Send 'queued' notifications in batches over a single SMTP connection per batch"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.NOTIFICATIONS_BATCH_SIZE,
+            help='Notifications per batch (default: NOTIFICATIONS_BATCH_SIZE)',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling every NOTIFICATIONS_BATCH_INTERVAL seconds',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            # Vaciar la cola lote a lote
+            while True:
+                result = send_queued_notifications_task(options['batch_size'])
+                self.stdout.write(f"Batch: {result['sent']} sent, {result['failed']} failed")
+                if result['sent'] + result['failed'] < options['batch_size']:
+                    break
+
+            if not options['loop']:
+                break
+            time.sleep(settings.NOTIFICATIONS_BATCH_INTERVAL)
@@ -0,0 +1,23 @@
+# Generated by Django 5.0 on 2025-11-05 00:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='contactmessage',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pendiente'), ('queued', 'En Cola'), ('sending', 'Enviando'), ('sent', 'Enviado'), ('failed', 'Fallido')], default='pending', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='notificationlog',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pendiente'), ('queued', 'En Cola'), ('sending', 'Enviando'), ('sent', 'Enviado'), ('failed', 'Fallido')], default='pending', max_length=20),
+        ),
+    ]
@@ -2,17 +2,21 @@
 Modelos para el servicio de notificaciones.
 """
 from django.db import models
+from django.db.models import F
 from django.utils import timezone
 import uuid
 
+from .state import StatusTransitionMixin
 
-class ContactMessage(models.Model):
+
+class ContactMessage(StatusTransitionMixin, models.Model):
     """
     Mensajes de contacto recibidos desde formularios.
     """
     STATUS_CHOICES = [
         ('pending', 'Pendiente'),
         ('queued', 'En Cola'),
+        ('sending', 'Enviando'),
         ('sent', 'Enviado'),
         ('failed', 'Fallido'),
     ]
@@ -45,26 +49,27 @@ class ContactMessage(models.Model):
         return f"{self.name} ({self.email}) - {self.status}"
     
     def mark_as_queued(self):
-        """Marca el mensaje como encolado."""
-        self.status = 'queued'
-        self.save(update_fields=['status', 'updated_at'])
+        """Marca el mensaje como encolado si ningún worker lo tomó todavía."""
+        return self.transition('queued', ['pending'])
     
     def mark_as_sent(self):
-        """Marca el mensaje como enviado."""
-        self.status = 'sent'
-        self.processed_at = timezone.now()
-        self.save(update_fields=['status', 'processed_at', 'updated_at'])
+        """Marca como enviado un mensaje tomado con claim()."""
+        return self.transition('sent', ['sending'], processed_at=timezone.now())
     
     def mark_as_failed(self, error_message):
-        """Marca el mensaje como fallido."""
-        self.status = 'failed'
-        self.last_error = error_message
-        self.retry_count += 1
-        self.processed_at = timezone.now()
-        self.save(update_fields=['status', 'last_error', 'retry_count', 'processed_at', 'updated_at'])
+        """Marca como fallido un mensaje tomado con claim()."""
+        won = self.transition(
+            'failed', ['sending'],
+            last_error=error_message,
+            retry_count=F('retry_count') + 1,
+            processed_at=timezone.now(),
+        )
+        if won:
+            self.retry_count += 1
+        return won
 
 
-class NotificationLog(models.Model):
+class NotificationLog(StatusTransitionMixin, models.Model):
     """
     Log de todas las notificaciones enviadas (desde otros servicios).
     """
@@ -77,6 +82,7 @@ class NotificationLog(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pendiente'),
         ('queued', 'En Cola'),
+        ('sending', 'Enviando'),
         ('sent', 'Enviado'),
         ('failed', 'Fallido'),
     ]
@@ -119,19 +125,20 @@ class NotificationLog(models.Model):
         return f"{self.notification_type.upper()} to {self.to} - {self.status}"
     
     def mark_as_queued(self):
-        """Marca la notificación como encolada."""
-        self.status = 'queued'
-        self.save(update_fields=['status', 'updated_at'])
+        """Marca la notificación como encolada si ningún worker la tomó todavía."""
+        return self.transition('queued', ['pending'])
     
     def mark_as_sent(self):
-        """Marca la notificación como enviada."""
-        self.status = 'sent'
-        self.sent_at = timezone.now()
-        self.save(update_fields=['status', 'sent_at', 'updated_at'])
+        """Marca como enviada una notificación tomada con claim()."""
+        return self.transition('sent', ['sending'], sent_at=timezone.now())
     
     def mark_as_failed(self, error_message):
-        """Marca la notificación como fallida."""
-        self.status = 'failed'
-        self.last_error = error_message
-        self.retry_count += 1
-        self.save(update_fields=['status', 'last_error', 'retry_count', 'updated_at'])
+        """Marca como fallida una notificación tomada con claim()."""
+        won = self.transition(
+            'failed', ['sending'],
+            last_error=error_message,
+            retry_count=F('retry_count') + 1,
+        )
+        if won:
+            self.retry_count += 1
+        return won
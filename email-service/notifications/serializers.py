@@ -57,6 +57,21 @@ class NotificationSerializer(serializers.ModelSerializer):
         if not value or not value.strip():
             raise serializers.ValidationError("El cuerpo del mensaje no puede estar vacío")
         return value.strip()
+    
+    def validate_idempotency_key(self, value):
+        """Una clave vacía equivale a no enviarla (NULL no choca con el índice único)."""
+        return value or None
+
+
+class NotificationBulkItemSerializer(NotificationSerializer):
+    """
+    Serializer para cada item de la ingesta masiva.
+    
+    La unicidad de 'idempotency_key' se resuelve en bloque (una consulta IN)
+    en lugar del UniqueValidator, que haría un SELECT por item.
+    """
+    class Meta(NotificationSerializer.Meta):
+        extra_kwargs = {'idempotency_key': {'validators': []}}
 
 
 class NotificationListSerializer(serializers.ModelSerializer):
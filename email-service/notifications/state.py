@@ -0,0 +1,108 @@
+"""
+Transiciones de estado atómicas para ContactMessage y NotificationLog.
+
+Cada transición es un ``UPDATE ... WHERE status IN (...)`` condicional que
+indica si ganó: sin leer la fila antes y sin carreras entre reintentos o
+entregas duplicadas de la misma tarea.
+
+Ciclo de vida:
+    pending -> queued -> sending -> sent
+                            |
+                            +-> failed / queued (reintento)
+
+Un worker toma un mensaje con ``claim()`` (pasa a 'sending' y devuelve la
+fila en la misma sentencia con ``RETURNING``). Si otro worker ya lo tomó o
+ya se envió, ``claim()`` devuelve None. Un mensaje que quedó en 'sending'
+más de NOTIFICATIONS_CLAIM_TIMEOUT segundos (worker caído) se puede volver
+a tomar.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+
+class StatusTransitionMixin:
+    """Transiciones condicionales de ``status`` para modelos con ``updated_at``."""
+
+    # Estados desde los que un worker puede tomar el mensaje
+    CLAIMABLE_STATUSES = ('pending', 'queued', 'failed')
+
+    def transition(self, to_status, from_statuses, **fields):
+        """
+        Cambia el estado solo si el actual está en ``from_statuses``.
+
+        Args:
+            to_status: estado destino
+            from_statuses: estados de origen permitidos
+            fields: otros campos a actualizar en la misma sentencia
+
+        Returns:
+            bool: True si esta llamada hizo la transición
+        """
+        now = timezone.now()
+        won = type(self).objects.filter(pk=self.pk, status__in=from_statuses).update(
+            status=to_status, updated_at=now, **fields
+        ) == 1
+
+        if won:
+            self.status = to_status
+            self.updated_at = now
+            for name, value in fields.items():
+                if not hasattr(value, 'resolve_expression'):
+                    setattr(self, name, value)
+        return won
+
+    @classmethod
+    def claim(cls, pk, statuses=None):
+        """
+        Toma un mensaje para enviarlo (-> 'sending') en una sola sentencia.
+
+        Returns:
+            instancia con los datos actuales, o None si no se pudo tomar
+        """
+        pk_value = cls._meta.pk.get_db_prep_value(pk, connections[cls.objects.db])
+        condition, params = cls._claimable_condition(statuses)
+        rows = cls._claim_rows(f'id = %s AND {condition}', [pk_value] + params)
+        return rows[0] if rows else None
+
+    @classmethod
+    def claim_batch(cls, limit, statuses=('queued',)):
+        """
+        Toma hasta ``limit`` mensajes, los más antiguos primero.
+
+        Usa ``FOR UPDATE SKIP LOCKED`` donde la base de datos lo soporta, así
+        varios workers toman lotes distintos sin esperarse entre sí.
+        """
+        connection = connections[cls.objects.db]
+        table = connection.ops.quote_name(cls._meta.db_table)
+        condition, params = cls._claimable_condition(statuses)
+        skip_locked = ' FOR UPDATE SKIP LOCKED' if connection.features.has_select_for_update_skip_locked else ''
+
+        subquery = (
+            f'id IN (SELECT id FROM {table} WHERE {condition} '
+            f'ORDER BY created_at LIMIT %s{skip_locked})'
+        )
+        return cls._claim_rows(subquery, params + [limit])
+
+    @classmethod
+    def _claimable_condition(cls, statuses):
+        connection = connections[cls.objects.db]
+        statuses = tuple(statuses or cls.CLAIMABLE_STATUSES)
+        stale_before = timezone.now() - timedelta(seconds=settings.NOTIFICATIONS_CLAIM_TIMEOUT)
+
+        placeholders = ', '.join(['%s'] * len(statuses))
+        condition = f"(status IN ({placeholders}) OR (status = 'sending' AND updated_at < %s))"
+        params = list(statuses) + [
+            cls._meta.get_field('updated_at').get_db_prep_value(stale_before, connection)
+        ]
+        return condition, params
+
+    @classmethod
+    def _claim_rows(cls, where, params):
+        connection = connections[cls.objects.db]
+        table = connection.ops.quote_name(cls._meta.db_table)
+        now = cls._meta.get_field('updated_at').get_db_prep_value(timezone.now(), connection)
+        sql = f"UPDATE {table} SET status = 'sending', updated_at = %s WHERE {where} RETURNING *"
+        return list(cls.objects.raw(sql, [now] + params))
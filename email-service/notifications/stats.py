@@ -0,0 +1,71 @@
+"""
+Estadísticas agregadas de mensajes de contacto y notificaciones.
+
+Todas las cifras de cada modelo salen de una sola consulta con agregados
+condicionales (``COUNT(*) FILTER (WHERE ...)``), y el resultado se cachea
+``STATS_CACHE_TTL`` segundos: la carga en la base de datos no crece con la
+frecuencia de polling de los dashboards.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .models import ContactMessage, NotificationLog
+
+CONTACT_STATS_KEY = 'stats:contact'
+NOTIFICATION_STATS_KEY = 'stats:notifications'
+
+
+def _count_by(model, **groups):
+    """
+    Cuenta el total y cada valor de los campos indicados en una consulta.
+
+    Args:
+        model: modelo a contar
+        groups: campo -> choices del campo
+
+    Returns:
+        dict: {'total': n, campo: {valor: n, ...}, ...}
+    """
+    aggregates = {'total': Count('pk')}
+    for field, choices in groups.items():
+        for value, _ in choices:
+            aggregates[f'{field}__{value}'] = Count('pk', filter=Q(**{field: value}))
+
+    row = model.objects.aggregate(**aggregates)
+
+    result = {'total': row['total']}
+    for field, choices in groups.items():
+        result[field] = {value: row[f'{field}__{value}'] for value, _ in choices}
+    return result
+
+
+def contact_stats():
+    """Totales de mensajes de contacto por estado."""
+    def compute():
+        counts = _count_by(ContactMessage, status=ContactMessage.STATUS_CHOICES)
+        return {'total': counts['total'], **counts['status']}
+
+    return cache.get_or_set(CONTACT_STATS_KEY, compute, settings.STATS_CACHE_TTL)
+
+
+def notification_stats():
+    """Totales de notificaciones por tipo y por estado."""
+    def compute():
+        counts = _count_by(
+            NotificationLog,
+            notification_type=NotificationLog.TYPE_CHOICES,
+            status=NotificationLog.STATUS_CHOICES,
+        )
+        return {
+            'total': counts['total'],
+            'by_type': counts['notification_type'],
+            'by_status': counts['status'],
+        }
+
+    return cache.get_or_set(NOTIFICATION_STATS_KEY, compute, settings.STATS_CACHE_TTL)
+
+
+def invalidate_stats():
+    """Borra las estadísticas cacheadas (las dos entradas de este módulo)."""
+    cache.delete_many([CONTACT_STATS_KEY, NOTIFICATION_STATS_KEY])
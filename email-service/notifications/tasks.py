@@ -4,10 +4,12 @@ Tareas asíncronas de Celery para envío de emails y notificaciones.
 from celery import shared_task
 from django.core.mail import send_mail
 from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 import logging
 
 from .models import ContactMessage, NotificationLog
-from utils.mailer import send_email
+from utils.mailer import send_email, send_email_batch
 
 logger = logging.getLogger('notifications')
 
@@ -17,14 +19,18 @@ def send_contact_email_task(self, contact_message_id):
     """
     Tarea asíncrona para enviar email de mensaje de contacto.
     
+    El mensaje se toma con ``claim()``: si otro worker ya lo está enviando o
+    ya se envió (tarea duplicada), la tarea termina sin enviar nada.
+    
     Args:
         contact_message_id: UUID del mensaje de contacto
     """
+    message = None
     try:
-        message = ContactMessage.objects.get(id=contact_message_id)
-        
-        # Marcar como en cola
-        message.mark_as_queued()
+        message = ContactMessage.claim(contact_message_id)
+        if message is None:
+            logger.info(f"Contact message {contact_message_id} not found or already claimed, skipping")
+            return {'status': 'skipped', 'message_id': str(contact_message_id)}
         
         # Preparar email
         subject = f"Nuevo mensaje de contacto de {message.name}"
@@ -55,18 +61,12 @@ def send_contact_email_task(self, contact_message_id):
             return {'status': 'sent', 'message_id': str(contact_message_id)}
         else:
             raise Exception("Failed to send email")
-            
-    except ContactMessage.DoesNotExist:
-        logger.error(f"Contact message {contact_message_id} not found")
-        return {'status': 'error', 'message': 'Contact message not found'}
     
     except Exception as exc:
         logger.error(f"Error sending contact message {contact_message_id}: {str(exc)}")
         
-        try:
+        if message is not None:
             message.mark_as_failed(str(exc))
-        except:
-            pass
         
         # Reintentar la tarea
         raise self.retry(exc=exc)
@@ -77,14 +77,18 @@ def send_notification_task(self, notification_id):
     """
     Tarea asíncrona para enviar notificación.
     
+    La notificación se toma con ``claim()``: si otro worker ya la está
+    enviando o ya se envió (tarea duplicada), la tarea termina sin enviar.
+    
     Args:
         notification_id: UUID de la notificación
     """
+    notification = None
     try:
-        notification = NotificationLog.objects.get(id=notification_id)
-        
-        # Marcar como en cola
-        notification.mark_as_queued()
+        notification = NotificationLog.claim(notification_id)
+        if notification is None:
+            logger.info(f"Notification {notification_id} not found or already claimed, skipping")
+            return {'status': 'skipped', 'notification_id': str(notification_id)}
         
         # Enviar según el tipo
         if notification.notification_type == 'email':
@@ -104,18 +108,85 @@ def send_notification_task(self, notification_id):
             return {'status': 'sent', 'notification_id': str(notification_id)}
         else:
             raise Exception("Failed to send notification")
-            
-    except NotificationLog.DoesNotExist:
-        logger.error(f"Notification {notification_id} not found")
-        return {'status': 'error', 'message': 'Notification not found'}
     
     except Exception as exc:
         logger.error(f"Error sending notification {notification_id}: {str(exc)}")
         
-        try:
+        if notification is not None:
             notification.mark_as_failed(str(exc))
-        except:
-            pass
         
         # Reintentar la tarea
         raise self.retry(exc=exc)
+
+
+@shared_task
+def send_queued_notifications_task(batch_size=None):
+    """
+    Tarea de entrega por lotes: envía hasta ``batch_size`` notificaciones en
+    estado 'queued' reutilizando una sola conexión SMTP.
+    
+    El lote se toma con ``claim_batch()`` (una sentencia, ``SKIP LOCKED``),
+    así varios workers procesan lotes distintos en paralelo y el envío SMTP
+    ocurre fuera de cualquier transacción. El resultado se guarda con dos
+    UPDATEs en bloque (enviados y fallidos); los fallidos vuelven a 'queued'
+    hasta NOTIFICATIONS_BATCH_MAX_ATTEMPTS.
+    
+    Returns:
+        dict: cantidad de notificaciones enviadas y fallidas
+    """
+    batch_size = batch_size or settings.NOTIFICATIONS_BATCH_SIZE
+    
+    batch = NotificationLog.claim_batch(batch_size)
+    if not batch:
+        return {'sent': 0, 'failed': 0}
+    
+    emails = [n for n in batch if n.notification_type == 'email']
+    results = send_email_batch([
+        {'to': [n.to], 'subject': n.subject, 'body': n.body}
+        for n in emails
+    ]) if emails else []
+    
+    now = timezone.now()
+    sent_ids = [n.id for n in batch if n.notification_type != 'email']
+    failed = []
+    for notification, (ok, error) in zip(emails, results):
+        if ok:
+            sent_ids.append(notification.id)
+        else:
+            # Vuelve a la cola hasta agotar los intentos
+            notification.retry_count += 1
+            notification.status = (
+                'queued' if notification.retry_count < settings.NOTIFICATIONS_BATCH_MAX_ATTEMPTS
+                else 'failed'
+            )
+            notification.last_error = error
+            notification.updated_at = now
+            failed.append(notification)
+    
+    with transaction.atomic():
+        NotificationLog.objects.filter(id__in=sent_ids, status='sending').update(
+            status='sent', sent_at=now, updated_at=now
+        )
+        if failed:
+            NotificationLog.objects.bulk_update(
+                failed, ['status', 'last_error', 'retry_count', 'updated_at']
+            )
+    
+    logger.info(f"Batch delivery: {len(sent_ids)} sent, {len(failed)} failed")
+    return {'sent': len(sent_ids), 'failed': len(failed)}
+
+
+def enqueue_notifications(notification_ids):
+    """
+    Publica ``send_notification_task`` para varias notificaciones reutilizando
+    un único productor (una conexión al broker) para todo el lote.
+    
+    En modo 'batch' no publica nada: las notificaciones en 'queued' las toma
+    send_queued_notifications_task.
+    """
+    if settings.NOTIFICATIONS_DELIVERY_MODE == 'batch':
+        return
+    
+    with send_notification_task.app.producer_or_acquire() as producer:
+        for notification_id in notification_ids:
+            send_notification_task.apply_async((str(notification_id),), producer=producer)
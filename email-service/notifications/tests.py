@@ -0,0 +1,180 @@
+import threading
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from . import bulk
+from .management.commands import check_query_budgets
+from .models import NotificationLog
+
+
+def item(to, key=None):
+    data = {'notification_type': 'email', 'to': to, 'subject': 'Hola', 'body': 'Mensaje'}
+    if key is not None:
+        data['idempotency_key'] = key
+    return data
+
+
+class BulkIngestTests(TestCase):
+    """Idempotencia de ``ingest_notifications`` (el broker se reemplaza por un mock)."""
+
+    def ingest(self, items):
+        with mock.patch.object(bulk, 'enqueue_notifications') as enqueue:
+            results = bulk.ingest_notifications(items)
+        self.enqueued = enqueue.call_args.args[0] if enqueue.called else []
+        return results
+
+    def assert_rows_exist(self, results):
+        ids = [result['id'] for result in results]
+        self.assertEqual(NotificationLog.objects.filter(id__in=ids).count(), len(set(ids)))
+
+    def test_blank_keys_are_independent(self):
+        results = self.ingest([item('a@example.com', ''), item('b@example.com', '')])
+        self.assertEqual([result['status'] for result in results], ['queued', 'queued'])
+        self.assert_rows_exist(results)
+        self.assertEqual(sorted(self.enqueued), sorted(result['id'] for result in results))
+        self.assertFalse(NotificationLog.objects.filter(idempotency_key='').exists())
+
+        # Y no chocan con las filas sin clave que ya existen
+        results = self.ingest([item('c@example.com', '')])
+        self.assertEqual(results[0]['status'], 'queued')
+        self.assert_rows_exist(results)
+
+    def test_repeated_key_in_batch(self):
+        results = self.ingest([item('a@example.com', 'k1'), item('b@example.com', 'k1'), item('c@example.com')])
+        self.assertEqual([result['status'] for result in results], ['queued', 'duplicate', 'queued'])
+        self.assertEqual(results[1]['id'], results[0]['id'])
+        self.assertEqual(len(self.enqueued), 2)
+        self.assert_rows_exist(results)
+
+    def test_existing_key(self):
+        first = self.ingest([item('a@example.com', 'k1')])[0]
+        results = self.ingest([item('b@example.com', 'k1'), item('c@example.com', 'k2')])
+        self.assertEqual(results[0], {'index': 0, 'id': first['id'], 'status': 'duplicate', 'current_status': 'queued'})
+        self.assertEqual(results[1]['status'], 'queued')
+        self.assertEqual(self.enqueued, [results[1]['id']])
+
+    def test_invalid_items_are_reported(self):
+        results = self.ingest([item('a@example.com'), {'to': '', 'body': ''}])
+        self.assertEqual(results[0]['status'], 'queued')
+        self.assertEqual(results[1]['status'], 'invalid')
+        self.assertIn('to', results[1]['errors'])
+
+    def test_enqueue_failure_reverts_only_queued_rows(self):
+        def enqueue(ids):
+            # Una tarea ya publicada llegó a tomar la primera notificación
+            NotificationLog.objects.filter(id=ids[0]).update(status='sending')
+            raise ConnectionError('broker down')
+
+        with mock.patch.object(bulk, 'enqueue_notifications', enqueue):
+            results = bulk.ingest_notifications([item('a@example.com'), item('b@example.com')])
+        self.assertEqual([result['status'] for result in results], ['queued', 'pending'])
+        statuses = dict(NotificationLog.objects.values_list('id', 'status'))
+        self.assertEqual([statuses[result['id']] for result in results], ['sending', 'pending'])
+
+
+class StatusTransitionTests(TestCase):
+    """Transiciones condicionales: cada una la gana una sola llamada."""
+
+    def setUp(self):
+        self.notification = NotificationLog.objects.create(**item('a@example.com'))
+
+    def test_transition_wins_once(self):
+        other = NotificationLog.objects.get(pk=self.notification.pk)
+        self.assertTrue(self.notification.mark_as_queued())
+        # Una copia en memoria con el estado viejo no repite la transición
+        self.assertFalse(other.mark_as_queued())
+        self.assertEqual(NotificationLog.objects.get(pk=self.notification.pk).status, 'queued')
+
+    def test_claim_once(self):
+        self.notification.mark_as_queued()
+        claimed = NotificationLog.claim(self.notification.pk)
+        self.assertEqual(claimed.status, 'sending')
+        self.assertIsNone(NotificationLog.claim(self.notification.pk))
+
+        self.assertTrue(claimed.mark_as_failed('timeout'))
+        self.assertFalse(claimed.mark_as_sent())
+        row = NotificationLog.objects.get(pk=self.notification.pk)
+        self.assertEqual((row.status, row.retry_count, row.last_error), ('failed', 1, 'timeout'))
+
+    def test_sent_is_final(self):
+        claimed = NotificationLog.claim(self.notification.pk)
+        self.assertTrue(claimed.mark_as_sent())
+        self.assertIsNone(NotificationLog.claim(self.notification.pk))
+        self.assertFalse(claimed.mark_as_queued())
+
+    @override_settings(NOTIFICATIONS_CLAIM_TIMEOUT=60)
+    def test_stale_sending_can_be_reclaimed(self):
+        NotificationLog.claim(self.notification.pk)
+        self.assertIsNone(NotificationLog.claim(self.notification.pk))
+        # Worker caído: el mensaje quedó en 'sending' más que el timeout
+        NotificationLog.objects.filter(pk=self.notification.pk).update(updated_at=timezone.now() - timedelta(minutes=2))
+        self.assertIsNotNone(NotificationLog.claim(self.notification.pk))
+
+
+class ClaimBatchTests(TransactionTestCase):
+    """``claim_batch`` con ``SKIP LOCKED``: dos workers nunca toman la misma fila."""
+
+    def setUp(self):
+        NotificationLog.objects.bulk_create(
+            NotificationLog(**item(f'user{i}@example.com'), status='queued') for i in range(10)
+        )
+
+    def test_batches_are_disjoint(self):
+        first = {row.pk for row in NotificationLog.claim_batch(4)}
+        second = {row.pk for row in NotificationLog.claim_batch(10)}
+        self.assertEqual(len(first), 4)
+        self.assertEqual(len(second), 6)
+        self.assertFalse(first & second)
+        self.assertEqual(NotificationLog.claim_batch(10), [])
+
+    def test_skips_rows_locked_by_another_worker(self):
+        locked, release = threading.Event(), threading.Event()
+        held = []
+
+        def worker():
+            try:
+                with transaction.atomic():
+                    held.extend(NotificationLog.objects.select_for_update().order_by('created_at').values_list('pk', flat=True)[:3])
+                    locked.set()
+                    release.wait(10)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        try:
+            self.assertTrue(locked.wait(10))
+            claimed = {row.pk for row in NotificationLog.claim_batch(10)}
+        finally:
+            release.set()
+            thread.join()
+        self.assertEqual(len(claimed), 7)
+        self.assertFalse(claimed & set(held))
+
+
+class CheckQueryBudgetsTests(TestCase):
+
+    def run_command(self, budgets, *args):
+        out, err = StringIO(), StringIO()
+        with mock.patch.object(check_query_budgets, 'BUDGETS', budgets):
+            call_command('check_query_budgets', *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_passes_within_budget(self):
+        out, _ = self.run_command([('/api/notify/stats/', 1)], '--cold-cache')
+        self.assertIn('ok', out)
+
+    def test_non_200_fails(self):
+        # Un 404 no hace consultas: sin el chequeo del status parecería el mejor resultado
+        with self.assertRaisesMessage(CommandError, '1 endpoint(s) failed'):
+            self.run_command([('/api/does-not-exist/', 0)])
+
+    def test_over_budget_fails(self):
+        with self.assertRaises(CommandError):
+            self.run_command([('/api/notify/', 0)])
@@ -4,6 +4,7 @@ Views para el servicio de notificaciones.
 from rest_framework import viewsets, status, mixins
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.conf import settings
 from django.utils import timezone
 import logging
 
@@ -14,7 +15,9 @@ from .serializers import (
     NotificationSerializer,
     NotificationListSerializer
 )
-from .tasks import send_contact_email_task, send_notification_task
+from .bulk import ingest_notifications
+from .stats import contact_stats, notification_stats
+from .tasks import send_contact_email_task, enqueue_notifications
 
 logger = logging.getLogger('notifications')
 
@@ -27,10 +30,18 @@ class ContactMessageViewSet(mixins.CreateModelMixin,
     ViewSet para mensajes de contacto.
     
     POST /api/contact/ - Crear nuevo mensaje de contacto
-    GET /api/contact/ - Listar mensajes de contacto
+    GET /api/contact/ - Listar mensajes de contacto (?status=, ?pagination=cursor)
     GET /api/contact/{id}/ - Obtener detalle de mensaje
     """
     queryset = ContactMessage.objects.all()
+    keyset_ordering = ('-created_at', '-id')
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        status_filter = self.request.query_params.get('status')
+        if self.action == 'list' and status_filter:
+            queryset = queryset.filter(status=status_filter)
+        return queryset
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -71,19 +82,7 @@ class ContactMessageViewSet(mixins.CreateModelMixin,
         Estadísticas de mensajes de contacto.
         GET /api/contact/stats/
         """
-        total = ContactMessage.objects.count()
-        pending = ContactMessage.objects.filter(status='pending').count()
-        queued = ContactMessage.objects.filter(status='queued').count()
-        sent = ContactMessage.objects.filter(status='sent').count()
-        failed = ContactMessage.objects.filter(status='failed').count()
-        
-        return Response({
-            'total': total,
-            'pending': pending,
-            'queued': queued,
-            'sent': sent,
-            'failed': failed
-        })
+        return Response(contact_stats())
 
 
 class NotificationViewSet(mixins.CreateModelMixin,
@@ -94,10 +93,19 @@ class NotificationViewSet(mixins.CreateModelMixin,
     ViewSet para notificaciones (endpoint interno para otros servicios).
     
     POST /api/notify/ - Crear nueva notificación
-    GET /api/notify/ - Listar notificaciones
+    POST /api/notify/bulk/ - Crear notificaciones en bloque
+    GET /api/notify/ - Listar notificaciones (?status=, ?pagination=cursor)
     GET /api/notify/{id}/ - Obtener detalle de notificación
     """
     queryset = NotificationLog.objects.all()
+    keyset_ordering = ('-created_at', '-id')
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        status_filter = self.request.query_params.get('status')
+        if self.action == 'list' and status_filter:
+            queryset = queryset.filter(status=status_filter)
+        return queryset
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -133,7 +141,7 @@ class NotificationViewSet(mixins.CreateModelMixin,
         
         # Encolar tarea de envío
         try:
-            send_notification_task.delay(str(notification.id))
+            enqueue_notifications([notification.id])
             notification.mark_as_queued()
             logger.info(f"Notification {notification.id} queued for sending")
         except Exception as e:
@@ -148,25 +156,52 @@ class NotificationViewSet(mixins.CreateModelMixin,
             status=status.HTTP_201_CREATED
         )
     
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Ingesta masiva de notificaciones.
+        POST /api/notify/bulk/
+        
+        Acepta una lista de notificaciones (o {"notifications": [...]}) y
+        retorna un resultado por item: queued, duplicate o invalid.
+        """
+        items = request.data
+        if isinstance(items, dict):
+            items = items.get('notifications')
+        
+        if not isinstance(items, list) or not items:
+            return Response(
+                {'error': 'Se espera una lista no vacía de notificaciones'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        max_items = settings.NOTIFY_BULK_MAX_ITEMS
+        if len(items) > max_items:
+            return Response(
+                {'error': f'Máximo {max_items} notificaciones por request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        results = ingest_notifications(items)
+        
+        summary = {'queued': 0, 'pending': 0, 'duplicate': 0, 'invalid': 0}
+        for result in results:
+            summary[result['status']] += 1
+        
+        created = summary['queued'] + summary['pending']
+        return Response(
+            {
+                'total': len(results),
+                **summary,
+                'results': results
+            },
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+        )
+    
     @action(detail=False, methods=['get'])
     def stats(self, request):
         """
         Estadísticas de notificaciones.
         GET /api/notify/stats/
         """
-        total = NotificationLog.objects.count()
-        by_type = {}
-        for choice in NotificationLog.TYPE_CHOICES:
-            type_key = choice[0]
-            by_type[type_key] = NotificationLog.objects.filter(notification_type=type_key).count()
-        
-        by_status = {}
-        for choice in NotificationLog.STATUS_CHOICES:
-            status_key = choice[0]
-            by_status[status_key] = NotificationLog.objects.filter(status=status_key).count()
-        
-        return Response({
-            'total': total,
-            'by_type': by_type,
-            'by_status': by_status
-        })
+        return Response(notification_stats())
@@ -0,0 +1,71 @@
+"""
+``DatabaseWrapper`` de PostgreSQL que toma las conexiones de ``pool``.
+
+Django sigue abriendo y cerrando la conexión en cada request (``CONN_MAX_AGE``
+debe ser 0), pero ``connect()`` saca una conexión ya establecida del pool y
+``close()`` la devuelve, así el handshake TCP + autenticación solo se paga la
+primera vez en cada proceso.
+"""
+import os
+from functools import partial
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import base, creation
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from .pool import PoolTimeout, close_idle, get_pool
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Las conexiones libres del pool siguen abiertas contra la base de
+        # tests y PostgreSQL no deja borrarla
+        close_idle(self.connection.alias)
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    def __init__(self, settings_dict, alias=None):
+        super().__init__(settings_dict, alias)
+        self.pool_options = settings_dict['OPTIONS'].get('pool', {})
+        self._pool = None
+
+    def check_settings(self):
+        super().check_settings()
+        if self.settings_dict['CONN_MAX_AGE'] != 0:
+            raise ImproperlyConfigured(
+                f"{self.settings_dict['ENGINE']} requires CONN_MAX_AGE = 0: the pool keeps the connections open."
+            )
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        conn_params.pop('pool', None)
+        return conn_params
+
+    def get_new_connection(self, conn_params):
+        self._pool = get_pool(self.alias, self.settings_dict['NAME'], self.pool_options)
+        try:
+            connection = self._pool.getconn(partial(super().get_new_connection, conn_params))
+        except PoolTimeout as e:
+            raise self.Database.OperationalError(str(e)) from e
+        # get_new_connection() de la clase base solo corre para conexiones
+        # nuevas; en las reutilizadas se fija aquí el nivel de aislamiento
+        self.isolation_level = IsolationLevel(
+            self.settings_dict['OPTIONS'].get('isolation_level', IsolationLevel.READ_COMMITTED)
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        if self._pool is None or self._pool.pid != os.getpid():
+            # Conexión heredada de otro proceso: no pertenece a este pool
+            return super()._close()
+        # Cerrada dentro de un atomic(): Django conserva la referencia, así que
+        # no puede volver al pool para que otro hilo la use
+        discard = self.in_atomic_block or (self.errors_occurred and not self.is_usable())
+        with self.wrap_database_errors:
+            self._pool.putconn(self.connection, discard=discard)
@@ -0,0 +1,231 @@
+"""
+Pool de conexiones a PostgreSQL por proceso.
+
+Cada worker de gunicorn y cada proceso hijo de Celery (prefork) tiene su
+propio pool: al detectar un ``fork`` (cambio de pid) se crea uno nuevo y las
+conexiones heredadas del padre no se reutilizan ni se cierran, porque
+comparten el socket con el proceso padre.
+
+El pool es por alias y por base de datos: el test runner cambia ``NAME`` a
+la base de tests y las conexiones a la base original no se reutilizan.
+"""
+import os
+import threading
+import time
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """
+    Pool acotado de conexiones DB-API.
+
+    Args:
+        max_size: conexiones abiertas como máximo (en uso + libres)
+        timeout: segundos que se espera una conexión libre antes de fallar
+        max_idle: las conexiones libres más de estos segundos se cierran
+        check_delay: las conexiones libres más de estos segundos se comprueban
+            con ``SELECT 1`` antes de entregarlas (como ``server_check_delay``
+            de PgBouncer); ``None`` desactiva la comprobación
+    """
+
+    def __init__(self, max_size=5, timeout=10, max_idle=300, check_delay=30):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.check_delay = check_delay
+        self.pid = os.getpid()
+
+        self._cond = threading.Condition()
+        self._idle = []  # (conexión, momento en que se devolvió)
+        self._size = 0
+        self._checked_out = 0
+        self._waiting = 0
+        self.stats = {
+            'connections_created': 0,
+            'connections_closed': 0,
+            'checkouts': 0,
+            'waits': 0,
+            'wait_time_ms': 0.0,
+            'timeouts': 0,
+        }
+
+    def getconn(self, connect):
+        """
+        Entrega una conexión libre o abre una nueva con ``connect()``.
+
+        Raises:
+            PoolTimeout: si no hay conexión libre en ``timeout`` segundos
+        """
+        while True:
+            with self._cond:
+                conn, idle_for = self._take()
+            if conn is None:
+                break
+            if idle_for > self.max_idle or conn.closed or not self._check(conn, idle_for):
+                self._discard(conn)
+                continue
+            return conn
+
+        try:
+            conn = connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._checked_out -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self.stats['connections_created'] += 1
+        return conn
+
+    def _take(self):
+        """Reserva una conexión libre o un hueco para una nueva (con el lock tomado)."""
+        waited_since = None
+        while True:
+            # Mientras haya hilos esperando, los que llegan nuevos se ponen a
+            # la cola en vez de adelantarse (Condition despierta en orden FIFO)
+            if waited_since is not None or not self._waiting:
+                if self._idle:
+                    conn, released_at = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    conn, released_at = None, None
+                    break
+
+            now = time.monotonic()
+            if waited_since is None:
+                waited_since = now
+                self._waiting += 1
+                self.stats['waits'] += 1
+            remaining = self.timeout - (now - waited_since)
+            if remaining <= 0:
+                self._waiting -= 1
+                self.stats['timeouts'] += 1
+                self.stats['wait_time_ms'] += (now - waited_since) * 1000
+                # Por si el aviso de una conexión libre iba dirigido a este hilo
+                self._cond.notify()
+                raise PoolTimeout(
+                    f'No free database connection after {self.timeout}s '
+                    f'(pool max_size={self.max_size})'
+                )
+            self._cond.wait(remaining)
+
+        if waited_since is not None:
+            self._waiting -= 1
+            self.stats['wait_time_ms'] += (time.monotonic() - waited_since) * 1000
+            if self._waiting and (self._idle or self._size < self.max_size):
+                self._cond.notify()
+        self._checked_out += 1
+        self.stats['checkouts'] += 1
+        idle_for = 0 if released_at is None else time.monotonic() - released_at
+        return conn, idle_for
+
+    def _check(self, conn, idle_for):
+        if self.check_delay is None or idle_for < self.check_delay:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, conn):
+        """Cierra una conexión entregada y libera su hueco."""
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._checked_out -= 1
+            self.stats['connections_closed'] += 1
+            self._cond.notify()
+
+    def putconn(self, conn, discard=False):
+        """
+        Devuelve una conexión al pool.
+
+        Si quedó una transacción abierta se hace rollback; si la conexión está
+        rota o ``discard`` es True se cierra.
+        """
+        if not discard and not conn.closed:
+            try:
+                if conn.get_transaction_status() != 0:  # TRANSACTION_STATUS_IDLE
+                    conn.rollback()
+            except Exception:
+                discard = True
+        if discard or conn.closed:
+            self._discard(conn)
+            return
+
+        with self._cond:
+            self._checked_out -= 1
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def close_idle(self):
+        """Cierra las conexiones libres; las entregadas vuelven con ``putconn``."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self.stats['connections_closed'] += len(idle)
+            self._cond.notify_all()
+        for conn, _ in idle:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def snapshot(self):
+        """Métricas del pool: tamaño, conexiones en uso/libres y esperas."""
+        with self._cond:
+            return {
+                'max_size': self.max_size,
+                'size': self._size,
+                'checked_out': self._checked_out,
+                'idle': len(self._idle),
+                **self.stats,
+                'wait_time_ms': round(self.stats['wait_time_ms'], 2),
+            }
+
+
+_pools = {}
+_inherited = []
+_lock = threading.Lock()
+
+
+def get_pool(alias, database, options):
+    """Pool del proceso actual para el alias y la base de datos (``NAME``)."""
+    with _lock:
+        pool = _pools.get(alias)
+        if pool is not None and pool.pid != os.getpid():
+            # Proceso hijo: se conserva la referencia para que el recolector
+            # no cierre (y rompa en el padre) las conexiones heredadas
+            _inherited.append(pool)
+            pool = None
+        elif pool is not None and pool.database != database:
+            pool.close_idle()
+            pool = None
+        if pool is None:
+            pool = _pools[alias] = ConnectionPool(**options)
+            pool.database = database
+        return pool
+
+
+def close_idle(alias):
+    """Cierra las conexiones libres del pool del alias en este proceso."""
+    with _lock:
+        pool = _pools.get(alias)
+    if pool is not None and pool.pid == os.getpid():
+        pool.close_idle()
+
+
+def pool_stats():
+    """Métricas de los pools del proceso actual, por alias."""
+    with _lock:
+        return {alias: pool.snapshot() for alias, pool in _pools.items() if pool.pid == os.getpid()}
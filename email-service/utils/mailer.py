@@ -1,13 +1,32 @@
 """
 Utilidad para envío de emails.
 """
-from django.core.mail import send_mail, EmailMessage
+from django.core.mail import send_mail, EmailMessage, get_connection
 from django.conf import settings
 import logging
+import smtplib
+
+from .tracing import child_span
 
 logger = logging.getLogger('notifications')
 
 
+def _connection_lost(error):
+    """
+    True si el error deja la sesión SMTP inutilizable.
+
+    Los rechazos de un mensaje (SMTPRecipientsRefused, SMTPDataError...) no
+    cortan la sesión: smtplib ya hizo RSET y se sigue con la misma conexión.
+    """
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        # 421: el servidor va a cerrar la conexión
+        return error.smtp_code == 421
+    # SMTPException hereda de OSError: aquí solo quedan los errores de socket
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+
 def send_email(to, subject, body, from_email=None, html_body=None):
     """
     Envía un email.
@@ -22,35 +41,91 @@ def send_email(to, subject, body, from_email=None, html_body=None):
     Returns:
         bool: True si se envió correctamente, False en caso contrario
     """
-    try:
-        from_email = from_email or settings.DEFAULT_FROM_EMAIL
+    with child_span('smtp.send', 'client', {'email.recipients': len(to)}) as span:
+        try:
+            from_email = from_email or settings.DEFAULT_FROM_EMAIL
         
-        if html_body:
-            # Enviar email con versión HTML
-            msg = EmailMessage(
-                subject=subject,
-                body=body,
-                from_email=from_email,
-                to=to
-            )
-            msg.content_subtype = "html"
-            msg.send()
-        else:
-            # Enviar email de texto plano
-            send_mail(
-                subject=subject,
-                message=body,
-                from_email=from_email,
-                recipient_list=to,
-                fail_silently=False
-            )
+            if html_body:
+                # Enviar email con versión HTML
+                msg = EmailMessage(
+                    subject=subject,
+                    body=body,
+                    from_email=from_email,
+                    to=to
+                )
+                msg.content_subtype = "html"
+                msg.send()
+            else:
+                # Enviar email de texto plano
+                send_mail(
+                    subject=subject,
+                    message=body,
+                    from_email=from_email,
+                    recipient_list=to,
+                    fail_silently=False
+                )
         
-        logger.info(f"Email sent successfully to {to}")
-        return True
+            logger.info(f"Email sent successfully to {to}")
+            return True
         
+        except Exception as e:
+            logger.error(f"Error sending email to {to}: {str(e)}")
+            if span is not None:
+                span.error = str(e)
+            return False
+
+
+def send_email_batch(messages, from_email=None):
+    """
+    Envía varios emails reutilizando una sola conexión al backend.
+    
+    Abre la conexión una vez (un solo handshake SMTP/TLS) y envía cada
+    mensaje por separado para poder registrar el resultado de cada uno.
+    Si el servidor corta la conexión, se reabre y se continúa con el lote.
+    
+    Args:
+        messages: Lista de dicts con 'to' (lista), 'subject' y 'body'
+        from_email: Remitente (opcional, usa DEFAULT_FROM_EMAIL si no se especifica)
+    
+    Returns:
+        list: (enviado, error) por mensaje, en el mismo orden
+    """
+    from_email = from_email or settings.DEFAULT_FROM_EMAIL
+    results = []
+    
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+        for message in messages:
+            email = EmailMessage(
+                subject=message['subject'],
+                body=message['body'],
+                from_email=message.get('from_email') or from_email,
+                to=message['to'],
+                connection=connection
+            )
+            with child_span('smtp.send', 'client', {'email.recipients': len(message['to'])}) as span:
+                try:
+                    email.send()
+                    results.append((True, None))
+                except Exception as e:
+                    logger.error(f"Error sending email to {message['to']}: {str(e)}")
+                    results.append((False, str(e)))
+                    if span is not None:
+                        span.error = str(e)
+                    # Reabrir solo si el servidor cerró la conexión
+                    if _connection_lost(e):
+                        connection.close()
+                        connection.open()
     except Exception as e:
-        logger.error(f"Error sending email to {to}: {str(e)}")
-        return False
+        logger.error(f"Email backend connection failed: {str(e)}")
+        results.extend((False, str(e)) for _ in range(len(messages) - len(results)))
+    finally:
+        connection.close()
+    
+    sent = sum(1 for ok, _ in results if ok)
+    logger.info(f"Email batch finished: {sent}/{len(messages)} sent")
+    return results
 
 
 def send_template_email(to, subject, template_name, context, from_email=None):
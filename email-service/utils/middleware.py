@@ -3,7 +3,9 @@ Middleware para logging de requests y otras utilidades.
 """
 import time
 import logging
-import json
+
+from utils.tokens import InvalidToken, verifier
+from utils.tracing import current_span
 
 logger = logging.getLogger('django.request')
 
@@ -17,47 +19,56 @@ class RequestLoggingMiddleware:
     
     def __call__(self, request):
         # Timestamp de inicio
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # Procesar request
         response = self.get_response(request)
         
         # Calcular duración
-        duration_ms = (time.time() - start_time) * 1000
+        duration_ms = (time.perf_counter() - start_time) * 1000
         
-        # Preparar log data
+        # Campos estructurados: JsonFormatter los serializa una sola vez
+        span = current_span()
         log_data = {
             'method': request.method,
             'path': request.path,
             'status_code': response.status_code,
             'duration_ms': round(duration_ms, 2),
             'user_agent': request.META.get('HTTP_USER_AGENT', ''),
+            'trace_id': span.trace_id if span is not None else None,
         }
+        message = f"{request.method} {request.path} {response.status_code}"
         
         # Loguear
         if response.status_code >= 500:
-            logger.error(json.dumps(log_data, ensure_ascii=False))
+            logger.error(message, extra=log_data)
         elif response.status_code >= 400:
-            logger.warning(json.dumps(log_data, ensure_ascii=False))
+            logger.warning(message, extra=log_data)
         else:
-            logger.info(json.dumps(log_data, ensure_ascii=False))
+            logger.info(message, extra=log_data)
         
         return response
 
 
-class AuthTokenLoggingMiddleware:
+class JWTAuthMiddleware:
     """
-    Middleware que captura y loguea el header Authorization (preparación para JWT).
+    Verifica localmente el access token de auth-service y expone sus claims.
+    
+    ``request.auth_claims`` queda con los claims del token, o None si no hay
+    header o el token no es válido. No rechaza la request: decidir si un
+    endpoint exige autenticación corresponde a la vista.
     """
     def __init__(self, get_response):
         self.get_response = get_response
     
     def __call__(self, request):
-        auth_header = request.META.get('HTTP_AUTHORIZATION', '')
+        request.auth_claims = None
+        scheme, _, token = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
         
-        if auth_header:
-            # Solo loguear que existe, no el contenido completo (seguridad)
-            logger.info(f"Authorization header detected: {auth_header[:20]}... (will be validated in future)")
+        if scheme == 'Bearer' and token:
+            try:
+                request.auth_claims = verifier.verify(token)
+            except InvalidToken as e:
+                logger.info(f"Rejected bearer token on {request.path}: {e}")
         
-        response = self.get_response(request)
-        return response
+        return self.get_response(request)
@@ -0,0 +1,78 @@
+"""
+Servidor SMTP mínimo para desarrollo y benchmarks.
+
+Acepta cualquier mensaje y lo descarta (solo los cuenta). ``connect_delay``
+simula el costo de establecer la sesión (TCP + TLS + EHLO) de un servidor
+real, que es lo que se ahorra al reutilizar conexiones.
+"""
+import socketserver
+import threading
+import time
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        server = self.server
+        if server.connect_delay:
+            time.sleep(server.connect_delay)
+        with server.lock:
+            server.connections += 1
+
+        self._reply(b'220 smtp-sink ready')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line[:4].upper()
+
+            if command in (b'EHLO', b'HELO'):
+                self._reply(b'250 smtp-sink')
+            elif command in (b'MAIL', b'RCPT', b'RSET', b'NOOP'):
+                self._reply(b'250 OK')
+            elif command == b'DATA':
+                self._reply(b'354 End data with <CR><LF>.<CR><LF>')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                with server.lock:
+                    server.messages += 1
+                self._reply(b'250 OK')
+            elif command == b'QUIT':
+                self._reply(b'221 Bye')
+                return
+            else:
+                self._reply(b'502 Command not implemented')
+
+    def _reply(self, message):
+        self.wfile.write(message + b'\r\n')
+
+
+class SMTPSink(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """
+    Servidor SMTP en un thread de fondo.
+
+    Uso:
+        with SMTPSink(connect_delay=0.05) as sink:
+            ...  # EMAIL_HOST='127.0.0.1', EMAIL_PORT=sink.port
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host='127.0.0.1', port=0, connect_delay=0.0):
+        super().__init__((host, port), _SMTPHandler)
+        self.connect_delay = connect_delay
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = 0
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
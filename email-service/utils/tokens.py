@@ -0,0 +1,166 @@
+"""
+Verificación local de los JWT emitidos por auth-service.
+
+auth-service firma los access tokens con SIMPLE_JWT (HS256, sin ``kid``), así
+que aquí basta con la clave compartida: no hace falta llamar a
+``/api/auth/me/`` en cada request.
+
+- ``AUTH_JWT_KEYS``: claves de verificación, la actual primero. Durante una
+  rotación se dejan la nueva y la anterior; los tokens firmados con
+  cualquiera de las dos siguen siendo válidos hasta que expiran.
+- Los tokens ya verificados se guardan en un LRU en memoria (token ->
+  claims), así una request repetida con el mismo token no vuelve a calcular
+  el HMAC ni a decodificar el JSON. ``exp`` se comprueba siempre.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from django.conf import settings
+
+
+class InvalidToken(Exception):
+    """El token no es un access token válido de auth-service."""
+
+
+def _b64decode(segment):
+    return base64.urlsafe_b64decode(segment + '=' * (-len(segment) % 4))
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+@lru_cache(maxsize=8)
+def _verifying_keys(keys):
+    return tuple(key.encode() for key in keys)
+
+
+class TokenVerifier:
+    """
+    Verificador HS256 con LRU de tokens verificados.
+
+    Uso:
+        claims = verifier.verify(token)  # lanza InvalidToken
+    """
+
+    def __init__(self, keys=None, cache_size=None, leeway=None):
+        self._keys = keys
+        self.cache_size = settings.AUTH_JWT_CACHE_SIZE if cache_size is None else cache_size
+        self.leeway = settings.AUTH_JWT_LEEWAY if leeway is None else leeway
+        self._cache = OrderedDict()
+        self._cache_keys = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def keys(self):
+        # Se leen de settings en cada uso para que override_settings y las
+        # rotaciones en caliente se apliquen sin recrear el verificador
+        return _verifying_keys(tuple(self._keys or settings.AUTH_JWT_KEYS))
+
+    def verify(self, token):
+        """
+        Verifica firma, tipo y vigencia de un access token.
+
+        Returns:
+            dict: claims del token
+        """
+        try:
+            signing_input, signature = token.rsplit('.', 1)
+        except (AttributeError, ValueError):
+            raise InvalidToken('Malformed token')
+
+        keys = self.keys
+        if keys is not self._cache_keys:
+            # Cambiaron las claves: lo verificado con una clave retirada ya no vale
+            self.clear()
+            self._cache_keys = keys
+
+        claims = self._cached(token)
+        if claims is None:
+            claims = self._verify_signature(signing_input, signature, keys)
+            self._store(token, claims)
+
+        self._check_claims(claims)
+        return claims
+
+    def _cached(self, token):
+        if not self.cache_size:
+            return None
+        with self._lock:
+            claims = self._cache.get(token)
+            if claims is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(token)
+            self.hits += 1
+            return claims
+
+    def _store(self, token, claims):
+        if not self.cache_size:
+            return
+        with self._lock:
+            self._cache[token] = claims
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _verify_signature(self, signing_input, signature, keys):
+        try:
+            header_segment, payload_segment = signing_input.split('.')
+            header = json.loads(_b64decode(header_segment))
+            expected = _b64decode(signature)
+            message = signing_input.encode('ascii')
+        except ValueError:
+            raise InvalidToken('Malformed token')
+
+        # Solo HS256: nunca aceptar 'none' ni el algoritmo que elija el token
+        if not isinstance(header, dict) or header.get('alg') != 'HS256':
+            raise InvalidToken('Unsupported algorithm')
+
+        for key in keys:
+            digest = hmac.new(key, message, hashlib.sha256).digest()
+            if hmac.compare_digest(digest, expected):
+                break
+        else:
+            raise InvalidToken('Invalid signature')
+
+        try:
+            claims = json.loads(_b64decode(payload_segment))
+        except ValueError:
+            raise InvalidToken('Malformed payload')
+        if not isinstance(claims, dict):
+            raise InvalidToken('Malformed payload')
+        return claims
+
+    def _check_claims(self, claims):
+        now = time.time()
+        if claims.get('token_type') != 'access':
+            raise InvalidToken('Not an access token')
+        if 'exp' not in claims or claims['exp'] + self.leeway < now:
+            raise InvalidToken('Token expired')
+        if claims.get('nbf', 0) - self.leeway > now:
+            raise InvalidToken('Token not yet valid')
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self.hits = self.misses = 0
+
+
+def sign(claims, key):
+    """Firma claims con HS256 (mismo formato que SIMPLE_JWT). Útil en benchmarks."""
+    header = _b64encode(json.dumps({'alg': 'HS256', 'typ': 'JWT'}, separators=(',', ':')).encode())
+    payload = _b64encode(json.dumps(claims, separators=(',', ':')).encode())
+    signing_input = f'{header}.{payload}'
+    signature = hmac.new(key.encode(), signing_input.encode('ascii'), hashlib.sha256).digest()
+    return f'{signing_input}.{_b64encode(signature)}'
+
+
+verifier = TokenVerifier()
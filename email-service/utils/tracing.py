@@ -0,0 +1,360 @@
+"""
+Trazas distribuidas con propagación W3C ``traceparent``.
+
+- ``TracingMiddleware`` abre un span por request, continuando la traza del
+  header ``traceparent`` si viene, y devuelve ``X-Trace-Id``.
+- Las queries SQL (execute wrapper), las llamadas a caché y los envíos SMTP
+  abren spans hijos del span en curso; sin span en curso no se traza nada.
+- ``outgoing_request`` abre un span de cliente y da los headers a enviar en
+  una llamada HTTP a otro servicio; las tareas Celery propagan la traza en
+  los headers del mensaje (ver ``email_service/celery.py``).
+
+Los spans terminados se encolan (cola acotada, sin bloquear la request) y un
+hilo de fondo los exporta por lotes a ``TRACING_FILE`` (JSON lines, un span
+por línea) o a ``TRACING_OTLP_ENDPOINT`` (OTLP/HTTP JSON). Sin ninguno de los
+dos la propagación sigue funcionando pero no se exporta nada.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from urllib.parse import urlsplit
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger('django')
+
+UNRESOLVED = '<unresolved>'
+
+# Códigos de SpanKind de OTLP
+KINDS = {'internal': 1, 'server': 2, 'client': 3, 'producer': 4, 'consumer': 5}
+
+_current = ContextVar('current_span', default=None)
+
+
+class Span:
+    __slots__ = (
+        'trace_id', 'span_id', 'parent_id', 'sampled', 'name', 'kind',
+        'attributes', 'start_ns', 'end_ns', 'error',
+    )
+
+    def __init__(self, name, kind, trace_id, parent_id, sampled, attributes):
+        self.trace_id = trace_id
+        self.span_id = f'{random.getrandbits(64) or 1:016x}'
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.error = None
+
+    def traceparent(self):
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def to_dict(self):
+        return {
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'service': settings.TRACING_SERVICE_NAME,
+            'name': self.name,
+            'kind': self.kind,
+            'start_ns': self.start_ns,
+            'end_ns': self.end_ns,
+            'duration_ms': round((self.end_ns - self.start_ns) / 1e6, 3),
+            'attributes': self.attributes,
+            'error': self.error,
+        }
+
+
+def _is_hex(value):
+    return all(c in '0123456789abcdef' for c in value)
+
+
+def parse_traceparent(value):
+    """
+    Valida un header ``traceparent``.
+
+    Returns:
+        tuple: (trace_id, parent_id, sampled), o None si falta o no es válido
+    """
+    parts = (value or '').strip().split('-')
+    if len(parts) < 4:
+        return None
+    version, trace_id, parent_id, flags = parts[:4]
+    if len(version) != 2 or not _is_hex(version) or version == 'ff':
+        return None
+    if version == '00' and len(parts) != 4:
+        return None
+    if len(trace_id) != 32 or len(parent_id) != 16 or len(flags) != 2:
+        return None
+    if not (_is_hex(trace_id) and _is_hex(parent_id) and _is_hex(flags)):
+        return None
+    if trace_id == '0' * 32 or parent_id == '0' * 16:
+        return None
+    return trace_id, parent_id, bool(int(flags, 16) & 1)
+
+
+def current_span():
+    return _current.get()
+
+
+@contextmanager
+def span(name, kind='internal', attributes=None, parent=None):
+    """
+    Abre un span y lo deja como span en curso dentro del bloque.
+
+    Args:
+        name: nombre del span
+        kind: internal, server, client, producer o consumer
+        attributes: dict de atributos (se puede ampliar en el bloque)
+        parent: (trace_id, parent_id, sampled) de un ``traceparent`` recibido;
+            por defecto, el span en curso o una traza nueva
+    """
+    if parent is None:
+        current = _current.get()
+        if current is not None:
+            parent = (current.trace_id, current.span_id, current.sampled)
+    if parent is None:
+        trace_id = f'{random.getrandbits(128) or 1:032x}'
+        parent_id = None
+        sampled = random.random() < settings.TRACING_SAMPLE_RATE
+    else:
+        trace_id, parent_id, sampled = parent
+
+    new = Span(name, kind, trace_id, parent_id, sampled, attributes or {})
+    token = _current.set(new)
+    try:
+        yield new
+    except BaseException as e:
+        new.error = f'{type(e).__name__}: {e}'
+        raise
+    finally:
+        new.end_ns = time.time_ns()
+        _current.reset(token)
+        if sampled:
+            exporter.export(new)
+
+
+@contextmanager
+def child_span(name, kind='internal', attributes=None):
+    """Como ``span``, pero solo si hay un span muestreado en curso."""
+    current = _current.get()
+    if current is None or not current.sampled:
+        yield None
+        return
+    with span(name, kind, attributes) as new:
+        yield new
+
+
+@contextmanager
+def outgoing_request(method, url):
+    """
+    Span de cliente para una llamada HTTP a otro servicio.
+
+    Uso::
+
+        with tracing.outgoing_request('POST', url) as headers:
+            requests.post(url, json=payload, headers=headers)
+    """
+    attributes = {'http.method': method, 'http.url': url}
+    with span(f'{method} {urlsplit(url).netloc}', 'client', attributes) as new:
+        yield {'traceparent': new.traceparent()}
+
+
+def _trace_query(execute, sql, params, many, context):
+    current = _current.get()
+    if current is None or not current.sampled:
+        return execute(sql, params, many, context)
+    attributes = {
+        'db.system': context['connection'].vendor,
+        'db.statement': sql[:settings.TRACING_MAX_STATEMENT_LENGTH],
+    }
+    with span('db.query', 'client', attributes):
+        return execute(sql, params, many, context)
+
+
+def _install_query_wrapper(sender, connection, **kwargs):
+    if _trace_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_trace_query)
+
+
+connection_created.connect(_install_query_wrapper)
+
+
+class SpanExporter:
+    """
+    Exporta los spans por lotes desde un hilo de fondo.
+
+    El hilo se arranca con el primer span de cada proceso, así los workers
+    de gunicorn y Celery (fork) tienen el suyo propio.
+    """
+    batch_size = 512
+    flush_interval = 1.0
+
+    def __init__(self):
+        self.queue = None
+        self.pid = None
+        self.dropped = 0
+        self._lock = threading.Lock()
+        atexit.register(self.shutdown)
+
+    def export(self, finished):
+        if not (settings.TRACING_FILE or settings.TRACING_OTLP_ENDPOINT):
+            return
+        if self.pid != os.getpid():
+            with self._lock:
+                if self.pid != os.getpid():
+                    self._start()
+        try:
+            self.queue.put_nowait(finished)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self):
+        self.queue = queue.Queue(settings.TRACING_QUEUE_SIZE)
+        self.thread = threading.Thread(target=self._run, name='span-exporter', daemon=True)
+        self.thread.start()
+        self.pid = os.getpid()
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            stop = None in batch
+            spans = [item.to_dict() for item in batch if item is not None]
+            if spans:
+                try:
+                    self.write(spans)
+                except Exception as e:
+                    logger.warning(f'Span export failed ({len(spans)} spans): {e}')
+            if stop:
+                return
+
+    def write(self, spans):
+        if settings.TRACING_OTLP_ENDPOINT:
+            body = json.dumps(to_otlp(spans)).encode()
+            request = urllib.request.Request(
+                settings.TRACING_OTLP_ENDPOINT, data=body,
+                headers={'Content-Type': 'application/json'},
+            )
+            urllib.request.urlopen(request, timeout=5).close()
+        elif settings.TRACING_FILE:
+            lines = ''.join(json.dumps(item, default=str) + '\n' for item in spans)
+            # Una sola escritura en modo append: las líneas de varios procesos
+            # no se mezclan
+            fd = os.open(settings.TRACING_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, lines.encode())
+            finally:
+                os.close(fd)
+
+    def shutdown(self):
+        # Exporta lo que quede en la cola antes de terminar el proceso
+        if self.pid == os.getpid():
+            try:
+                self.queue.put(None, timeout=1)
+                self.thread.join(timeout=5)
+            except queue.Full:
+                pass
+
+
+exporter = SpanExporter()
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def to_otlp(spans):
+    """Convierte spans exportados (dicts) al formato OTLP/HTTP JSON."""
+    by_service = {}
+    for item in spans:
+        otlp = {
+            'traceId': item['trace_id'],
+            'spanId': item['span_id'],
+            'name': item['name'],
+            'kind': KINDS[item['kind']],
+            'startTimeUnixNano': str(item['start_ns']),
+            'endTimeUnixNano': str(item['end_ns']),
+            'attributes': [{'key': k, 'value': _otlp_value(v)} for k, v in item['attributes'].items()],
+            'status': {'code': 2, 'message': item['error']} if item['error'] else {'code': 1},
+        }
+        if item['parent_id']:
+            otlp['parentSpanId'] = item['parent_id']
+        by_service.setdefault(item['service'], []).append(otlp)
+    return {'resourceSpans': [
+        {
+            'resource': {'attributes': [{'key': 'service.name', 'value': {'stringValue': service}}]},
+            'scopeSpans': [{'scope': {'name': 'microservices-lab'}, 'spans': service_spans}],
+        }
+        for service, service_spans in by_service.items()
+    ]}
+
+
+class TracingMiddleware:
+    """
+    Abre el span de servidor de cada request. Va al principio de
+    ``MIDDLEWARE`` para que el resto de middlewares quede dentro del span.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with self._span(request) as new:
+            response = self.get_response(request)
+            self._finish(request, response, new)
+        return response
+
+    async def __acall__(self, request):
+        with self._span(request) as new:
+            response = await self.get_response(request)
+            self._finish(request, response, new)
+        return response
+
+    def _span(self, request):
+        parent = parse_traceparent(request.META.get('HTTP_TRACEPARENT'))
+        attributes = {'http.method': request.method, 'http.target': request.path}
+        return span(request.method, 'server', attributes, parent=parent)
+
+    def _finish(self, request, response, new):
+        match = request.resolver_match
+        route = match.view_name if match is not None else UNRESOLVED
+        new.name = f'{request.method} {route}'
+        new.attributes['http.route'] = route
+        new.attributes['http.status_code'] = response.status_code
+        if response.status_code >= 500:
+            new.error = f'HTTP {response.status_code}'
+        response['X-Trace-Id'] = new.trace_id
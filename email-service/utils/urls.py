@@ -1,9 +1,13 @@
 """
-URLs para utilidades (healthcheck).
+URLs para utilidades (health checks y métricas).
 """
 from django.urls import path
-from .views import healthcheck
+from .health import livez, readyz
+from .instrumentation import metrics
 
 urlpatterns = [
-    path('', healthcheck, name='healthcheck'),
+    path('livez', livez, name='livez'),
+    path('readyz', readyz, name='readyz'),
+    path('healthz', readyz, name='healthcheck'),
+    path('metrics', metrics, name='metrics'),
 ]
@@ -0,0 +1,96 @@
+"""
+Colector OTLP mínimo para desarrollo (solo librería estándar).
+
+Recibe spans en ``POST /v1/traces`` (OTLP/HTTP con cuerpo JSON, lo que envían
+los servicios con ``TRACING_OTLP_ENDPOINT``) y los escribe en un archivo
+JSON lines con el mismo formato que ``TRACING_FILE``, para analizarlos con
+``tracing/report.py``. No soporta protobuf ni compresión.
+
+Uso:
+    python tracing/collector.py --port 4318 --output traces/spans.jsonl
+"""
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+KINDS = {1: 'internal', 2: 'server', 3: 'client', 4: 'producer', 5: 'consumer'}
+
+
+def _value(value):
+    for key in ('stringValue', 'boolValue', 'doubleValue'):
+        if key in value:
+            return value[key]
+    if 'intValue' in value:
+        return int(value['intValue'])
+    return None
+
+
+def from_otlp(payload):
+    """Aplana un ``ExportTraceServiceRequest`` en dicts, uno por span."""
+    for resource_spans in payload.get('resourceSpans', []):
+        resource = {a['key']: _value(a['value']) for a in resource_spans.get('resource', {}).get('attributes', [])}
+        service = resource.get('service.name', 'unknown')
+        for scope_spans in resource_spans.get('scopeSpans', []):
+            for span in scope_spans.get('spans', []):
+                start, end = int(span['startTimeUnixNano']), int(span['endTimeUnixNano'])
+                status = span.get('status', {})
+                yield {
+                    'trace_id': span['traceId'],
+                    'span_id': span['spanId'],
+                    'parent_id': span.get('parentSpanId') or None,
+                    'service': service,
+                    'name': span['name'],
+                    'kind': KINDS.get(span.get('kind'), 'internal'),
+                    'start_ns': start,
+                    'end_ns': end,
+                    'duration_ms': round((end - start) / 1e6, 3),
+                    'attributes': {a['key']: _value(a['value']) for a in span.get('attributes', [])},
+                    'error': (status.get('message') or 'error') if status.get('code') == 2 else None,
+                }
+
+
+def make_handler(output):
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def do_POST(self):
+            if self.path != '/v1/traces':
+                self.send_error(404)
+                return
+            try:
+                payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+                lines = ''.join(json.dumps(span) + '\n' for span in from_otlp(payload))
+            except (ValueError, KeyError) as e:
+                self.send_error(400, str(e))
+                return
+            with lock, output.open('a') as f:
+                f.write(lines)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(b'{}')
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=4318)
+    parser.add_argument('--output', type=Path, default=Path('traces/spans.jsonl'))
+    args = parser.parse_args()
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.output))
+    print(f'OTLP/HTTP JSON en http://{args.host}:{args.port}/v1/traces -> {args.output}')
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Resume los spans exportados (``TRACING_FILE`` o ``tracing/collector.py``).
+
+- Tabla de hotspots: por servicio y nombre de span, cantidad, tiempo total,
+  tiempo propio (duración menos la de sus hijos) y p50/p99.
+- Cascada de las trazas más lentas, con cada span sangrado bajo su padre.
+
+Uso:
+    python tracing/report.py traces/spans.jsonl --slowest 3
+    python tracing/report.py traces/spans.jsonl --trace 4bf92f3577b34da6a3ce929d0e0e4736
+"""
+import argparse
+import json
+import statistics
+from collections import defaultdict
+
+
+def load(paths):
+    spans = {}
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    span = json.loads(line)
+                    spans[span['span_id']] = span
+    return spans
+
+
+def percentile(values, q):
+    if len(values) < 2:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[q - 1]
+
+
+def hotspots(spans, children, limit):
+    groups = defaultdict(lambda: {'durations': [], 'self': 0.0})
+    for span in spans.values():
+        own = span['duration_ms'] - sum(spans[c]['duration_ms'] for c in children[span['span_id']])
+        group = groups[(span['service'], span['name'])]
+        group['durations'].append(span['duration_ms'])
+        # Hijos en paralelo (async) pueden sumar más que el padre
+        group['self'] += max(own, 0.0)
+
+    header = f"{'service':<16}{'span':<44}{'count':>7}{'total ms':>11}{'self ms':>11}{'p50 ms':>9}{'p99 ms':>9}"
+    print(header)
+    print('-' * len(header))
+    rows = sorted(groups.items(), key=lambda item: item[1]['self'], reverse=True)[:limit]
+    for (service, name), group in rows:
+        durations = group['durations']
+        print(
+            f'{service:<16}{name[:43]:<44}{len(durations):>7}{sum(durations):>11.1f}'
+            f"{group['self']:>11.1f}{statistics.median(durations):>9.2f}{percentile(durations, 99):>9.2f}"
+        )
+
+
+def waterfall(trace_id, spans, children):
+    members = [span for span in spans.values() if span['trace_id'] == trace_id]
+    if not members:
+        print(f'trace {trace_id}: no spans')
+        return
+    ids = {span['span_id'] for span in members}
+    # Raíces: sin padre o con el padre fuera del archivo (p. ej. otro servicio sin exportar)
+    roots = sorted((s for s in members if s['parent_id'] not in ids), key=lambda s: s['start_ns'])
+    origin = roots[0]['start_ns']
+    end = max(span['end_ns'] for span in members)
+    print(f'\ntrace {trace_id}  {(end - origin) / 1e6:.1f} ms  {len(members)} spans')
+
+    def show(span, depth):
+        offset = (span['start_ns'] - origin) / 1e6
+        error = f"  !! {span['error']}" if span['error'] else ''
+        detail = span['attributes'].get('db.statement') or span['attributes'].get('cache.key') or ''
+        label = f"{'  ' * depth}{span['service']}: {span['name']}"
+        print(f'{offset:>9.1f} {span["duration_ms"]:>9.2f} ms  {label}  {str(detail)[:60]}{error}')
+        for child in sorted((spans[c] for c in children[span['span_id']]), key=lambda s: s['start_ns']):
+            show(child, depth + 1)
+
+    for root in roots:
+        show(root, 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('files', nargs='+', help='Archivos JSON lines con spans')
+    parser.add_argument('--limit', type=int, default=20, help='Filas de la tabla de hotspots')
+    parser.add_argument('--slowest', type=int, default=3, help='Trazas más lentas a mostrar en cascada')
+    parser.add_argument('--trace', help='Mostrar solo esta traza')
+    args = parser.parse_args()
+
+    spans = load(args.files)
+    children = defaultdict(list)
+    for span in spans.values():
+        if span['parent_id'] in spans:
+            children[span['parent_id']].append(span['span_id'])
+
+    if args.trace:
+        waterfall(args.trace, spans, children)
+        return
+
+    hotspots(spans, children, args.limit)
+
+    traces = defaultdict(lambda: [float('inf'), 0])
+    for span in spans.values():
+        bounds = traces[span['trace_id']]
+        bounds[0] = min(bounds[0], span['start_ns'])
+        bounds[1] = max(bounds[1], span['end_ns'])
+    slowest = sorted(traces, key=lambda t: traces[t][1] - traces[t][0], reverse=True)[:args.slowest]
+    for trace_id in slowest:
+        waterfall(trace_id, spans, children)
+
+
+if __name__ == '__main__':
+    main()